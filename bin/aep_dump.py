@@ -69,7 +69,7 @@ def structured_value_to_yaml(file, title, value, wrap_bytes, bytes_fmt, indp):
         items = value.items()
     elif isinstance(value, StructuredData):
         print_data = ""
-        items = [(k, v) for k, v in vars(value).items() if k != "raw_bytes"]
+        items = [(k, v) for k, v in vars(value).items() if k != "_raw"]
     elif isinstance(value, (list, tuple)):
         if len(value) < 10 and len(value) > 0 and isinstance(value[0], (int, float)):
             print_data = value
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(
 from lottie.exporters import exporters
 from lottie.importers import importers
 from lottie.utils.stripper import float_strip, heavy_strip
+from lottie.utils.keyframe_reducer import keyframe_reduce
 from lottie import __version__
 
 
@@ -75,11 +76,12 @@ group.add_argument(
     "-O",
     default=1,
     type=int,
-    choices=[0, 1, 2],
+    choices=[0, 1, 2, 3],
     help="Optimize the animation parameter:\n" +
          " * 0 no optimization\n" +
          " * 1 truncate floats\n" +
-         " * 2 truncate floats and names"
+         " * 2 truncate floats and names\n" +
+         " * 3 truncate floats and names, remove keyframes that can be replaced by easing (lossy)"
 )
 group.add_argument(
     "--fps",
@@ -174,6 +176,8 @@ if __name__ == "__main__":
     if ns.optimize == 1:
         float_strip(an)
     elif ns.optimize >= 2:
+        if ns.optimize >= 3:
+            keyframe_reduce(an)
         heavy_strip(an)
 
     exporter.process(an, outfile, **o_options)
@@ -21,6 +21,11 @@ parser.add_argument(
     nargs="*",
     help="Font family names"
 )
+parser.add_argument(
+    "--refresh",
+    action="store_true",
+    help="Rebuild the cached font index"
+)
 
 
 def _fonts(flist):
@@ -31,6 +36,8 @@ def _fonts(flist):
 
 if __name__ == "__main__":
     ns = parser.parse_args()
+    if ns.refresh:
+        fonts.load(refresh=True)
     font_iter = _fonts(ns.fonts) if ns.fonts else fonts
     for font in font_iter:
         print("* %s" % font)
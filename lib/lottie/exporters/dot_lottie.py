@@ -1,5 +1,13 @@
+import io
+import os
+import copy
 import json
+import struct
+import shutil
+import contextlib
+import tempfile
 import string
+import zlib
 import zipfile
 
 from .base import exporter
@@ -22,16 +30,10 @@ from ..objects import assets
 def export_dotlottie(animation, file, id=None, append=False, revision=None, author=None,
                      speed=1.0, theme_color="#ffffff", loop=True, pack_images=True):
 
-    files = {}
-
     if append:
-        with zipfile.ZipFile(file, "r") as zf:
+        with zipfile.ZipFile(file) as zf:
             with zf.open("manifest.json") as manifest:
                 meta = json.load(manifest)
-
-            for name in zf.namelist():
-                if name != "manifest.json":
-                    files[name] = zf.read(name)
     else:
         meta = {
             "generator": "Python Lottie " + __version__,
@@ -55,6 +57,7 @@ def export_dotlottie(animation, file, id=None, append=False, revision=None, auth
         if not id:
             id = "animation_%s" % len(meta["animations"])
 
+    meta["animations"] = [anim for anim in meta["animations"] if anim["id"] != id]
     meta["animations"].append({
         "id": id,
         "speed": speed,
@@ -62,28 +65,140 @@ def export_dotlottie(animation, file, id=None, append=False, revision=None, auth
         "loop": loop,
     })
 
-    if pack_images and animation.assets:
-        animation = animation.clone()
-        image_no = 0
-        for asset in animation.assets:
-            if isinstance(asset, assets.FileAsset):
-                ext, data = asset.data()
-                if not ext:
-                    continue
-                pathname = "images/"
-                while True:
-                    basename = "image_%s.%s" % (image_no, ext)
-                    image_no += 1
-                    if pathname+basename not in files:
-                        break
-                files[pathname+basename] = data
-                asset.path = pathname
-                asset.file_name = basename
-                asset.is_embedded = False
-
-    files["manifest.json"] = json.dumps(meta)
-    files["animations/%s.json" % id] = json.dumps(animation.to_dict())
-
-    with zipfile.ZipFile(file, "w") as zf:
-        for name, data in files.items():
-            zf.writestr(name, data)
+    animation_name = "animations/%s.json" % id
+    lottie = animation.to_dict()
+
+    def write(zf):
+        if pack_images and animation.assets:
+            images = ImagePacker(zf)
+            for asset, asset_dict in zip(animation.assets, lottie["assets"]):
+                if isinstance(asset, assets.FileAsset):
+                    ext, data = asset.data()
+                    if not ext:
+                        continue
+                    asset_dict["u"], asset_dict["p"] = images.add(ext, data)
+                    asset_dict["e"] = 0
+
+        _write_json(zf, "manifest.json", meta)
+        _write_json(zf, animation_name, lottie)
+
+    if append:
+        # The manifest is always replaced, so the archive is rewritten
+        _rewrite_archive(file, {"manifest.json", animation_name}, write)
+    else:
+        with zipfile.ZipFile(file, "w") as zf:
+            write(zf)
+
+
+class ImagePacker:
+    """!
+    @brief Writes images into the archive, reusing existing members with the same contents
+
+    Members are matched by the CRC32 and size stored in the archive directory,
+    so existing images are only read back when a new image might be the same.
+    """
+    path = "images/"
+
+    def __init__(self, zf: zipfile.ZipFile):
+        self.zf = zf
+        self.names = set(zf.namelist())
+        ## Maps (crc32, size) to member names
+        self.members = {}
+        for info in zf.infolist():
+            if info.filename.startswith(self.path):
+                self.members.setdefault((info.CRC, info.file_size), []).append(info.filename)
+        self.image_no = 0
+
+    def add(self, ext, data):
+        """!
+        @returns (path, basename) of the member with the image data
+        """
+        key = (zlib.crc32(data), len(data))
+        for name in self.members.get(key, ()):
+            if self.zf.read(name) == data:
+                return self.path, name[len(self.path):]
+
+        while True:
+            basename = "image_%s.%s" % (self.image_no, ext)
+            self.image_no += 1
+            if self.path + basename not in self.names:
+                break
+
+        name = self.path + basename
+        self.zf.writestr(name, data)
+        self.names.add(name)
+        self.members.setdefault(key, []).append(name)
+        return self.path, basename
+
+
+def _rewrite_archive(file, skip, write):
+    """!
+    @brief Replaces the archive in @p file with a copy without the members in @p skip,
+    calling write(zf) to add new members to the copy
+
+    File names are written to a temporary file in the same directory, which
+    then replaces the original, file objects are overwritten once the copy is complete.
+    The members that are kept are copied as they are stored, without recompressing them.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        fd, tmp_name = tempfile.mkstemp(".tmp", dir=os.path.dirname(os.path.abspath(file)))
+        try:
+            with os.fdopen(fd, "w+b") as out:
+                _copy_archive(file, out, skip, write)
+            shutil.copymode(file, tmp_name)
+            os.replace(tmp_name, file)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    else:
+        out = io.BytesIO()
+        _copy_archive(file, out, skip, write)
+        file.seek(0)
+        file.write(out.getbuffer())
+        file.truncate()
+
+
+def _copy_archive(source, out, skip, write):
+    with zipfile.ZipFile(source) as src:
+        kept = [info for info in src.infolist() if info.filename not in skip]
+
+    if isinstance(source, (str, os.PathLike)):
+        raw = open(source, "rb")
+    else:
+        raw = contextlib.nullcontext(source)
+
+    with raw as fp, zipfile.ZipFile(out, "w") as dest:
+        for info in kept:
+            copied = copy.copy(info)
+            copied.header_offset = out.tell()
+            out.write(_raw_member(fp, info))
+            dest.filelist.append(copied)
+            dest.NameToInfo[copied.filename] = copied
+        # New members and the central directory go after the copied ones
+        dest.start_dir = out.tell()
+        write(dest)
+
+
+def _raw_member(fp, info):
+    """!
+    @brief Reads the local header, compressed data and data descriptor of a member
+    """
+    fp.seek(info.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    name_size, extra_size = struct.unpack("<HH", header[26:30])
+    size = name_size + extra_size + info.compress_size
+    if info.flag_bits & 0x08:
+        # Data descriptor: optional signature, CRC and sizes (64 bit for zip64)
+        size += 12
+        if info.compress_size > zipfile.ZIP64_LIMIT or info.file_size > zipfile.ZIP64_LIMIT:
+            size += 8
+        fp.seek(info.header_offset + len(header) + name_size + extra_size + info.compress_size)
+        if fp.read(4) == b"PK\x07\x08":
+            size += 4
+        fp.seek(info.header_offset + len(header))
+    return header + fp.read(size)
+
+
+def _write_json(zf, name, data):
+    with io.TextIOWrapper(zf.open(name, "w"), "utf-8") as fp:
+        json.dump(data, fp)
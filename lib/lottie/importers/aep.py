@@ -1,42 +1,73 @@
-import io
-
-from xml.etree import ElementTree
-
 from .base import importer
 from ..parsers.baseporter import ExtraOption
 from ..parsers.aep.aep_riff import AepParser
 from ..parsers.aep.converter import AepConverter, ExpressionMode, can_convert_expressions
-from ..parsers.aep.aepx import aepx_to_chunk
+from ..parsers.aep.aepx import aepx_file_to_chunk
 
 opts = [
-    ExtraOption("comp", help="Name of the composition to extract", default=None)
+    ExtraOption("comp", help="Name of the composition to extract", default=None),
+    ExtraOption(
+        "all_comps", action="store_true", default=False,
+        help="Convert all the compositions, adding the ones other than --comp as precomps"
+    ),
+    ExtraOption(
+        "processes", type=int, default=0,
+        help="Number of worker processes used to convert compositions with --all-comps"
+    ),
 ]
 
 if can_convert_expressions:
     opts.append(ExtraOption(
         "expressions", help="Export expressions", action="store_true", default=False
     ))
+    opts.append(ExtraOption(
+        "expression_cache", default=None,
+        help="Directory used to store converted expressions so they can be reused across imports"
+    ))
 
 
-def convert(rifx, comp, expressions):
-    conv = AepConverter(ExpressionMode.Bodymovin if expressions else ExpressionMode.Ignore)
-    return conv.import_aep(rifx, comp)
+def convert(rifx, comp, expressions, all_comps=False, processes=0, expression_cache=None):
+    conv = AepConverter(ExpressionMode.Bodymovin if expressions else ExpressionMode.Ignore, expression_cache)
+    return conv.import_aep(rifx, comp, all_comps, processes)
 
 
-@importer("AfterEffect Project", ["aep"], opts, slug="aep")
-def import_aep(file, comp=None, expressions=False):
+def import_aep_comps(file, comps=None, expressions=False, lazy=False, processes=0, expression_cache=None):
+    """!
+    @brief Parses an AEP file once and converts several of its compositions
+    @param file File name or binary file object
+    @param comps Names of the compositions to convert, if None converts all of them
+    @param processes Number of worker processes to use
+    @returns dict mapping composition names to objects.Animation
+    """
     if isinstance(file, str):
         with open(file, "rb") as fileobj:
-            return import_aep(fileobj, comp, expressions)
+            return import_aep_comps(fileobj, comps, expressions, lazy, processes, expression_cache)
 
-    parser = AepParser(file)
-    return convert(parser.parse(), comp, expressions)
+    conv = AepConverter(ExpressionMode.Bodymovin if expressions else ExpressionMode.Ignore, expression_cache)
+    with AepParser(file, lazy) as parser:
+        return conv.import_aep_comps(parser.parse(), comps, processes)
+
+
+aep_opts = opts + [
+    ExtraOption(
+        "lazy", action="store_true", default=False,
+        help="Only decode the parts of the project needed for the selected composition"
+    )
+]
+
+
+@importer("AfterEffect Project", ["aep"], aep_opts, slug="aep")
+def import_aep(file, comp=None, expressions=False, lazy=False, all_comps=False, processes=0, expression_cache=None):
+    if isinstance(file, str):
+        with open(file, "rb") as fileobj:
+            return import_aep(fileobj, comp, expressions, lazy, all_comps, processes, expression_cache)
+
+    with AepParser(file, lazy) as parser:
+        return convert(parser.parse(), comp, expressions, all_comps, processes, expression_cache)
 
 
 @importer("AfterEffect Project XML", ["aepx"], opts, slug="aepx")
-def import_aepx(file, comp=None, expressions=False):
-    dom = ElementTree.parse(file)
+def import_aepx(file, comp=None, expressions=False, all_comps=False, processes=0, expression_cache=None):
     parser = AepParser(None)
-
-    rifx = aepx_to_chunk(dom.getroot(), parser)
-    return convert(rifx, comp, expressions)
+    rifx = aepx_file_to_chunk(file, parser)
+    return convert(rifx, comp, expressions, all_comps, processes, expression_cache)
@@ -1,5 +1,7 @@
+import os
 import json
 import zipfile
+import functools
 
 from .base import importer
 from ..parsers.baseporter import ExtraOption
@@ -7,26 +9,66 @@ from ..parsers.tgs import parse_tgs
 from ..objects import Animation, assets
 
 
-@importer("dotLottie Archive", ["lottie"], [
-    ExtraOption("id", help="ID of the animation to extract", default=None)
-], slug="dotlottie")
-def import_dotlottie(file, id=None):
+def _read_member(filename, member):
+    with zipfile.ZipFile(filename) as zf:
+        return zf.read(member)
+
+
+def _load_animation(zf, file, id, lazy_images):
+    with zf.open("animations/%s.json" % id) as animfile:
+        an = Animation.load(json.load(animfile))
+
+    if an.assets:
+        names = set(zf.namelist())
+        for asset in an.assets:
+            if isinstance(asset, assets.Image) and not asset.is_embedded:
+                fname = asset.path + asset.file_name
+                if fname in names:
+                    if lazy_images:
+                        format = os.path.splitext(fname)[1][1:].lower()
+                        if isinstance(file, str):
+                            data = functools.partial(_read_member, file, fname)
+                        else:
+                            data = zf.read(fname)
+                        asset.set_lazy_data(format, data)
+                    else:
+                        with zf.open(fname) as imgfile:
+                            asset.load(imgfile)
+    return an
+
+
+def import_dotlottie_animations(file, ids=None, lazy_images=False):
+    """!
+    @brief Loads several animations from a dotLottie archive, opening it once
+    @param file File name or binary file object
+    @param ids IDs of the animations to load, if None loads all of them
+    @param lazy_images If True, images are kept as raw data from the archive and only embedded when serialized
+    @returns dict mapping animation IDs to objects.Animation
+    """
     with zipfile.ZipFile(file) as zf:
         with zf.open("manifest.json") as manifest:
             meta = json.load(manifest)
 
+        if ids is None:
+            ids = [anim["id"] for anim in meta["animations"]]
+
+        return {
+            id: _load_animation(zf, file, id, lazy_images)
+            for id in ids
+        }
+
+
+@importer("dotLottie Archive", ["lottie"], [
+    ExtraOption("id", help="ID of the animation to extract", default=None),
+    ExtraOption(
+        "lazy_images", action="store_true", default=False,
+        help="Keep images as they are in the archive instead of decoding them"
+    ),
+], slug="dotlottie")
+def import_dotlottie(file, id=None, lazy_images=False):
+    with zipfile.ZipFile(file) as zf:
         if id is None:
-            id = meta["animations"][0]["id"]
-
-        info = zf.getinfo("animations/%s.json" % id)
-
-        with zf.open(info) as animfile:
-            an = Animation.load(json.load(animfile))
-            if an.assets:
-                for asset in an.assets:
-                    if isinstance(asset, assets.Image) and not asset.is_embedded:
-                        fname = asset.path + asset.file_name
-                        if fname in zf.namelist():
-                            with zf.open(fname) as imgfile:
-                                asset.load(imgfile)
-            return an
+            with zf.open("manifest.json") as manifest:
+                id = json.load(manifest)["animations"][0]["id"]
+
+        return _load_animation(zf, file, id, lazy_images)
@@ -50,10 +50,27 @@ except ImportError:
         type=int,
         help="Stroke width for output shapes"
     ),
+    ExtraOption(
+        "palette_frames",
+        default=1,
+        type=int,
+        help="Number of frames used to compute the palette when tracing animations"
+    ),
+    ExtraOption(
+        "merge_frames",
+        action="store_true",
+        help="Trace consecutive identical frames only once when tracing animations"
+    ),
+    ExtraOption(
+        "processes",
+        default=0,
+        type=int,
+        help="Number of worker processes used to vectorize frames in parallel"
+    ),
 ])
 def import_raster(filenames, n_colors, palette, mode, frame_delay=1,
                   framerate=60, frame_files=[], color_mode="nearest",
-                  embed_format=None, stroke=1):
+                  embed_format=None, stroke=1, processes=0, palette_frames=1, merge_frames=False):
     if not isinstance(filenames, list):
         filenames = [filenames]
     filenames = filenames + frame_files
@@ -63,17 +80,20 @@ def import_raster(filenames, n_colors, palette, mode, frame_delay=1,
     elif mode == "external":
         return raster_to_linked_assets(filenames, frame_delay, framerate)
     elif mode == "trace":
-        from ..parsers.raster import QuanzationMode
+        from ..parsers.raster import QuantizationMode
         options = TraceOptions()
-        options.color_mode = QuanzationMode.Nearest if color_mode == "nearest" else QuanzationMode.Exact
+        options.color_mode = QuantizationMode.Nearest if color_mode == "nearest" else QuantizationMode.Exact
         options.stroke_width = stroke
         return raster_to_animation(
             filenames, n_colors, frame_delay,
             framerate=framerate,
             palette=palette,
-            trace_options=options
+            trace_options=options,
+            processes=processes,
+            palette_frames=palette_frames,
+            merge_duplicates=merge_frames
         )
     elif mode == "polygon":
-        return pixel_to_animation_paths(filenames, frame_delay, framerate)
+        return pixel_to_animation_paths(filenames, frame_delay, framerate, processes)
     else:
-        return pixel_to_animation(filenames, frame_delay, framerate)
+        return pixel_to_animation(filenames, frame_delay, framerate, processes)
@@ -11,6 +11,9 @@ from ..parsers.tgs import open_maybe_gzipped
         "greater values increase the time each frames lasts for."),
     ExtraOption("n_frames", type=int, default=60),
     ExtraOption("framerate", type=int, default=60),
+    ExtraOption(
+        "streaming", action="store_true",
+        help="Parse the file incrementally instead of loading the whole document, uses less memory on large files"),
 ])
 def import_svg(file, *a, **kw):
     return open_maybe_gzipped(file, lambda svgfile: parse_svg_file(svgfile, *a, **kw))
@@ -150,12 +150,28 @@ class Animation(Composition, VisualObject):
         self.motion_blur = None
         self.markers = None
         self.slots = None
+        self._precomp_index = None
+
+    def _build_precomp_index(self):
+        index = {}
+        for ass in self.assets or []:
+            if isinstance(ass, Precomp):
+                index.setdefault(ass.id, ass)
+        self._precomp_index = (self.assets, len(self.assets or []), index)
+        return index
 
     def precomp(self, name):
-        for ass in self.assets:
-            if isinstance(ass, Precomp) and ass.id == name:
+        """!
+        @brief Returns the Precomp asset with the given id, or @c None
+        """
+        cached = self._precomp_index
+        if cached is not None and cached[0] is self.assets and cached[1] == len(self.assets or []):
+            ass = cached[2].get(name)
+            # Hits are checked in case the asset has been renamed
+            if ass is not None and ass.id == name:
                 return ass
-        return None
+
+        return self._build_precomp_index().get(name)
 
     def _on_prepare_layer(self, layer):
         if layer.in_point is None:
@@ -187,6 +203,7 @@ class Animation(Composition, VisualObject):
             index += 1
         precomp.id = name
         self.assets.append(precomp)
+        precomp._fixup()
 
         precomp_layer = PreCompLayer()
         precomp_layer.width = self.width
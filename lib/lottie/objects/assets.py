@@ -47,6 +47,58 @@ class FileAsset(Asset):
         self.file_name = ""
         ## Whether the file is embedded
         self.is_embedded = False
+        ## Format and loader of the file contents when they are only fetched on demand
+        ## @see set_lazy_data()
+        self._lazy_data = None
+
+    def set_lazy_data(self, format, data):
+        """!
+        @brief Sets the file contents without decoding or embedding them yet
+
+        The raw data is returned unchanged by data() and only embedded as a data url
+        when the asset is serialized (or embed_lazy_data() is called).
+
+        @param format   File format, like "png"
+        @param data     Raw bytes or a callable returning them
+        """
+        self._lazy_data = (format, data)
+        return self
+
+    def _read_lazy_data(self):
+        format, data = self._lazy_data
+        if callable(data):
+            data = data()
+        return format, data
+
+    def _mime_type(self, format):
+        return mimetypes.guess_type("file." + format)[0] or "application/octet-stream"
+
+    def _lazy_data_url(self):
+        format, data = self._read_lazy_data()
+        return "data:%s;base64,%s" % (self._mime_type(format), base64.b64encode(data).decode("ascii"))
+
+    def embed_lazy_data(self):
+        """!
+        @brief Embeds the data set with set_lazy_data()
+        """
+        if self._lazy_data is not None:
+            self.path = ""
+            self.file_name = self._lazy_data_url()
+            self.is_embedded = True
+            self._lazy_data = None
+
+    def to_dict(self):
+        d = super().to_dict()
+        if self._lazy_data is not None:
+            d["u"] = ""
+            d["p"] = self._lazy_data_url()
+            d["e"] = 1
+        return d
+
+    def clone(self):
+        obj = super().clone()
+        obj._lazy_data = self._lazy_data
+        return obj
 
     def _id_from_file(self, file):
         if not self.id:
@@ -67,6 +119,8 @@ class FileAsset(Asset):
 
         If it's impossible to fetch this info, returns (None, None)
         """
+        if self._lazy_data is not None:
+            return self._read_lazy_data()
         if self.is_embedded:
             m = re.match("data:[^/]+/([^;,]+);base64,(.*)", self.file_name)
             if m:
@@ -114,40 +168,84 @@ class Image(FileAsset):
         ## If "seq", marks it as part of an image sequence
         self.type = None
 
-    def load(self, file, format=None):
+    def _mime_type(self, format):
+        return "image/%s" % format
+
+    def load(self, file, format=None, lazy=False):
         """!
-        @param file     Filename, file object, or PIL.Image.Image to load
+        @param file     Filename, file object, raw bytes, or PIL.Image.Image to load
         @param format   Format to store the image data as
-        """
-        from PIL import Image
+        @param lazy     If True, the base64 data url is only generated when the image is serialized
 
-        if not isinstance(file, Image.Image):
-            image = Image.open(file)
+        Files already in @p format (or any format if None) that are single frame
+        PNG, JPEG, or WebP are embedded as they are, without being decoded.
+        """
+        if isinstance(file, (str, bytes, bytearray)) or hasattr(file, "read"):
+            self._id_from_file(file)
+            data = _read_file(file)
+            if self._load_raw(data, format, lazy):
+                return self
+
+            from PIL import Image
+            image = Image.open(BytesIO(data))
         else:
             image = file
+            self._id_from_file(file)
 
-        self._id_from_file(file)
-
-        self.path = ""
         if format is None:
             format = (image.format or "png").lower()
         self.width, self.height = image.size
         output = BytesIO()
         image.save(output, format=format)
-        self.file_name = "data:image/%s;base64,%s" % (
-            format,
-            base64.b64encode(output.getvalue()).decode("ascii")
-        )
-        self.is_embedded = True
+        self._set_embedded_data(format, output.getvalue(), lazy)
         return self
 
+    def _load_raw(self, data, format, lazy):
+        info = _sniff_image(data)
+        if info is None:
+            return False
+
+        raw_format, width, height = info
+        if format is not None and _image_formats.get(format.lower(), format.lower()) != raw_format:
+            return False
+
+        self.width = width
+        self.height = height
+        self._set_embedded_data(raw_format, data, lazy)
+        return True
+
+    def _set_embedded_data(self, format, data, lazy):
+        self.path = ""
+        self.is_embedded = True
+        if lazy:
+            self.file_name = ""
+            self.set_lazy_data(format, data)
+        else:
+            self._lazy_data = None
+            self.file_name = "data:%s;base64,%s" % (
+                self._mime_type(format),
+                base64.b64encode(data).decode("ascii")
+            )
+
     @classmethod
-    def embedded(cls, image, format=None):
+    def embedded(cls, image, format=None, lazy=False):
         """!
         Create an object from an image file
         """
         lottie_image = cls()
-        return lottie_image.load(image, format)
+        return lottie_image.load(image, format, lazy)
+
+    @classmethod
+    def embedded_raw(cls, file, format=None, lazy=False):
+        """!
+        @brief Create an object embedding the contents of an image file as they are
+        @returns The image or None if the file needs to be decoded to be stored as @p format
+        """
+        lottie_image = cls()
+        lottie_image._id_from_file(file)
+        if lottie_image._load_raw(_read_file(file), format, lazy):
+            return lottie_image
+        return None
 
     @classmethod
     def linked(cls, filename):
@@ -162,6 +260,59 @@ class Image(FileAsset):
         return lottie_image
 
 
+def _read_file(file):
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, str):
+        with open(file, "rb") as fileobj:
+            return fileobj.read()
+    return file.read()
+
+
+## Format names (as used by PIL) for file extensions that differ from them
+_image_formats = {"jpg": "jpeg"}
+
+
+def _sniff_image(data):
+    """!
+    @brief Finds format and size of single frame PNG, JPEG, and WebP images from their header
+    @returns (format, width, height) or None if the image isn't recognized or is animated
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and data[12:16] == b"IHDR":
+        # APNG animation control comes before the image data
+        if data.find(b"acTL", 0, data.find(b"IDAT")) != -1:
+            return None
+        return "png", int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+
+    if data.startswith(b"\xff\xd8"):
+        pos = 2
+        while pos + 9 < len(data):
+            if data[pos] != 0xff:
+                return None
+            marker = data[pos+1]
+            if marker == 0xff:
+                pos += 1
+            elif marker == 0x01 or 0xd0 <= marker <= 0xd7:
+                pos += 2
+            elif 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+                return "jpeg", int.from_bytes(data[pos+7:pos+9], "big"), int.from_bytes(data[pos+5:pos+7], "big")
+            else:
+                pos += 2 + int.from_bytes(data[pos+2:pos+4], "big")
+        return None
+
+    if data.startswith(b"RIFF") and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            return "webp", int.from_bytes(data[26:28], "little") & 0x3fff, int.from_bytes(data[28:30], "little") & 0x3fff
+        elif chunk == b"VP8L" and data[20] == 0x2f:
+            bits = int.from_bytes(data[21:25], "little")
+            return "webp", (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+        elif chunk == b"VP8X" and not data[20] & 0x02:
+            return "webp", int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+
+    return None
+
+
 ## @ingroup Lottie
 class Precomp(Asset, Composition):
     _props = [
@@ -180,7 +331,7 @@ class Precomp(Asset, Composition):
 
     def _on_prepare_layer(self, layer):
         if self.animation:
-            self.animation.prepare_layer(layer)
+            self.animation._on_prepare_layer(layer)
 
     def set_timing(self, outpoint, inpoint=0, override=True):
         for layer in self.layers:
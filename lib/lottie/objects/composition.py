@@ -2,6 +2,87 @@ from .base import LottieObject, Index, LottieProp
 from .layers import Layer
 
 
+class LayerIndex:
+    """!
+    @brief Lookup tables for the layers of a composition
+
+    Kept up to date incrementally as layers are added, removed or re-parented
+    """
+    def __init__(self, layers):
+        ## List the index has been built from
+        self.layers = layers
+        ## Number of indexed layers
+        self.size = 0
+        ## Maps layer `index` to the layers with that index
+        self._by_index = {}
+        ## Maps parent `index` to the child layers (as dict keys to preserve order)
+        self._children = {}
+        self._tracked = set()
+
+        for layer in layers:
+            self.add(layer)
+
+    def is_valid(self, layers):
+        """!
+        Whether the index still matches @p layers
+        """
+        return self.layers is layers and self.size == len(layers)
+
+    def layer(self, index):
+        """!
+        @returns The first layer with the given index, or @c None
+        """
+        found = self._by_index.get(index)
+        return next(iter(found)) if found else None
+
+    def children(self, index):
+        """!
+        @returns List of layers whose parent has the given index
+        """
+        return list(self._children.get(index, ()))
+
+    def add(self, layer):
+        self._tracked.add(layer)
+        self.size += 1
+        self._add_key(self._by_index, layer.index, layer)
+        self._add_key(self._children, layer.parent_index, layer)
+
+    def remove(self, layer):
+        if layer not in self._tracked:
+            return
+        self._tracked.discard(layer)
+        self.size -= 1
+        self._remove_key(self._by_index, layer.index, layer)
+        self._remove_key(self._children, layer.parent_index, layer)
+
+    def update(self, layer, attribute, old_value):
+        """!
+        Updates the index after @p attribute of @p layer has changed from @p old_value
+        """
+        if layer not in self._tracked:
+            return
+        table = self._by_index if attribute == "index" else self._children
+        self._remove_key(table, old_value, layer)
+        self._add_key(table, getattr(layer, attribute), layer)
+
+    @staticmethod
+    def _add_key(table, key, layer):
+        if key is None:
+            return
+        items = table.get(key)
+        if items is None:
+            table[key] = items = {}
+        items[layer] = None
+
+    @staticmethod
+    def _remove_key(table, key, layer):
+        items = table.get(key)
+        if items is not None:
+            items.pop(layer, None)
+            if not items:
+                del table[key]
+
+
 ## @ingroup Lottie
 class Composition(LottieObject):
     """!
@@ -17,12 +98,103 @@ class Composition(LottieObject):
         self.layers = [] # ShapeLayer, SolidLayer, CompLayer, ImageLayer, NullLayer, TextLayer
 
         self._index_gen = Index()
+        self._layer_index = None
+        self._world_matrices = {}
+        self._world_matrices_time = None
+
+    @property
+    def layer_index(self):
+        """!
+        @brief Lookup tables for layer indices and parenting
+
+        Updated incrementally by the methods of this class, rebuilt if
+        `layers` has been modified directly.
+        """
+        if self._layer_index is None or not self._layer_index.is_valid(self.layers):
+            self._layer_index = LayerIndex(self.layers)
+        return self._layer_index
+
+    def _valid_layer_index(self):
+        if self._layer_index is not None and self._layer_index.is_valid(self.layers):
+            return self._layer_index
+        return None
+
+    def _invalidate_layer_index(self):
+        self._layer_index = None
+        self.clear_world_matrix_cache()
+
+    def _on_layer_attribute_changed(self, layer, attribute, old_value):
+        layer_index = self._valid_layer_index()
+        if layer_index is not None:
+            layer_index.update(layer, attribute, old_value)
+        self.clear_world_matrix_cache()
 
     def layer(self, index):
-        for layer in self.layers:
-            if layer.index == index:
-                return layer
-        raise IndexError("No layer %s" % index)
+        layer = self.layer_index.layer(index)
+        if layer is None or layer.index != index:
+            # Layers replaced or re-indexed without going through the composition
+            # aren't tracked by the index, rebuild it before giving up
+            self._invalidate_layer_index()
+            layer = self.layer_index.layer(index)
+            if layer is None:
+                raise IndexError("No layer %s" % index)
+        return layer
+
+    def child_layers(self, layer: Layer):
+        """!
+        @brief Returns the list of layers parented to @p layer
+        """
+        if layer.index is None:
+            return []
+        children = self.layer_index.children(layer.index)
+        if any(child.parent_index != layer.index for child in children):
+            self._invalidate_layer_index()
+            children = self.layer_index.children(layer.index)
+        return children
+
+    def clear_world_matrix_cache(self):
+        """!
+        @brief Discards cached world matrices
+        @note Call this after changing transforms for a frame that has already been evaluated
+        """
+        self._world_matrices = {}
+        self._world_matrices_time = None
+
+    def world_matrix(self, layer: Layer, time):
+        """!
+        @brief Returns the transform matrix of @p layer at @p time, including all of its parents
+
+        Matrices are cached for the last requested frame, so each layer in a
+        parenting chain is only computed once and shared with its children.
+        """
+        from ..utils.transform import TransformMatrix
+
+        if time != self._world_matrices_time:
+            self._world_matrices = {}
+            self._world_matrices_time = time
+
+        cache = self._world_matrices
+        layer_index = self.layer_index
+
+        chain = []
+        seen = set()
+        ancestor = layer
+        while ancestor is not None and ancestor not in cache and id(ancestor) not in seen:
+            seen.add(id(ancestor))
+            chain.append(ancestor)
+            ancestor = layer_index.layer(ancestor.parent_index) if ancestor.parent_index is not None else None
+
+        matrix = cache.get(ancestor) if ancestor is not None else None
+        for item in reversed(chain):
+            transform = getattr(item, "transform", None)
+            if transform:
+                local = transform.to_matrix(time, getattr(item, "auto_orient", False))
+            else:
+                local = TransformMatrix()
+            matrix = local if matrix is None else local * matrix
+            cache[item] = matrix
+
+        return cache[layer].clone()
 
     def add_layer(self, layer: Layer):
         """!
@@ -40,14 +212,19 @@ class Composition(LottieObject):
     def _fixup(self):
         for layer in self.layers:
             layer.composition = self
+        self._invalidate_layer_index()
 
     def insert_layer(self, index, layer: Layer):
         """!
         @brief Inserts a layer to the composition
         @note Layers added first will be rendered on top of later layers
         """
+        layer_index = self._valid_layer_index()
         self.layers.insert(index, layer)
         self.prepare_layer(layer)
+        if layer_index is not None:
+            layer_index.add(layer)
+        self.clear_world_matrix_cache()
         return layer
 
     def prepare_layer(self, layer: Layer):
@@ -72,10 +249,20 @@ class Composition(LottieObject):
         if layer.composition is not self:
             return
 
-        children = list(layer.children)
+        layer_index = self.layer_index
+        removed = set()
+        pending = [layer]
+        while pending:
+            layer = pending.pop()
+            if layer in removed:
+                continue
+            removed.add(layer)
+            if layer.index is not None:
+                pending += layer_index.children(layer.index)
 
-        layer.composition = None
-        self.layers.remove(layer)
+        for layer in removed:
+            layer.composition = None
+            layer_index.remove(layer)
 
-        for c in children:
-            self.remove_layer(c)
+        self.layers[:] = [layer for layer in self.layers if layer not in removed]
+        self.clear_world_matrix_cache()
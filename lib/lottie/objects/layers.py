@@ -62,6 +62,16 @@ class Layer(VisualObject):
         ## When true, the layer should not be rendered
         self.is_guide = None
 
+    def __setattr__(self, name, value):
+        if name == "index" or name == "parent_index":
+            composition = self.__dict__.get("composition")
+            old_value = self.__dict__.get(name)
+            super().__setattr__(name, value)
+            if composition is not None and old_value != value:
+                composition._on_layer_attribute_changed(self, name, old_value)
+        else:
+            super().__setattr__(name, value)
+
     @classmethod
     def _load_get_class(cls, lottiedict):
         if not Layer._classses:
@@ -152,7 +162,7 @@ class VisualLayer(Layer):
             raise Exception("Must set composition / index first")
         self._child_inout_auto(layer)
         self.composition.add_layer(layer)
-        layer.parent_index = self.index
+        layer.parent = self
         return layer
 
     def _child_inout_auto(self, layer):
@@ -177,9 +187,15 @@ class VisualLayer(Layer):
 
     @property
     def children(self):
-        for layer in self.composition.layers:
-            if layer.parent_index == self.index:
-                yield layer
+        for layer in self.composition.child_layers(self):
+            yield layer
+
+    def world_matrix(self, time):
+        """!
+        @brief Transform matrix at @p time, including parent layers
+        @see Composition.world_matrix
+        """
+        return self.composition.world_matrix(self, time)
 
     def __repr__(self):
         return "<%s %s %s>" % (type(self).__name__, self.index, self.name)
@@ -1,4 +1,5 @@
 import math
+import bisect
 from functools import reduce
 from .base import LottieObject, LottieProp, PseudoList, PseudoBool
 from . import easing
@@ -308,6 +309,51 @@ class AnimatableMixin:
 
         return self._get_value_helper(time)[0]
 
+    def get_values(self, times):
+        """!
+        @brief Returns the values of the property at each of the given times
+
+        Equivalent to calling get_value() for each time but the keyframes
+        are only scanned once.
+        """
+        times = list(times)
+        if not self.animated:
+            return [self.value] * len(times)
+
+        if not self.keyframes:
+            return [None] * len(times)
+
+        keyframes = self.keyframes
+        key_times = [kf.time for kf in keyframes]
+        # Value get_value() falls back to when reaching keyframe i
+        fallback = [keyframes[0].value]
+        for kf in keyframes:
+            if kf.end is not None:
+                fallback.append(kf.end)
+            elif kf.value is not None:
+                fallback.append(kf.value)
+            else:
+                fallback.append(fallback[-1])
+
+        values = []
+        for time in times:
+            i = bisect.bisect_left(key_times, time)
+            if i == len(keyframes):
+                values.append(fallback[i])
+                continue
+
+            k = keyframes[i]
+            val = k.value if k.value is not None else fallback[i]
+            if i > 0:
+                kp = keyframes[i-1]
+                end = kp.end
+                if end is None:
+                    end = val
+                if end is not None:
+                    val = kp.interpolated_value((time - kp.time) / (k.time - kp.time), end)
+            values.append(val)
+        return values
+
     def _get_value_helper(self, time):
         val = self.keyframes[0].value
         for i in range(len(self.keyframes)):
@@ -751,6 +797,12 @@ class Value(AnimatableMixin, LottieObject):
             return v[0]
         return v
 
+    def get_values(self, times):
+        values = super().get_values(times)
+        if self.animated and self.keyframes:
+            return [v[0] for v in values]
+        return values
+
 
 ## @ingroup Lottie
 class ShapePropKeyframe(Keyframe):
@@ -146,12 +146,72 @@ class Shape(ShapeElement):
         ## After Effect's Direction. Direction how the shape is drawn. Used for trim path for example.
         self.direction = ShapeDirection.Normal
 
+    ## Maximum number of entries in the cache used by bezier_frames()
+    bezier_cache_size = 1024
+
     def to_bezier(self):
         """!
         Returns a Path corresponding to this Shape
         """
         raise NotImplementedError()
 
+    def bezier_frames(self, times):
+        """!
+        @brief Returns the Bezier of this shape at each of @p times
+
+        Beziers are cached based on the property values they are generated from,
+        the returned objects are shared so they should be cloned before being modified.
+        """
+        raise NotImplementedError()
+
+    def _cached_beziers(self, generator, key, *value_lists, **kwargs):
+        """!
+        Calls @p generator on the value lists, skipping values found in the cache
+        """
+        cache = self.__dict__.get("_bezier_cache")
+        if cache is None or len(cache) > self.bezier_cache_size:
+            cache = self.__dict__["_bezier_cache"] = {}
+
+        value_sets = list(zip(*value_lists))
+        keys = [
+            (key,) + tuple(tuple(v.components) if isinstance(v, NVector) else v for v in values)
+            for values in value_sets
+        ]
+
+        missing = {}
+        for values, value_key in zip(value_sets, keys):
+            if value_key not in cache and value_key not in missing:
+                missing[value_key] = values
+
+        if missing:
+            generated = generator(*zip(*missing.values()), **kwargs)
+            cache.update(zip(missing.keys(), generated))
+
+        return [cache[value_key] for value_key in keys]
+
+    def _animated_bezier(self, properties):
+        shape = Path()
+        kft = set()
+        for prop in properties:
+            if prop.animated:
+                kft |= set(kf.time for kf in prop.keyframes)
+        if not kft:
+            shape.shape.value = self.bezier_frames([0])[0].clone()
+        else:
+            times = sorted(kft)
+            for time, bezier in zip(times, self.bezier_frames(times)):
+                shape.shape.add_keyframe(time, bezier.clone())
+        return shape
+
+
+def _closed_bezier(vertices, in_tangents, out_tangents):
+    bezier = Bezier()
+    bezier.vertices = [NVector(*p) for p in vertices]
+    bezier.in_tangents = [NVector(*p) for p in in_tangents]
+    bezier.out_tangents = [NVector(*p) for p in out_tangents]
+    bezier.closed = True
+    return bezier
+
 
 ## @ingroup Lottie
 class Rect(Shape):
@@ -190,51 +250,67 @@ class Rect(Shape):
         """!
         Returns a Shape corresponding to this rect
         """
-        shape = Path()
-        kft = set()
-        if self.position.animated:
-            kft |= set(kf.time for kf in self.position.keyframes)
-        if self.size.animated:
-            kft |= set(kf.time for kf in self.size.keyframes)
-        if self.rounded.animated:
-            kft |= set(kf.time for kf in self.rounded.keyframes)
-        if not kft:
-            shape.shape.value = self._bezier_t(0)
-        else:
-            for time in sorted(kft):
-                shape.shape.add_keyframe(time, self._bezier_t(time))
-        return shape
+        return self._animated_bezier([self.position, self.size, self.rounded])
+
+    def bezier_frames(self, times):
+        times = list(times)
+        return self._cached_beziers(
+            self.beziers_from_values,
+            ("rc", self.rounded.animated),
+            self.position.get_values(times),
+            self.size.get_values(times),
+            self.rounded.get_values(times),
+            force_rounded=self.rounded.animated,
+        )
 
-    def _bezier_t(self, time):
-        bezier = Bezier()
-        bb = self.bounding_box(time)
-        rounded = self.rounded.get_value(time)
-        tl = NVector(bb.x1, bb.y1)
-        tr = NVector(bb.x2, bb.y1)
-        br = NVector(bb.x2, bb.y2)
-        bl = NVector(bb.x1, bb.y2)
-
-        if not self.rounded.animated and rounded == 0:
-            bezier.add_point(tl)
-            bezier.add_point(tr)
-            bezier.add_point(br)
-            bezier.add_point(bl)
-        else:
-            hh = NVector(rounded/2, 0)
-            vh = NVector(0, rounded/2)
-            hd = NVector(rounded, 0)
-            vd = NVector(0, rounded)
-            bezier.add_point(tl+vd, outp=-vh)
-            bezier.add_point(tl+hd, -hh)
-            bezier.add_point(tr-hd, outp=hh)
-            bezier.add_point(tr+vd, -vh)
-            bezier.add_point(br-vd, outp=vh)
-            bezier.add_point(br-hd, hh)
-            bezier.add_point(bl+hd, outp=-hh)
-            bezier.add_point(bl-vd, vh)
-
-        bezier.close()
-        return bezier
+    @staticmethod
+    def beziers_from_values(positions, sizes, roundness, force_rounded=False):
+        """!
+        @brief Builds rectangle beziers from lists of property values
+        @param positions        Center of the rectangle for each frame
+        @param sizes            Size of the rectangle for each frame
+        @param roundness        Corner radius for each frame
+        @param force_rounded    If @c True, always generate the 8 points used for rounded corners
+        @returns A list of Bezier objects, one per frame
+        """
+        beziers = []
+        for pos, size, rounded in zip(positions, sizes, roundness):
+            x1 = pos[0] - size[0] / 2
+            y1 = pos[1] - size[1] / 2
+            x2 = pos[0] + size[0] / 2
+            y2 = pos[1] + size[1] / 2
+
+            if not force_rounded and rounded == 0:
+                zero = (0, 0)
+                beziers.append(_closed_bezier(
+                    [(x1, y1), (x2, y1), (x2, y2), (x1, y2)],
+                    [zero] * 4,
+                    [zero] * 4,
+                ))
+                continue
+
+            h = rounded / 2
+            beziers.append(_closed_bezier(
+                [
+                    (x1, y1 + rounded), (x1 + rounded, y1),
+                    (x2 - rounded, y1), (x2, y1 + rounded),
+                    (x2, y2 - rounded), (x2 - rounded, y2),
+                    (x1 + rounded, y2), (x1, y2 - rounded),
+                ],
+                [
+                    (0, 0), (-h, 0),
+                    (0, 0), (0, -h),
+                    (0, 0), (h, 0),
+                    (0, 0), (0, h),
+                ],
+                [
+                    (0, -h), (0, 0),
+                    (h, 0), (0, 0),
+                    (0, h), (0, 0),
+                    (-h, 0), (0, 0),
+                ],
+            ))
+        return beziers
 
 
 ## @ingroup Lottie
@@ -295,48 +371,48 @@ class Star(Shape):
         """!
         Returns a Shape corresponding to this star
         """
-        shape = Path()
-        kft = set()
-        if self.position.animated:
-            kft |= set(kf.time for kf in self.position.keyframes)
-        if self.inner_radius.animated:
-            kft |= set(kf.time for kf in self.inner_radius.keyframes)
-        if self.inner_roundness.animated:
-            kft |= set(kf.time for kf in self.inner_roundness.keyframes)
-        if self.points.animated:
-            kft |= set(kf.time for kf in self.points.keyframes)
-        if self.rotation.animated:
-            kft |= set(kf.time for kf in self.rotation.keyframes)
         # TODO inner_roundness / outer_roundness
-        if not kft:
-            shape.shape.value = self._bezier_t(0)
-        else:
-            for time in sorted(kft):
-                shape.shape.add_keyframe(time, self._bezier_t(time))
-        return shape
-
-    def _bezier_t(self, time):
-        bezier = Bezier()
-        pos = self.position.get_value(time)
-        r1 = self.inner_radius.get_value(time)
-        r2 = self.outer_radius.get_value(time)
-        rot = -(self.rotation.get_value(time)) * math.pi / 180 + math.pi
-        p = self.points.get_value(time)
-        halfd = -math.pi / p
-
-        for i in range(int(p)):
-            main_angle = rot + i * halfd * 2
-            dx = r2 * math.sin(main_angle)
-            dy = r2 * math.cos(main_angle)
-            bezier.add_point(NVector(pos.x + dx, pos.y + dy))
-
-            if self.star_type == StarType.Star:
-                dx = r1 * math.sin(main_angle+halfd)
-                dy = r1 * math.cos(main_angle+halfd)
-                bezier.add_point(NVector(pos.x + dx, pos.y + dy))
+        return self._animated_bezier([
+            self.position, self.inner_radius, self.outer_radius, self.points, self.rotation
+        ])
+
+    def bezier_frames(self, times):
+        times = list(times)
+        return self._cached_beziers(
+            self.beziers_from_values,
+            ("sr", self.star_type),
+            self.position.get_values(times),
+            self.inner_radius.get_values(times),
+            self.outer_radius.get_values(times),
+            self.rotation.get_values(times),
+            self.points.get_values(times),
+            star_type=self.star_type,
+        )
 
-        bezier.close()
-        return bezier
+    @staticmethod
+    def beziers_from_values(positions, inner_radii, outer_radii, rotations, points, star_type=StarType.Star):
+        """!
+        @brief Builds star / polygon beziers from lists of property values
+        @returns A list of Bezier objects, one per frame
+        """
+        beziers = []
+        is_star = star_type == StarType.Star
+        for pos, r1, r2, rotation, p in zip(positions, inner_radii, outer_radii, rotations, points):
+            rot = -rotation * math.pi / 180 + math.pi
+            halfd = -math.pi / p
+            x = pos[0]
+            y = pos[1]
+
+            vertices = []
+            for i in range(int(p)):
+                main_angle = rot + i * halfd * 2
+                vertices.append((x + r2 * math.sin(main_angle), y + r2 * math.cos(main_angle)))
+                if is_star:
+                    vertices.append((x + r1 * math.sin(main_angle + halfd), y + r1 * math.cos(main_angle + halfd)))
+
+            zero = [(0, 0)] * len(vertices)
+            beziers.append(_closed_bezier(vertices, zero, zero))
+        return beziers
 
 
 ## @ingroup Lottie
@@ -350,6 +426,7 @@ class Ellipse(Shape):
     ]
     ## %Shape type.
     type = "el"
+    _unit_circle = None
 
     def __init__(self, position=None, size=None):
         Shape.__init__(self)
@@ -373,28 +450,43 @@ class Ellipse(Shape):
         """!
         Returns a Shape corresponding to this ellipse
         """
-        shape = Path()
-        kft = set()
-        if self.position.animated:
-            kft |= set(kf.time for kf in self.position.keyframes)
-        if self.size.animated:
-            kft |= set(kf.time for kf in self.size.keyframes)
-        if not kft:
-            shape.shape.value = self._bezier_t(0)
-        else:
-            for time in sorted(kft):
-                shape.shape.add_keyframe(time, self._bezier_t(time))
-        return shape
+        return self._animated_bezier([self.position, self.size])
+
+    def bezier_frames(self, times):
+        times = list(times)
+        return self._cached_beziers(
+            self.beziers_from_values,
+            ("el",),
+            self.position.get_values(times),
+            self.size.get_values(times),
+        )
 
-    def _bezier_t(self, time):
-        from ..utils.ellipse import Ellipse as EllipseConverter
+    @staticmethod
+    def _unit_bezier():
+        if Ellipse._unit_circle is None:
+            from ..utils.ellipse import Ellipse as EllipseConverter
+            Ellipse._unit_circle = EllipseConverter(NVector(0, 0), NVector(1, 1), 0).to_bezier(0, math.pi*2)
+        return Ellipse._unit_circle
 
-        position = self.position.get_value(time)
-        radii = self.size.get_value(time) / 2
-        el = EllipseConverter(position, radii, 0)
-        bezier = el.to_bezier(0, math.pi*2)
-        bezier.close()
-        return bezier
+    @staticmethod
+    def beziers_from_values(positions, sizes):
+        """!
+        @brief Builds ellipse beziers from lists of property values
+        @returns A list of Bezier objects, one per frame
+        """
+        unit = Ellipse._unit_bezier()
+        beziers = []
+        for pos, size in zip(positions, sizes):
+            rx = size[0] / 2
+            ry = size[1] / 2
+            x = pos[0]
+            y = pos[1]
+            beziers.append(_closed_bezier(
+                [(x + v[0] * rx, y + v[1] * ry) for v in unit.vertices],
+                [(t[0] * rx, t[1] * ry) for t in unit.in_tangents],
+                [(t[0] * rx, t[1] * ry) for t in unit.out_tangents],
+            ))
+        return beziers
 
 
 ## @ingroup Lottie
@@ -783,6 +875,75 @@ class Repeater(Modifier):
         ## Transform values for each repeater copy
         self.transform = RepeaterTransform()
 
+    def _step_affine(self, time, amount):
+        """!
+        Affine matrix for @p amount applications of the repeater transform,
+        @p amount is expected to be between 0 and 1
+        """
+        tr = self.transform
+        anchor = tr.anchor_point.get_value(time) if tr.anchor_point else NVector(0, 0)
+        position = tr.position.get_value(time) if tr.position else NVector(0, 0)
+        scale = tr.scale.get_value(time) if tr.scale else NVector(100, 100)
+        rotation = tr.rotation.get_value(time) if tr.rotation else 0
+
+        sx = 1 + (scale[0] / 100 - 1) * amount
+        sy = 1 + (scale[1] / 100 - 1) * amount
+        rad = rotation * amount * math.pi / 180
+        cos = math.cos(rad)
+        sin = math.sin(rad)
+
+        # translate(-anchor), scale, rotate, translate(anchor + position)
+        a = sx * cos
+        b = sx * sin
+        c = -sy * sin
+        d = sy * cos
+        return (
+            a, b, c, d,
+            -anchor[0] * a - anchor[1] * c + anchor[0] + position[0] * amount,
+            -anchor[0] * b - anchor[1] * d + anchor[1] + position[1] * amount,
+        )
+
+    def copy_transforms(self, time=0):
+        """!
+        @brief Evaluates the matrix and opacity of every copy at @p time
+
+        Renderers can draw the repeated shapes once and reuse them for each copy.
+
+        @returns List of (TransformMatrix, opacity) tuples in painting order
+        (first one at the bottom), opacity is a percentage
+        """
+        from ..utils.transform import TransformMatrix, affine_multiply, affine_inverse
+
+        ncopies = int(round(self.copies.get_value(time))) if self.copies else 1
+        if ncopies <= 0:
+            return []
+
+        offset = self.offset.get_value(time) if self.offset else 0
+        whole = math.floor(offset)
+        step = self._step_affine(time, 1)
+        matrix = self._step_affine(time, offset - whole)
+        if whole:
+            whole_step = step if whole > 0 else affine_inverse(step)
+            if whole_step is None:
+                whole_step = (0, 0, 0, 0, 0, 0)
+            for i in range(abs(whole)):
+                matrix = affine_multiply(matrix, whole_step)
+
+        tr = self.transform
+        start_opacity = tr.start_opacity.get_value(time) if tr.start_opacity else 100
+        end_opacity = tr.end_opacity.get_value(time) if tr.end_opacity else 100
+
+        copies = []
+        for i in range(ncopies):
+            factor = i / (ncopies - 1) if ncopies > 1 else 0
+            opacity = start_opacity + (end_opacity - start_opacity) * factor
+            copies.append((TransformMatrix.from_affine(matrix), opacity))
+            matrix = affine_multiply(matrix, step)
+
+        if self.composite == Composite.Below:
+            copies.reverse()
+        return copies
+
 
 ## @ingroup Lottie
 ## @todo Implement SIF Export
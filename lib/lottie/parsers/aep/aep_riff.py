@@ -38,12 +38,14 @@ class EssentialType(enum.Enum):
 
 class AepParser(RiffParser):
     utf8_containers = ["tdsn", "fnam", "pdnm"]
+    state_attributes = ("prop_dimension", "list_type", "keyframe_type", "ldat_size", "essential_type")
 
-    def __init__(self, file):
+    def __init__(self, file, lazy=False):
         if file is not None:
-            super().__init__(file)
+            super().__init__(file, lazy)
 
             if self.header.format != "Egg!":
+                self.close()
                 raise Exception("Not an AEP file")
         else:
             # XML initialization
@@ -460,17 +462,20 @@ class AepParser(RiffParser):
         leftover = length % item_count
         value = StructuredData()
         items = []
+        raw = []
 
         for i in range(item_count):
             item = item_func(item_size)
             if self.keep_ldat_bytes:
                 if isinstance(item, bytes):
-                    value.raw_bytes += item
+                    raw.append(item)
                 else:
-                    value.raw_bytes += item.raw_bytes
+                    raw.append(item.raw_bytes)
             items.append(item)
 
         setattr(value, array_name, items)
+        if raw:
+            value.raw_bytes = b"".join(raw)
 
         if leftover:
             value._leftover = self.read(leftover)
@@ -656,7 +661,7 @@ class AepParser(RiffParser):
         elif self.essential_type == EssentialType.Enum:
             reader.read_attribute("value", 4, int)
         else:
-            return self.read(length)
+            return bytes(reader.read_raw(length))
 
         reader.finalize()
         return reader.value.value
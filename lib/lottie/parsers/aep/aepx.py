@@ -1,41 +1,63 @@
 import io
+from xml.etree import ElementTree
 
 from .riff import RiffChunk, RiffList
 from .aep_riff import AepParser
 
 
-def aepx_to_chunk(element, parser):
-    header = element.tag.rsplit("}", 1)[-1].ljust(4)
+## Elements converted from their text or children rather than into lists
+leaf_headers = {"ProjectXMPMetadata", "string", "numS", "ppSn"}
+
+
+def aepx_header(element):
+    return element.tag.rsplit("}", 1)[-1].ljust(4)
+
+
+def aepx_is_leaf(element, header):
+    return header in leaf_headers or "bdata" in element.attrib
+
+
+def aepx_list_header(header):
+    """!
+    @returns (header, list type) for an element that contains other chunks
+    """
+    if header == "AfterEffectsProject":
+        return "RIFX", ""
+    elif header in AepParser.utf8_containers:
+        return header, ""
+    return "LIST", header
+
+
+def aepx_leaf_to_chunk(element, header, parser):
     if header == "ProjectXMPMetadata":
-        chunk = RiffChunk(header, 0, element.text)
+        return RiffChunk(header, 0, element.text)
     elif header == "string":
         txt = element.text or ""
-        chunk = RiffChunk("Utf8", len(txt), txt)
+        return RiffChunk("Utf8", len(txt), txt)
     elif header == "numS":
         return RiffChunk(header, 0, int(element[0].text))
     elif header == "ppSn":
         return RiffChunk(header, 8, float(element[0].text))
-    elif "bdata" in element.attrib:
-        hex = element.attrib["bdata"]
-        raw = bytes(int(hex[i:i+2], 16) for i in range(0, len(hex), 2))
-
-        if header in parser.chunk_parsers:
-            bdata = io.BytesIO(raw)
-            parser.file = bdata
-            data = parser.chunk_parsers[header](parser, len(raw))
-        else:
-            data = raw
 
-        chunk = RiffChunk(header, len(raw), data)
+    raw = bytes.fromhex(element.attrib["bdata"])
+
+    if header in parser.chunk_parsers:
+        parser.file = io.BytesIO(raw)
+        data = parser.chunk_parsers[header](parser, len(raw))
     else:
-        if header == "AfterEffectsProject":
-            header = "RIFX"
-            type = ""
-        elif header in AepParser.utf8_containers:
-            type = ""
-        else:
-            type = header
-            header = "LIST"
+        data = raw
+
+    return RiffChunk(header, len(raw), data)
+
+
+def aepx_to_chunk(element, parser):
+    header = aepx_header(element)
+    if aepx_is_leaf(element, header):
+        chunk = aepx_leaf_to_chunk(element, header, parser)
+        if header == "numS" or header == "ppSn":
+            return chunk
+    else:
+        header, type = aepx_list_header(header)
 
         if header == "LIST":
             parser.on_list_start(type)
@@ -49,3 +71,54 @@ def aepx_to_chunk(element, parser):
     parser.on_chunk(chunk)
 
     return chunk
+
+
+def aepx_file_to_chunk(file, parser):
+    """!
+    @brief Converts an AEPX file like aepx_to_chunk() without loading the whole XML tree
+
+    Chunks are built as their elements are closed, and the elements are
+    discarded right after.
+    """
+    # Items are [element, header, list type, children], children is None for leaves
+    stack = []
+    # Depth inside the current leaf element, whose children are read when it's closed
+    leaf_depth = 0
+
+    for event, element in ElementTree.iterparse(file, ("start", "end")):
+        if leaf_depth:
+            leaf_depth += 1 if event == "start" else -1
+            if leaf_depth:
+                continue
+
+        if event == "start":
+            header = aepx_header(element)
+            if aepx_is_leaf(element, header):
+                stack.append((element, header, None, None))
+                leaf_depth = 1
+            else:
+                header, type = aepx_list_header(header)
+                if header == "LIST":
+                    parser.on_list_start(type)
+                stack.append((element, header, type, []))
+            continue
+
+        element, header, type, children = stack.pop()
+        if children is None:
+            chunk = aepx_leaf_to_chunk(element, header, parser)
+            notify = header != "numS" and header != "ppSn"
+        else:
+            chunk = RiffChunk(header, 0, RiffList(type, tuple(children)))
+            if header == "LIST":
+                parser.on_list_end(type)
+            notify = True
+
+        if notify:
+            parser.on_chunk(chunk)
+
+        if not stack:
+            return chunk
+
+        element.clear()
+        stack[-1][0].remove(element)
+        stack[-1][3].append(chunk)
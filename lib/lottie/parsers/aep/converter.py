@@ -1,5 +1,6 @@
 import os
 import enum
+import multiprocessing
 
 from ... import objects
 from ...nvector import NVector
@@ -7,7 +8,7 @@ from ...utils.color import Color
 from .gradient_xml import parse_gradient_xml
 
 try:
-    from .expressions import process_expression
+    from .expressions import ExpressionCache, default_cache
     can_convert_expressions = True
 except ImportError:
     can_convert_expressions = False
@@ -135,9 +136,7 @@ class Comp(Asset):
             anim.out_point = self.cdta.end_time / self.cdta.time_scale
         anim.layers = self.layers
         anim.markers = self.markers
-
-        for asset in self.used_assets:
-            anim.assets = [a.to_lottie() for a in self.used_assets]
+        anim.assets = [asset.to_lottie() for asset in sorted(self.used_assets, key=lambda asset: asset.id)]
 
         return anim
 
@@ -322,7 +321,11 @@ class AepConverter:
         "ADBE FreePin3": objects.effects.PuppetEffect,
     }
 
-    def __init__(self, expression_mode=ExpressionMode.Ignore):
+    def __init__(self, expression_mode=ExpressionMode.Ignore, expression_cache_path=None):
+        """!
+        @param expression_mode How to handle expressions
+        @param expression_cache_path Directory where converted expressions are stored for later imports
+        """
         self.time_mult = 1
         self.time_offset = 0
         self.assets = {}
@@ -330,6 +333,13 @@ class AepConverter:
         self.layers = {}
         self.effects = {}
         self.expression_mode = expression_mode
+        ## Top level chunk processed by process()
+        self.top_level = None
+        ## (property, expression) pairs converted when the composition has been loaded
+        self.pending_expressions = []
+        self.expression_cache = None
+        if expression_mode == ExpressionMode.Bodymovin:
+            self.expression_cache = ExpressionCache(expression_cache_path) if expression_cache_path else default_cache
 
     def read_properties(self, object, chunk):
         match_name = None
@@ -400,7 +410,7 @@ class AepConverter:
             if self.expression_mode == ExpressionMode.AsIs:
                 prop.expression = expr.data
             elif self.expression_mode == ExpressionMode.Bodymovin:
-                prop.expression = process_expression(expr.data)
+                self.pending_expressions.append((prop, expr.data))
 
     def time(self, value):
         return (value + self.time_offset) * self.time_mult
@@ -621,11 +631,12 @@ class AepConverter:
             layer = objects.layers.SolidColorLayer()
             layer.color = asset.color
         elif asset.width > 0 and asset.height > 0:
-            layer = objects.layers.ImageLayer()
-            layer.reference_id = asset.lottie_id
+            layer = objects.layers.ImageLayer(asset.lottie_id)
+            self.anim.used_assets.add(asset)
         else:
             layer = objects.layers.AudioLayer()
-            layer.reference_id = asset.lottie_id
+            layer.sound_id = asset.lottie_id
+            self.anim.used_assets.add(asset)
 
         layer.width = asset.width
         layer.height = asset.height
@@ -711,8 +722,21 @@ class AepConverter:
                 elif item.data.type == "SecL":
                     self.chunk_to_markerts(item, comp)
 
+        self.convert_expressions()
         return comp
 
+    def convert_expressions(self):
+        """!
+        @brief Converts the expressions collected while loading, each unique string only once
+        """
+        if not self.pending_expressions:
+            return
+
+        converted = self.expression_cache.convert_many(expr for prop, expr in self.pending_expressions)
+        for prop, expr in self.pending_expressions:
+            prop.expression = converted[expr]
+        self.pending_expressions = []
+
     def collect_assets(self, fold):
         for chunk in fold.data.children:
             if chunk.header == "LIST" and chunk.data.type == "Item":
@@ -768,12 +792,26 @@ class AepConverter:
             self.effects[match] = effect
 
     def process(self, top_level):
+        if self.top_level is top_level:
+            return
+
+        self.top_level = top_level
         fold, effects = top_level.data.find_multiple("Fold", "EfdG")
         self.collect_assets(fold)
         if effects:
             self.collect_effects(effects)
 
-    def import_aep(self, top_level, name):
+    def import_aep(self, top_level, name, all_comps=False, processes=0):
+        """!
+        @brief Converts a single composition
+        @param top_level Parsed project
+        @param name Name of the composition to convert, if empty the first one is used
+        @param all_comps If True, the other compositions are added as precomp assets
+        @param processes Number of worker processes used with @p all_comps
+        """
+        if all_comps:
+            return self.import_aep_with_precomps(top_level, name, processes)
+
         self.process(top_level)
 
         if not name:
@@ -784,3 +822,80 @@ class AepConverter:
         comp.load(self)
 
         return comp.to_main()
+
+    def import_aep_comps(self, top_level, names=None, processes=0):
+        """!
+        @brief Converts several compositions, reading the project only once
+        @param top_level Parsed project
+        @param names Names of the compositions to convert, if None converts all of them
+        @param processes If greater than 1, compositions are converted in a pool of
+            worker processes. Requires the `fork` start method, falls back to
+            converting them in this process otherwise
+        @returns dict mapping composition names to objects.Animation
+        """
+        self.process(top_level)
+
+        if names is None:
+            names = list(self.comps.keys())
+
+        comps = [(name, self.comps[name]) for name in names]
+
+        if processes and processes > 1 and len(comps) > 1 and "fork" in multiprocessing.get_all_start_methods():
+            return self._import_comps_pool(comps, processes)
+
+        animations = {}
+        for name, comp in comps:
+            comp.load(self)
+            animations[name] = comp.to_main()
+        return animations
+
+    def _import_comps_pool(self, comps, processes):
+        global _pool_converter
+        _pool_converter = self
+        try:
+            # Forked workers share the parsed project with this process
+            with multiprocessing.get_context("fork").Pool(min(processes, len(comps))) as pool:
+                dicts = pool.map(_convert_comp_in_worker, [name for name, comp in comps])
+        finally:
+            _pool_converter = None
+
+        return {
+            name: objects.animation.Animation.load(data)
+            for (name, comp), data in zip(comps, dicts)
+        }
+
+    def import_aep_with_precomps(self, top_level, name, processes=0):
+        """!
+        @brief Converts all compositions, @p name (or the first one) becomes
+        the main animation and the others are added as precomp assets
+        """
+        animations = self.import_aep_comps(top_level, None, processes)
+        if not name:
+            name = next(iter(self.comps.keys()))
+
+        main = animations.pop(name)
+        asset_ids = {asset.id for asset in main.assets}
+        for comp_name, animation in animations.items():
+            comp = self.comps[comp_name]
+            precomp = objects.assets.Precomp(comp.lottie_id, main)
+            precomp.name = comp_name
+            precomp.frame_rate = animation.frame_rate
+            precomp.layers = animation.layers
+            precomp._fixup()
+
+            # Footage used by the layers of the precomp
+            for asset in animation.assets:
+                if asset.id not in asset_ids:
+                    asset_ids.add(asset.id)
+                    main.assets.append(asset)
+
+        return main
+
+
+_pool_converter = None
+
+
+def _convert_comp_in_worker(name):
+    comp = _pool_converter.comps[name]
+    comp.load(_pool_converter)
+    return comp.to_main().to_dict()
@@ -1,4 +1,4 @@
-import io
+import re
 import enum
 import dataclasses
 
@@ -68,10 +68,41 @@ class Stream:
 
 
 class CosParser:
+    _skip_re = re.compile(rb"(?:\s+|%[^\n]*\n?)*")
+    _number_re = re.compile(rb"[+-]?[0-9]*(\.[0-9]*)?")
+    _keyword_re = re.compile(rb"[A-Za-z]+")
+    _identifier_re = re.compile(rb"[^\x00- \x7f-\xff()\[\]<>{}/%]*")
+    _hex_string_re = re.compile(rb"[0-9A-Fa-f\s]*")
+    _string_plain_re = re.compile(rb"[^)\\\r\n]+")
+    _octal_re = re.compile(rb"[0-7]{1,3}")
+    _plain_value_types = frozenset((
+        TokenType.String,
+        TokenType.HexString,
+        TokenType.Null,
+        TokenType.Boolean,
+        TokenType.Identifier,
+        TokenType.Stream,
+    ))
+
     def __init__(self, file, max_pos=None):
-        self.file = file
+        """!
+        @param file Binary file or bytes-like object with the COS data
+        @param max_pos Maximum number of bytes to read from @p file
+        """
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            data = bytes(file[:max_pos] if max_pos is not None else file)
+        elif max_pos is None:
+            data = file.read()
+        else:
+            data = file.read(max_pos)
+
+        self.data = data
         self.max_pos = max_pos
+        ## Index of the next byte to lex in data
+        self.pos = 0
+        self.end = len(data)
         self.lookahead = None
+        self._peeked = None
 
     def parse(self):
         self.lex()
@@ -85,19 +116,13 @@ class CosParser:
         return [val] + self.parse_array_content()
 
     def parse_value(self):
-        if (
-            self.lookahead.type == TokenType.String or
-            self.lookahead.type == TokenType.HexString or
-            self.lookahead.type == TokenType.Null or
-            self.lookahead.type == TokenType.Boolean or
-            self.lookahead.type == TokenType.Identifier or
-            self.lookahead.type == TokenType.Stream
-        ):
+        type = self.lookahead.type
+        if type in self._plain_value_types:
             val = self.lookahead.value
             self.lex()
             return val
 
-        if self.lookahead.type == TokenType.Number:
+        if type == TokenType.Number:
             val = self.lookahead.value
             self.lex()
             if self.lookahead.type == TokenType.Number:
@@ -117,7 +142,7 @@ class CosParser:
                     self.restore_state(state)
             return val
 
-        if self.lookahead.type == TokenType.ObjectStart:
+        if type == TokenType.ObjectStart:
             self.lex()
             val = self.parse_dict_content()
             self.expect(TokenType.ObjectEnd)
@@ -127,7 +152,7 @@ class CosParser:
                 self.lex()
             return val
 
-        if self.lookahead.type == TokenType.ArrayStart:
+        if type == TokenType.ArrayStart:
             self.lex()
             val = self.parse_array_content()
             self.expect(TokenType.ArrayEnd)
@@ -137,11 +162,12 @@ class CosParser:
         raise SyntaxError("Expected COS value, got %s" % self.lookahead)
 
     def save_state(self):
-        return (self.max_pos, self.file.tell(), self.lookahead)
+        return (self.pos, self.lookahead)
 
     def restore_state(self, state):
-        self.max_pos, pos, self.lookahead = state
-        self.file.seek(pos)
+        # Keep the token being discarded so lex() doesn't have to scan it again
+        self._peeked = (state[0], self.lookahead, self.pos)
+        self.pos, self.lookahead = state
 
     def parse_dict_content(self):
         value = {}
@@ -184,29 +210,41 @@ class CosParser:
             raise SyntaxError("Expected %s, got %s" % (token_type, self.lookahead))
 
     def lex(self):
-        self.lookahead = self.lex_token()
+        if self._peeked is not None and self._peeked[0] == self.pos:
+            _, self.lookahead, self.pos = self._peeked
+            self._peeked = None
+        else:
+            self.lookahead = self.lex_token()
 
     def lex_token(self):
-        while True:
-            char = self.get_char()
-            if char is None:
-                return Token(TokenType.Eof)
-            elif char == b"%":
-                self.lex_comment()
-            elif not char.isspace():
-                break
+        data = self.data
+        pos = self._skip_re.match(data, self.pos, self.end).end()
+        if pos >= self.end:
+            self.pos = pos
+            return Token(TokenType.Eof)
+
+        char = data[pos]
+        self.pos = pos + 1
+
+        # Number
+        if char in b"0123456789.+-":
+            return self.lex_number(pos)
+
+        # /foo
+        if char == 0x2f:
+            return self.lex_identifier()
+
+        char = data[pos:pos+1]
 
         # <<
         if char == b"<":
-            char = self.get_char()
-            if char == b"<":
+            next = data[self.pos:self.pos+1] if self.pos < self.end else b""
+            if next == b"<":
+                self.pos += 1
                 return Token(TokenType.ObjectStart)
-            elif char is None:
-                self.raise_lex(b"<")
-            elif self.is_hex(char):
-                return self.lex_hex_string(char)
-            else:
-                self.raise_lex(b"<" + char)
+            elif self.is_hex(next):
+                return self.lex_hex_string()
+            self.raise_lex(b"<" + next)
 
         # >>
         if char == b">":
@@ -221,28 +259,21 @@ class CosParser:
         if char == b"]":
             return Token(TokenType.ArrayEnd)
 
-        # /foo
-        if char == b"/":
-            return self.lex_identifier()
-
         # (foo)
         if char == b"(":
             return self.lex_string()
 
         # Keyword
         if char.isalpha():
-            return self.lex_keyword(char)
-
-        # Number
-        if char.isdigit() or char in b".+-":
-            return self.lex_number(char)
+            return self.lex_keyword(pos)
 
         self.raise_lex(char)
 
     def expect_char(self, exp, head):
-        char = self.get_char()
+        char = self.data[self.pos:self.pos+1] if self.pos < self.end else b""
         if char != exp:
             self.raise_lex(head+char, head+exp)
+        self.pos += 1
 
     def raise_lex(self, token, exp=None):
         msg = "Unknown COS token %s" % token
@@ -250,76 +281,17 @@ class CosParser:
             msg += ", expected %s" % exp
         raise SyntaxError(msg)
 
-    def get_char(self):
-        if self.max_pos is None:
-            return self.file.read(1)
-
-        if self.max_pos <= 0:
-            return None
-
-        char = self.file.read(1)
-        self.max_pos -= 1
-        return char
-
-    def unget(self):
-        self.file.seek(-1, io.SEEK_CUR)
-        if self.max_pos is not None:
-            self.max_pos += 1
-
-    # Skip until newline
-    def lex_comment(self):
-        while True:
-            char = self.get_char()
-            if char == b'\n':
-                break
-            elif char is None:
-                break
-
-    def lex_number(self, char):
-        if char == b'.':
-            return self.lex_num_fract(self.get_char(), char)
-        elif char == b'+' or char == b'-':
-            return self.lex_num_int(self.get_char(), char)
-        else:
-            return self.lex_num_int(char, b'')
+    def lex_number(self, start):
+        match = self._number_re.match(self.data, start, self.end)
+        self.pos = match.end()
+        if match[1] is not None:
+            return Token(TokenType.Number, float(match[0]))
+        return Token(TokenType.Number, int(match[0]))
 
-    def lex_num_int(self, char, head):
-        while True:
-            if char == b'.':
-                return self.lex_num_fract(self.get_char(), head + char)
-            elif char is None:
-                break
-            elif char.isdigit():
-                head += char
-                char = self.get_char()
-            else:
-                self.unget()
-                break
-        return Token(TokenType.Number, int(head))
-
-    def lex_num_fract(self, char, head):
-        while True:
-            if char is None:
-                break
-            elif char.isdigit():
-                head += char
-                char = self.get_char()
-            else:
-                self.unget()
-                break
-        return Token(TokenType.Number, float(head))
-
-    def lex_keyword(self, char):
-        kw = char
-        while True:
-            char = self.get_char()
-            if char is None:
-                break
-            elif char.isalpha():
-                kw += char
-            else:
-                self.unget()
-                break
+    def lex_keyword(self, start):
+        match = self._keyword_re.match(self.data, start, self.end)
+        self.pos = match.end()
+        kw = match[0]
 
         if kw == b"true":
             return Token(TokenType.Boolean, True)
@@ -341,153 +313,133 @@ class CosParser:
             raise SyntaxError("Unknown keyword %s" % kw)
 
     def lex_stream(self):
-        char = self.get_char()
-        if char == b'\r':
-            if self.get_char() != b'\n':
+        data = self.data
+        if data.startswith(b"\r", self.pos, self.end):
+            if not data.startswith(b"\r\n", self.pos, self.end):
                 raise SyntaxError("Invalid newline")
-        elif char != b'\n':
+            self.pos += 2
+        elif data.startswith(b"\n", self.pos, self.end):
+            self.pos += 1
+        else:
             raise SyntaxError("Expected newline after `stream`")
 
-        stream = b''
         marker = b'endstream'
-        while True:
-            char = self.get_char()
-            if char is None:
-                raise SyntaxError("Unterminated stream")
-            stream += char
-            if stream.endswith(marker):
-                break
+        marker_pos = data.find(marker, self.pos, self.end)
+        if marker_pos == -1:
+            raise SyntaxError("Unterminated stream")
 
-        return Token(TokenType.Stream, stream[:-len(marker)])
+        stream = data[self.pos:marker_pos]
+        self.pos = marker_pos + len(marker)
+        return Token(TokenType.Stream, stream)
 
     def lex_string(self):
-        string = b''
-        encoding = "utf-8"
+        data = self.data
+        end = self.end
+        pos = self.pos
+        chunks = []
+
+        while True:
+            match = self._string_plain_re.match(data, pos, end)
+            if match:
+                chunks.append(match[0])
+                pos = match.end()
 
-        for i in range(2):
-            char = self.lex_string_char()
-            if char is None:
+            if pos >= end:
+                raise SyntaxError("Unterminated string")
+
+            char = data[pos]
+            pos += 1
+            if char == 0x29: # )
                 break
-            string += char
+            elif char == 0x5c: # \
+                pos = self.lex_string_escape(pos, chunks)
+            elif char == 0x0d: # \r
+                if data.startswith(b"\n", pos, end):
+                    pos += 1
+                chunks.append(b"\n")
+            else: # \n
+                if data.startswith(b"\r", pos, end):
+                    pos += 1
+                chunks.append(b"\n")
+
+        self.pos = pos
+        string = b"".join(chunks)
+        encoding = "utf-8"
 
-        bom = string
+        bom = string[:2]
         if bom == b'\xfe\xff':
             encoding = "utf-16-be"
         elif bom == b'\xff\xfe':
             encoding = "utf-16-le"
 
-        while True:
-            char = self.lex_string_char()
-            if char is None:
-                break
-            string += char
-
         try:
             return Token(TokenType.String, string.decode(encoding))
         except UnicodeDecodeError:
             return Token(TokenType.String, bom + string)
 
-    def lex_string_char(self):
-        char = self.get_char()
-        if char is None:
+    _string_escapes = {
+        b'n': b'\n',
+        b'r': b'\r',
+        b'b': b'\b',
+        b'f': b'\f',
+        b'(': b'(',
+        b')': b')',
+        b'\\': b'\\',
+    }
+
+    def lex_string_escape(self, pos, chunks):
+        if pos >= self.end:
             raise SyntaxError("Unterminated string")
-        elif char == b')':
-            return None
-        elif char == b'\\':
-            return self.lex_string_escape()
-        elif char == b'\r':
-            if self.get_char() != b'\n':
-                self.unget()
-            return b'\n'
-        elif char == b'\n':
-            if self.get_char() != b'\r':
-                self.unget()
-            return b'\n'
-        else:
-            return char
 
-    def lex_string_escape(self):
-        char = self.get_char()
-        if char is None:
-            raise SyntaxError("Unterminated string")
+        char = self.data[pos:pos+1]
+        escaped = self._string_escapes.get(char)
+        if escaped is not None:
+            chunks.append(escaped)
+            return pos + 1
 
-        if char == b'n':
-            return b'\n'
-        elif char == b'r':
-            return b'\r'
-        elif char == b'b':
-            return b'\b'
-        elif char == b'f':
-            return b'\f'
-        elif char == b'(':
-            return b'('
-        elif char == b')':
-            return b')'
-        elif char == b'\\':
-            return b'\\'
-        elif self.is_octal(char):
-            octal = char[0] - b'0'[0]
-            for i in range(2):
-                char = self.get_char()
-                if char is None:
-                    break
-                elif not self.is_octal(char):
-                    self.unget()
-                    break
-                octal = octal*8 + char - b'0'[0]
-            return octal.to_bytes(1, "big")
+        match = self._octal_re.match(self.data, pos, self.end)
+        if match:
+            chunks.append((int(match[0], 8) & 0xff).to_bytes(1, "big"))
+            return match.end()
 
         raise SyntaxError("Invalid escape sequence")
 
-    def is_octal(self, char):
-        return b'0' <= char <= b'8'
-
     def is_hex(self, char):
         return char.isdigit() or b'a' <= char <= b'f' or b'A' <= char <= b'F'
 
-    def lex_hex_string(self, hstr):
-        while True:
-            char = self.get_char()
-            if char is None:
-                raise SyntaxError("Unterminated hex string")
-            elif char.is_hex():
-                hstr += char
-            elif char == b'>':
-                break
-            elif not char.isspace():
-                raise SyntaxError("Invalid character in hex string: %s" % char)
+    def lex_hex_string(self):
+        match = self._hex_string_re.match(self.data, self.pos, self.end)
+        pos = match.end()
+        if pos >= self.end:
+            raise SyntaxError("Unterminated hex string")
+        elif self.data[pos] != 0x3e: # >
+            raise SyntaxError("Invalid character in hex string: %s" % self.data[pos:pos+1])
 
+        self.pos = pos + 1
+        hstr = b"".join(match[0].split())
         if len(hstr) % 2:
             hstr += b'0'
 
-        data = b''
-        for i in range(0, len(hstr), 2):
-            data += int(hstr[i:i+1], 16).to_bytes(1, "big")
-
-        return Token(TokenType.HexString, data)
+        return Token(TokenType.HexString, bytes.fromhex(hstr.decode("ascii")))
 
     def lex_identifier(self):
+        match = self._identifier_re.match(self.data, self.pos, self.end)
+        self.pos = match.end()
+        raw = match[0]
+        if b"#" not in raw:
+            return Token(TokenType.Identifier, raw.decode("ascii"))
+
         ident = ""
-        special = b'()[]<>{}/%'
-        while True:
-            char = self.get_char()
-            if char is None:
-                break
-            elif char < b'!' or char > b'~':
-                self.unget()
-                break
-            elif char == b'#':
-                hexstr = b''
-                for i in range(2):
-                    char = self.get_char()
-                    if char is None or not self.is_hex(char):
-                        raise SyntaxError("Invalid identifier")
-                    hexstr += char
+        i = 0
+        while i < len(raw):
+            if raw[i] == 0x23: # #
+                hexstr = raw[i+1:i+3]
+                if len(hexstr) != 2 or not self.is_hex(hexstr[:1]) or not self.is_hex(hexstr[1:]):
+                    raise SyntaxError("Invalid identifier")
                 ident += chr(int(hexstr, 16))
-            elif char in special:
-                self.unget()
-                break
+                i += 3
             else:
-                ident += chr(char[0])
+                ident += chr(raw[i])
+                i += 1
 
         return Token(TokenType.Identifier, ident)
@@ -1,3 +1,7 @@
+import os
+import hashlib
+import collections
+
 import esprima
 import escodegen
 
@@ -168,10 +172,99 @@ class Converter:
         return node
 
 
-def process_expression(string):
+def convert_expression(string):
     """!
-    @brief converts expressions the same was as the bodymovin plugin
+    @brief converts expressions the same was as the bodymovin plugin, without caching
     """
     parsed = esprima.parseScript(string)
     Converter().process(parsed)
     return "var $bm_rt;\n" + escodegen.generate(parsed)
+
+
+class ExpressionCache:
+    """!
+    @brief Memoizes convert_expression() results
+
+    Keeps the most recently used conversions in memory and, if @p path is
+    given, stores them as files in that directory so they are reused by
+    later imports.
+    """
+    ## Bump when the conversion output changes to ignore stale files
+    version = 1
+
+    def __init__(self, path=None, max_size=4096):
+        ## Directory for the on-disk store, None to only cache in memory
+        self.path = path
+        self.max_size = max_size
+        self._memory = collections.OrderedDict()
+
+    def key(self, string):
+        return hashlib.sha256(("%s\0%s" % (self.version, string)).encode("utf8")).hexdigest()
+
+    def get(self, string):
+        """!
+        @brief Returns the converted expression, converting it if not cached
+        """
+        key = self.key(string)
+        converted = self._memory.get(key)
+        if converted is not None:
+            self._memory.move_to_end(key)
+            return converted
+
+        converted = self._load(key)
+        if converted is None:
+            converted = convert_expression(string)
+            self._store(key, converted)
+
+        self._memory[key] = converted
+        if len(self._memory) > self.max_size:
+            self._memory.popitem(False)
+        return converted
+
+    def convert_many(self, strings):
+        """!
+        @brief Converts each unique string once
+        @returns dict mapping the input strings to the converted expressions
+        """
+        return {string: self.get(string) for string in set(strings)}
+
+    def clear(self):
+        self._memory.clear()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key + ".js")
+
+    def _load(self, key):
+        if not self.path:
+            return None
+        try:
+            with open(self._file(key), "r", encoding="utf8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key, converted):
+        if not self.path:
+            return
+        filename = self._file(key)
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            # Write to a temporary file so concurrent imports never read partial data
+            tmp = "%s.%s.tmp" % (filename, os.getpid())
+            with open(tmp, "w", encoding="utf8") as f:
+                f.write(converted)
+            os.replace(tmp, filename)
+        except OSError:
+            pass
+
+
+## Cache used by process_expression()
+default_cache = ExpressionCache()
+
+
+def process_expression(string):
+    """!
+    @brief converts expressions the same was as the bodymovin plugin
+    @note Results are memoized in default_cache
+    """
+    return default_cache.get(string)
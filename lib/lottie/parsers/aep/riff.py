@@ -1,3 +1,5 @@
+import io
+import mmap
 import struct
 from dataclasses import dataclass
 
@@ -19,6 +21,8 @@ class Endianness:
 
 
 class BigEndian(Endianness):
+    struct_prefix = ">"
+
     @staticmethod
     def decode_data(data):
         value = 0
@@ -29,7 +33,7 @@ class BigEndian(Endianness):
         return value
 
     def decode(self, data):
-        return self.decode_data(data)
+        return int.from_bytes(data, "big")
 
     def decode_float64(self, data):
         return struct.unpack(">d", data)[0]
@@ -39,8 +43,10 @@ class BigEndian(Endianness):
 
 
 class LittleEndian(Endianness):
+    struct_prefix = "<"
+
     def decode(self, data):
-        return BigEndian.decode_data(reversed(data))
+        return int.from_bytes(data, "little")
 
     def decode_float64(self, data):
         return struct.unpack("<d", data)[0]
@@ -73,6 +79,11 @@ class RiffList:
             if ch.header == "LIST" and ch.data.type == type:
                 return ch
 
+    def find_all(self, header):
+        for ch in self.children:
+            if ch.header == header or (ch.header == "LIST" and ch.data.type == header):
+                yield ch
+
     def find_multiple(self, *headers):
         headers = list(headers)
         found = [None] * len(headers)
@@ -90,6 +101,37 @@ class RiffList:
         return found
 
 
+class LazyRiffList(RiffList):
+    """!
+    RiffList whose children are only read from the file when first accessed
+    """
+    def __init__(self, type, parser, offset, end, state):
+        self.type = type
+        self.parser = parser
+        ## Position of the first child in the file
+        self.offset = offset
+        ## Position past the last child in the file
+        self.end = end
+        ## Parser state when the list was found, restored when reading the children
+        self.state = state
+        self._children = None
+
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = self.parser.read_lazy_list(self)
+        return self._children
+
+    @property
+    def loaded(self):
+        return self._children is not None
+
+    def __repr__(self):
+        if self._children is None:
+            return "LazyRiffList(type=%r, offset=%s)" % (self.type, self.offset)
+        return "LazyRiffList(type=%r, children=%r)" % (self.type, self._children)
+
+
 sint = object()
 
 
@@ -101,7 +143,24 @@ class RiffHeader:
 
 
 class RiffParser:
-    def __init__(self, file):
+    ## Names of the attributes chunk parsers use to pass data to the following chunks
+    state_attributes = ()
+    lazy = False
+    ## Memory map created for the file, closed by close()
+    _mapped = None
+
+    def __init__(self, file, lazy=False):
+        """!
+        @param file Binary file to read from
+        @param lazy If True, LIST chunks are only decoded when their children are accessed.
+            When @p file is a real file, it is memory-mapped so reading a list only
+            touches the pages containing it, the map is kept until close() is called
+        """
+        self.lazy = lazy
+        if lazy:
+            file = self.mmap_file(file)
+            if isinstance(file, mmap.mmap):
+                self._mapped = file
         self.file = file
         magic = self.read(4)
         if magic == b"RIFF":
@@ -109,6 +168,7 @@ class RiffParser:
         elif magic == b"RIFX":
             endian = BigEndian()
         else:
+            self.close()
             raise Exception("Expected RIFF or RIFX")
 
         self.endian = endian
@@ -120,6 +180,31 @@ class RiffParser:
         self.chunk_parsers = {}
         self.weird_lists = {}
 
+    @staticmethod
+    def mmap_file(file):
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return file
+        mapped.seek(file.tell())
+        return mapped
+
+    def close(self):
+        """!
+        @brief Releases the memory map used for lazy parsing
+
+        Lazy lists that haven't been loaded can't be read after this
+        """
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def read(self, length):
         return self.file.read(length)
 
@@ -152,13 +237,11 @@ class RiffParser:
                 data = StructuredData()
                 data.type = type
                 data.data = self.weird_lists[type](self, length-4)
+            elif self.lazy:
+                data = LazyRiffList(type, self, self.file.tell(), end, self.save_state())
+                self.file.seek(end)
             else:
-                self.on_list_start(type)
-                children = []
-                while self.file.tell() < end:
-                    children.append(self.read_chunk(end))
-                data = RiffList(type, tuple(children))
-                self.on_list_end(type)
+                data = RiffList(type, self.read_list_children(type, end))
         elif header in self.chunk_parsers:
             data = self.chunk_parsers[header](self, length)
         else:
@@ -177,6 +260,35 @@ class RiffParser:
 
         return chunk
 
+    def read_list_children(self, type, end):
+        self.on_list_start(type)
+        children = []
+        while self.file.tell() < end:
+            children.append(self.read_chunk(end))
+        self.on_list_end(type)
+        return tuple(children)
+
+    def read_lazy_list(self, riff_list):
+        """!
+        @brief Reads the children of a LazyRiffList, preserving the current position and state
+        """
+        pos = self.file.tell()
+        state = self.save_state()
+        self.restore_state(riff_list.state)
+        self.file.seek(riff_list.offset)
+        try:
+            return self.read_list_children(riff_list.type, riff_list.end)
+        finally:
+            self.file.seek(pos)
+            self.restore_state(state)
+
+    def save_state(self):
+        return {name: getattr(self, name) for name in self.state_attributes}
+
+    def restore_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __iter__(self):
         while True:
             if self.file.tell() >= self.end:
@@ -210,16 +322,35 @@ class RiffParser:
 
 class StructuredData:
     def __init__(self):
-        self.raw_bytes = b''
+        self._raw = b''
+
+    @property
+    def raw_bytes(self):
+        """!
+        Bytes read so far from the chunk, only copied out of the chunk data when requested
+        """
+        return bytes(self._raw)
+
+    @raw_bytes.setter
+    def raw_bytes(self, value):
+        self._raw = value
 
 
 class StructuredReader:
+    ## struct format characters for unsigned integers, floats and signed integers by size
+    int_formats = {1: "B", 2: "H", 4: "I", 8: "Q"}
+    float_formats = {4: "f", 8: "d"}
+    sint_formats = {1: "b", 2: "h", 4: "i", 8: "q"}
+
     def __init__(self, parser, length):
         self.value = StructuredData()
         self.index = 0
         self.parser = parser
         self.length = length
         self.to_read = length
+        ## Chunk payload, read in one go and sliced without copying
+        self.data = memoryview(parser.read(length))
+        self.offset = 0
 
     def skip(self, byte_count):
         self.read_attribute("", byte_count, bytes)
@@ -245,13 +376,17 @@ class StructuredReader:
             self.skip(self.to_read)
 
     def read_raw(self, length):
-        raw = self.parser.read(length)
+        """!
+        @returns a memoryview of the next @p length bytes
+        """
+        start = self.offset
+        self.offset += length
         self.to_read -= length
-        self.value.raw_bytes += raw
-        return raw
+        self.value._raw = self.data[:self.offset]
+        return self.data[start:self.offset]
 
     def read_string0(self, length):
-        read = self.read_raw(length)
+        read = bytes(self.read_raw(length))
 
         try:
             read = read[:read.index(b'\0')]
@@ -264,10 +399,23 @@ class StructuredReader:
             return read
 
     def read_array(self, count, length, type):
-        value = []
-        for i in range(count):
-            value.append(self.read_value(length, type))
-        return value
+        if type is float:
+            code = self.float_formats.get(length)
+        elif type is int:
+            code = self.int_formats.get(length)
+        elif type is sint:
+            code = self.sint_formats.get(length)
+        else:
+            code = None
+
+        if code is None:
+            return [self.read_value(length, type) for i in range(count)]
+
+        if count * length > self.to_read:
+            raise Exception("Not enough data in chunk")
+
+        data = self.read_raw(count * length)
+        return list(struct.unpack("%s%s%s" % (self.parser.endian.struct_prefix, count, code), data))
 
     def read_value(self, length, type):
         if isinstance(type, list):
@@ -282,13 +430,13 @@ class StructuredReader:
         data = self.read_raw(length)
 
         if type is bytes:
-            return data
+            return bytes(data)
         elif type is int:
             return self.parser.endian.decode(data)
         elif type is sint:
             return self.parser.endian.decode_2comp(data)
         elif type is str:
-            return data.decode("utf8")
+            return str(data, "utf8")
         elif type is float:
             if length == 8:
                 return self.parser.endian.decode_float64(data)
@@ -1,123 +1,138 @@
+import itertools
+import multiprocessing
+
 from PIL import Image
 from .. import objects
 from .. import NVector, Color
 from ..utils.color import from_uint8
 
 
-class Polygen:
-    def __init__(self, x, y):
-        self.vertices = [
-            NVector(x, y),
-            NVector(x+1, y),
-            NVector(x+1, y+1),
-            NVector(x, y+1),
-        ]
-        self._has_x = False
-        self._has_y = False
-
-    def add_pixel_x(self, x, y):
-        i = self.vertices.index(NVector(x, y))
-        if len(self.vertices) > i and self.vertices[i+1] == NVector(x, y+1):
-            self._has_x = True
-            self.vertices.insert(i+1, NVector(x+1, y))
-            self.vertices.insert(i+2, NVector(x+1, y+1))
-        else:
-            raise ValueError()
-
-    def add_pixel_x_neg(self, x, y):
-        i = self.vertices.index(NVector(x+1, y))
-        if i > 0 and self.vertices[i-1] == NVector(x+1, y+1):
-            self._has_x = True
-            self.vertices.insert(i, NVector(x, y))
-            self.vertices.insert(i, NVector(x, y+1))
-        else:
-            raise ValueError()
-
-    def add_pixel_y(self, x, y):
-        i = self.vertices.index(NVector(x, y))
-        if i > 0 and self.vertices[i-1] == NVector(x+1, y):
-            self._has_y = True
-            if i > 1 and self.vertices[i-2] == NVector(x+1, y+1):
-                self.vertices[i-1] = NVector(x, y+1)
-            else:
-                self.vertices.insert(i, NVector(x, y+1))
-                self.vertices.insert(i, NVector(x+1, y+1))
-        else:
-            raise ValueError()
+def _pixel_regions(pixels, width, height):
+    """!
+    @brief Finds 4-connected areas of pixels with the same (non transparent) color
+    @param pixels Flat sequence of RGBA tuples, row by row
+    @returns List of (color, region) where region is a set of pixel indices
+    """
+    regions = []
+    labelled = bytearray(width * height)
+
+    for start, colort in enumerate(pixels):
+        if labelled[start] or colort[-1] == 0:
+            continue
+
+        labelled[start] = 1
+        region = {start}
+        stack = [start]
+        while stack:
+            index = stack.pop()
+            x = index % width
+            for neighbour, valid in (
+                (index - 1, x > 0),
+                (index + 1, x < width - 1),
+                (index - width, index >= width),
+                (index + width, index < len(labelled) - width),
+            ):
+                if valid and not labelled[neighbour] and pixels[neighbour] == colort:
+                    labelled[neighbour] = 1
+                    region.add(neighbour)
+                    stack.append(neighbour)
 
-    def _to_rect(self, id1, id2, scale):
-        p1 = self.vertices[id1] * scale
-        p2 = self.vertices[id2] * scale
-        return objects.Rect((p1+p2)/2, p2-p1)
+        regions.append((colort, region))
 
-    def to_shape(self, scale):
-        if not self._has_x or not self._has_y:
-            return self._to_rect(0, int(len(self.vertices)/2), scale)
-        bez = objects.Bezier()
-        bez.closed = True
-        for point in self.vertices:
-            point = point * scale
-            if len(bez.vertices) > 1 and (
-                bez.vertices[-1].x == bez.vertices[-2].x == point.x or
-                bez.vertices[-1].y == bez.vertices[-2].y == point.y
-            ):
-                bez.vertices[-1] = point
+    return regions
+
+
+def _region_outlines(region, width):
+    """!
+    @brief Traces the outlines of a region of pixels
+
+    Outlines are closed loops of corner points, going around the region
+    clockwise and around its holes counter-clockwise, so they can be filled
+    with the non-zero rule. Points along straight edges are skipped.
+    """
+    # Unit edges with the region on their right, mapping start to end points
+    edges = {}
+    for index in region:
+        y, x = divmod(index, width)
+        if index - width not in region:
+            edges.setdefault((x, y), []).append((x+1, y))
+        if x == width - 1 or index + 1 not in region:
+            edges.setdefault((x+1, y), []).append((x+1, y+1))
+        if index + width not in region:
+            edges.setdefault((x+1, y+1), []).append((x, y+1))
+        if x == 0 or index - 1 not in region:
+            edges.setdefault((x, y+1), []).append((x, y))
+
+    outlines = []
+    while edges:
+        start = next(iter(edges))
+        point = start
+        direction = None
+        loop = []
+        while True:
+            ends = edges[point]
+            if len(ends) == 1 or direction is None:
+                end = ends.pop()
             else:
-                bez.add_point(point)
+                # Corners shared with a diagonal part of the region, turn right
+                # to keep following the same pixel
+                dx, dy = direction
+                end = min(ends, key=lambda p: _turn_order(dx, dy, p[0] - point[0], p[1] - point[1]))
+                ends.remove(end)
+            if not ends:
+                del edges[point]
+
+            new_direction = (end[0] - point[0], end[1] - point[1])
+            if new_direction != direction:
+                loop.append(point)
+            direction = new_direction
+            point = end
+            if point == start:
+                break
+
+        # The start point might be in the middle of a straight edge
+        if len(loop) > 1 and (loop[0][0] == loop[1][0] == loop[-1][0] or loop[0][1] == loop[1][1] == loop[-1][1]):
+            loop.pop(0)
+        outlines.append(loop)
+
+    return outlines
+
+
+def _turn_order(dx, dy, ndx, ndy):
+    if (ndx, ndy) == (-dy, dx):
+        return 0
+    if (ndx, ndy) == (dx, dy):
+        return 1
+    return 2
+
+
+def _outline_to_shape(outline, scale):
+    # Holes go counter-clockwise so they need to be paths to keep their direction
+    area = sum(p1[0] * p2[1] - p2[0] * p1[1] for p1, p2 in zip(outline, outline[1:] + outline[:1]))
+    if len(outline) == 4 and area > 0:
+        xs = [p[0] for p in outline]
+        ys = [p[1] for p in outline]
+        p1 = NVector(min(xs), min(ys)) * scale
+        p2 = NVector(max(xs), max(ys)) * scale
+        return objects.Rect((p1+p2)/2, p2-p1)
 
-        if len(bez.vertices) > 2 and bez.vertices[0].x == bez.vertices[-1].x == bez.vertices[-2].x:
-            bez.vertices.pop()
-            bez.out_tangents.pop()
-            bez.in_tangents.pop()
-        return objects.Path(bez)
+    bez = objects.Bezier()
+    bez.closed = True
+    for x, y in outline:
+        bez.add_point(NVector(x, y) * scale)
+    return objects.Path(bez)
 
 
 def pixel_to_layer_paths(raster, scale=1, stroke_width=None):
     layer = objects.ShapeLayer()
     groups = {}
-    processed = set()
-    xneg_candidates = set()
     if stroke_width is None:
         stroke_width = 0.1 * scale
 
-    def avail(x, y):
-        rid = (x, y)
-        return not (
-            x < 0 or x >= raster.width or y >= raster.height or
-            rid in processed or raster.getpixel(rid) != colort
-        )
-
-    def recurse(gen, x, y, xneg):
-        processed.add((x, y))
-        if avail(x+1, y):
-            gen.add_pixel_x(x+1, y)
-            recurse(gen, x+1, y, False)
-        if avail(x, y+1):
-            gen.add_pixel_y(x, y+1)
-            recurse(gen, x, y+1, True)
-        if xneg and avail(x-1, y):
-            xneg_candidates.add((x-1, y))
-
-    for y in range(raster.height):
-        for x in range(raster.width):
-            pid = (x, y)
-            colort = raster.getpixel(pid)
-            if colort[-1] == 0 or pid in processed:
-                continue
-
-            gen = Polygen(x, y)
-            xneg_candidates = set()
-            recurse(gen, x, y, False)
-            xneg_candidates -= processed
-            while xneg_candidates:
-                p = next(iter(sorted(xneg_candidates, key=lambda t: (t[1], t[0]))))
-                gen.add_pixel_x_neg(*p)
-                recurse(gen, p[0], p[1], True)
-                processed.add(p)
-                xneg_candidates -= processed
-
-            g = groups.setdefault(colort, set())
-            g.add(gen.to_shape(scale))
+    for colort, region in _pixel_regions(list(raster.getdata()), raster.width, raster.height):
+        g = groups.setdefault(colort, [])
+        for outline in _region_outlines(region, raster.width):
+            g.append(_outline_to_shape(outline, scale))
 
     # Debug
     #for colort, rects in groups.items():
@@ -153,7 +168,11 @@ def pixel_add_layer_paths(animation, raster):
 
 
 def pixel_add_layer_rects(animation, raster):
-    layer = animation.add_layer(objects.ShapeLayer())
+    return animation.add_layer(pixel_to_layer_rects(raster))
+
+
+def pixel_to_layer_rects(raster):
+    layer = objects.ShapeLayer()
     last_rects = {}
     groups = {}
 
@@ -169,12 +188,14 @@ def pixel_add_layer_rects(animation, raster):
     def group(colort):
         return groups.setdefault(colort, set())
 
+    pixels = list(raster.getdata())
+
     for y in range(raster.height):
         rects = {}
         last_color = None
         last_rect = None
-        for x in range(raster.width):
-            colort = raster.getpixel((x, y))
+        row = pixels[y * raster.width:(y + 1) * raster.width]
+        for x, colort in enumerate(row):
             if colort[-1] == 0:
                 last_color = 0
                 continue
@@ -213,15 +234,23 @@ def pixel_add_layer_rects(animation, raster):
     return layer
 
 
-def _vectorizing_func(filenames, frame_delay, framerate, callback):
-    if not isinstance(filenames, list):
-        filenames = [filenames]
-
-    animation = objects.Animation(0, framerate)
+def _iter_frames(animation, filenames, frame_delay, framerate, file_callback):
+    """!
+    @brief Yields (image, frame, time, duration) for each frame of the input files
+    """
     nframes = 0
     time = 0
 
     for filename in filenames:
+        if file_callback:
+            size = file_callback(animation, filename, nframes, time, frame_delay)
+            if size is not None:
+                if nframes == 0:
+                    animation.width, animation.height = size
+                nframes += 1
+                time += frame_delay
+                continue
+
         if isinstance(filename, Image.Image):
             raster = filename
         else:
@@ -243,27 +272,140 @@ def _vectorizing_func(filenames, frame_delay, framerate, callback):
             image_duration = raster.info.get("duration", 0)
             if image_duration:
                 duration = framerate * image_duration / 1000
-            callback(animation, new_im, nframes + frame, time, duration)
+            yield new_im, nframes + frame, time, duration
             time += duration
             new_im.close()
         nframes += raster.n_frames
 
     animation.out_point = time
+
+
+def _merge_duplicate_frames(frames):
+    """!
+    @brief Merges consecutive frames with the same pixels into a single longer frame
+    """
+    last = None
+    last_data = None
+    for image, frame, time, duration in frames:
+        data = image.tobytes()
+        if last is not None:
+            if data == last_data and image.size == last[0].size:
+                last[3] += duration
+                continue
+            yield tuple(last)
+            last[0].close()
+        # Frame images are closed when the iterator moves on, so they are copied
+        last = [image.copy(), frame, time, duration]
+        last_data = data
+
+    if last is not None:
+        yield tuple(last)
+        last[0].close()
+
+
+def _vectorizing_func(filenames, frame_delay, framerate, callback, file_callback=None,
+                      frame_worker=None, processes=0, merge_duplicates=False):
+    """!
+    @param file_callback Optional function called with the file before it's decoded,
+        if it returns the image size the file is considered as handled and
+        is used as a single frame
+    @param frame_worker Optional function called on each frame image, its result is
+        passed to @p callback in place of the image
+    @param processes If greater than 1, @p frame_worker is run on that many worker processes.
+        The first frame is still processed here before the workers are started, so
+        @p frame_worker can initialize shared state from it.
+        Frames are processed serially on platforms that can't fork
+    @param merge_duplicates If True, consecutive identical frames are only processed once,
+        with their durations added together
+    """
+    if not isinstance(filenames, list):
+        filenames = [filenames]
+
+    animation = objects.Animation(0, framerate)
+    frames = _iter_frames(animation, filenames, frame_delay, framerate, file_callback)
+    if merge_duplicates:
+        frames = _merge_duplicate_frames(frames)
+
+    if frame_worker is None:
+        for image, frame, time, duration in frames:
+            callback(animation, image, frame, time, duration)
+    elif processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+        for image, frame, time, duration in frames:
+            callback(animation, frame_worker(image), frame, time, duration)
+            break
+        _process_frames_pool(animation, frames, callback, frame_worker, processes)
+    else:
+        for image, frame, time, duration in frames:
+            callback(animation, frame_worker(image), frame, time, duration)
+
     return animation
 
 
-def raster_to_embedded_assets(filenames, frame_delay=1, framerate=60, embed_format=None):
+def _process_frames_pool(animation, frames, callback, frame_worker, processes):
+    # Frames are decoded in batches to avoid holding all of them in memory
+    batch_size = processes * 4
+    batch = _frame_batch(frames, batch_size)
+    if not batch:
+        return
+
+    global _pool_frame_worker
+    _pool_frame_worker = frame_worker
+    try:
+        # Forked workers share the state of frame_worker with this process
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            while batch:
+                results = pool.map(_run_frame_worker, [image for image, frame, time, duration in batch])
+                for (image, frame, time, duration), result in zip(batch, results):
+                    image.close()
+                    callback(animation, result, frame, time, duration)
+                batch = _frame_batch(frames, batch_size)
+    finally:
+        _pool_frame_worker = None
+
+
+def _frame_batch(frames, batch_size):
+    # Frame images are closed when the iterator moves on, so they are copied
+    return [
+        (image.copy(), frame, time, duration)
+        for image, frame, time, duration in itertools.islice(frames, batch_size)
+    ]
+
+
+_pool_frame_worker = None
+
+
+def _run_frame_worker(image):
+    return _pool_frame_worker(image)
+
+
+def raster_to_embedded_assets(filenames, frame_delay=1, framerate=60, embed_format=None, lazy=False):
     """!
     @brief Loads external assets
+
+    Single frame files already in @p embed_format are embedded without being decoded.
+    @param lazy If True, the base64 data is only generated when serializing the animation
     """
-    def callback(animation, raster, frame, time, duration):
-        asset = objects.assets.Image.embedded(raster, embed_format)
+    def add_asset(animation, asset, time, duration):
         animation.assets.append(asset)
         layer = animation.add_layer(objects.ImageLayer(asset.id))
         layer.in_point = time
         layer.out_point = layer.in_point + duration
 
-    return _vectorizing_func(filenames, frame_delay, framerate, callback)
+    def callback(animation, raster, frame, time, duration):
+        add_asset(animation, objects.assets.Image.embedded(raster, embed_format, lazy), time, duration)
+
+    def file_callback(animation, filename, frame, time, duration):
+        if not isinstance(filename, str):
+            return None
+        asset = objects.assets.Image.embedded_raw(filename, embed_format, lazy)
+        if asset is None:
+            return None
+        # File names could be repeated
+        asset.id = "image_%s" % frame
+        add_asset(animation, asset, time, duration)
+        return asset.width, asset.height
+
+    return _vectorizing_func(filenames, frame_delay, framerate, callback, file_callback)
 
 
 def raster_to_linked_assets(filenames, frame_delay=1, framerate=60):
@@ -282,29 +424,40 @@ def raster_to_linked_assets(filenames, frame_delay=1, framerate=60):
     return animation
 
 
-def pixel_to_animation(filenames, frame_delay=1, framerate=60):
+def _layer_per_frame(filenames, frame_delay, framerate, to_layer, processes):
     """!
-    @brief Converts pixel art to vector
+    @brief Adds a layer for each frame, created by to_layer(raster)
     """
-    def callback(animation, raster, frame, time, duration):
-        layer = pixel_add_layer_rects(animation, raster.convert("RGBA"))
+    def worker(raster):
+        layer = to_layer(raster.convert("RGBA"))
+        # Lottie objects are sent back from worker processes as JSON data
+        return layer.to_dict() if processes > 1 else layer
+
+    def callback(animation, layer, frame, time, duration):
+        if processes > 1:
+            layer = objects.Layer.load(layer)
+        animation.add_layer(layer)
         layer.in_point = time
         layer.out_point = layer.in_point + duration
 
-    return _vectorizing_func(filenames, frame_delay, framerate, callback)
+    return _vectorizing_func(filenames, frame_delay, framerate, callback, frame_worker=worker, processes=processes)
 
 
-def pixel_to_animation_paths(filenames, frame_delay=1, framerate=60):
+def pixel_to_animation(filenames, frame_delay=1, framerate=60, processes=0):
+    """!
+    @brief Converts pixel art to vector
+    @param processes Number of worker processes used to convert frames
+    """
+    return _layer_per_frame(filenames, frame_delay, framerate, pixel_to_layer_rects, processes)
+
+
+def pixel_to_animation_paths(filenames, frame_delay=1, framerate=60, processes=0):
     """!
     @brief Converts pixel art to vector paths
 
     Slower and yields larger files compared to pixel_to_animation,
     but it produces a single shape for each area with the same color.
     Mostly useful when you want to add your own animations to the loaded image
+    @param processes Number of worker processes used to convert frames
     """
-    def callback(animation, raster, frame, time, duration):
-        layer = pixel_add_layer_paths(animation, raster.convert("RGBA"))
-        layer.in_point = time
-        layer.out_point = layer.in_point + duration
-
-    return _vectorizing_func(filenames, frame_delay, framerate, callback)
+    return _layer_per_frame(filenames, frame_delay, framerate, pixel_to_layer_paths, processes)
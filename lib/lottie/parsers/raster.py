@@ -2,6 +2,7 @@ from PIL import Image
 import glaxnimate
 from . import glaxnimate_helpers
 import enum
+import contextlib
 from .. import objects
 from ..nvector import NVector
 from .pixel import _vectorizing_func
@@ -136,18 +137,37 @@ class Vectorizer:
         return layer
 
     def raster_to_layer(self, animation, raster, layer_name=None):
-        layer = self.prepare_layer(animation, layer_name)
+        return self.beziers_to_layer(animation, self.raster_to_beziers(raster), layer_name)
+
+    def raster_to_beziers(self, raster):
+        """!
+        @brief Traces @p raster
+        @returns For each palette color, the list of objects.Bezier outlining it
+        """
         mono_data = self.trace_options.trace(raster, self.palette)
-        for (color, beziers), group in zip(mono_data, layer.shapes):
-            self.traced_to_shapes(group, beziers)
+        return [
+            [self.traced_to_bezier(bezier) for bezier in beziers]
+            for color, beziers in mono_data
+        ]
+
+    def beziers_to_layer(self, animation, color_beziers, layer_name=None):
+        """!
+        @brief Creates a layer from the output of raster_to_beziers()
+        """
+        layer = self.prepare_layer(animation, layer_name)
+        for beziers, group in zip(color_beziers, layer.shapes):
+            self.beziers_to_shapes(group, beziers)
         return layer
 
     def traced_to_shapes(self, group, beziers):
+        return self.beziers_to_shapes(group, map(self.traced_to_bezier, beziers))
+
+    def beziers_to_shapes(self, group, beziers):
         shapes = []
         for bezier in beziers:
             shape = group.insert_shape(0, objects.Path())
             shapes.append(shape)
-            shape.shape.value = self.traced_to_bezier(bezier)
+            shape.shape.value = bezier
         return shapes
 
     def traced_to_bezier(self, path):
@@ -162,17 +182,70 @@ class Vectorizer:
         return bezier
 
 
+def sample_frames(filenames, count):
+    """!
+    @brief Combines up to @p count frames, evenly spaced across the input files, into a single image
+
+    Useful to compute a palette that fits the whole animation
+    """
+    frames = []
+    with contextlib.ExitStack() as stack:
+        for filename in filenames:
+            if isinstance(filename, Image.Image):
+                raster = filename
+                if getattr(raster, "n_frames", 1) > 1:
+                    stack.callback(raster.seek, 0)
+            else:
+                raster = stack.enter_context(Image.open(filename))
+            frames += [(raster, frame) for frame in range(getattr(raster, "n_frames", 1))]
+
+        if count < len(frames):
+            step = (len(frames) - 1) / max(count - 1, 1)
+            frames = [frames[round(i * step)] for i in range(count)]
+
+        width = sum(raster.width for raster, frame in frames)
+        height = max(raster.height for raster, frame in frames)
+        sample = Image.new("RGBA", (width, height))
+        x = 0
+        for raster, frame in frames:
+            if frame:
+                raster.seek(frame)
+            frame_image = Image.new("RGBA", raster.size)
+            frame_image.paste(raster)
+            sample.paste(frame_image, (x, 0))
+            frame_image.close()
+            x += raster.width
+
+    return sample
+
+
 def raster_to_animation(
     filenames,
     n_colors=1,
     frame_delay=1,
     framerate=60,
     palette=[],
-    trace_options=TraceOptions()
+    trace_options=TraceOptions(),
+    processes=0,
+    palette_frames=1,
+    merge_duplicates=False
 ):
+    """!
+    @param processes Number of worker processes used to trace frames,
+        the palette is computed before starting them
+    @param palette_frames Number of frames, evenly spaced across the animation,
+        used to compute the palette. It's shared by all the frames
+    @param merge_duplicates If True, consecutive identical frames are traced once
+        into a single layer lasting for all of them
+    """
+    if not isinstance(filenames, list):
+        filenames = [filenames]
+
     vc = Vectorizer(trace_options)
+    if not palette and n_colors > 1 and palette_frames > 1:
+        vc.palette = trace_options.quantize(sample_frames(filenames, palette_frames), n_colors)
 
-    def callback(animation, raster, frame, time, duration):
+    def worker(raster):
         if vc.palette is None:
             if palette:
                 vc.palette = [glaxnimate_helpers.color_to_glaxnimate(c) for c in palette]
@@ -180,10 +253,22 @@ def raster_to_animation(
                 vc.palette = trace_options.quantize(raster, n_colors)
             else:
                 vc.palette = [glaxnimate.utils.Color(0, 0, 0, 255)]
-        layer = vc.raster_to_layer(animation, raster, "frame_%s" % frame)
+        color_beziers = vc.raster_to_beziers(raster)
+        if processes > 1:
+            # Lottie objects are sent back from worker processes as JSON data
+            return [[bezier.to_dict() for bezier in beziers] for beziers in color_beziers]
+        return color_beziers
+
+    def callback(animation, color_beziers, frame, time, duration):
+        if processes > 1:
+            color_beziers = [[objects.Bezier.load(bezier) for bezier in beziers] for beziers in color_beziers]
+        layer = vc.beziers_to_layer(animation, color_beziers, "frame_%s" % frame)
         layer.in_point = time
         layer.out_point = layer.in_point + duration
 
-    animation = _vectorizing_func(filenames, frame_delay, framerate, callback)
+    animation = _vectorizing_func(
+        filenames, frame_delay, framerate, callback,
+        frame_worker=worker, processes=processes, merge_duplicates=merge_duplicates
+    )
 
     return animation
@@ -1,7 +1,7 @@
 from xml.dom import minidom
 import enum
 from lottie.parsers.sif.sif.core import TypeDescriptor, ObjectRegistry, SifNodeMeta, FrameTime
-from lottie.parsers.sif.xml.utils import xml_child_elements, xml_first_element_child
+from lottie.parsers.sif.xml.utils import xml_child_elements, xml_first_element_child, xml_tag_name, xml_attribute
 
 
 class SifAstNode:
@@ -10,14 +10,15 @@ class SifAstNode:
 
     @staticmethod
     def from_dom(xml: minidom.Element, param: TypeDescriptor, registry: ObjectRegistry):
-        if xml.tagName == param.typename:
+        tag_name = xml_tag_name(xml)
+        if tag_name == param.typename:
             return SifValue.from_dom(xml, param, registry)
 
-        xmltype = xml.getAttribute("type")
+        xmltype = xml_attribute(xml, "type")
         if xmltype != param.typename and xmltype != "weighted_" + param.typename:
             raise ValueError("Invalid type %s (should be %s)" % (xmltype, param.typename))
 
-        return SifAstNode.ast_node_types()[xml.tagName].from_dom(xml, param, registry)
+        return SifAstNode.ast_node_types()[tag_name].from_dom(xml, param, registry)
 
     @staticmethod
     def ast_node_types():
@@ -74,9 +75,9 @@ class SifKeyframe:
     def from_dom(cls, xml: minidom.Element, param: TypeDescriptor, registry: ObjectRegistry):
         return cls(
             param.value_from_xml_element(xml_first_element_child(xml), registry),
-            FrameTime.parse_string(xml.getAttribute("time"), registry),
-            Interpolation(xml.getAttribute("before")),
-            Interpolation(xml.getAttribute("after"))
+            FrameTime.parse_string(xml_attribute(xml, "time"), registry),
+            Interpolation(xml_attribute(xml, "before")),
+            Interpolation(xml_attribute(xml, "after"))
         )
 
     def to_dom(self, dom: minidom.Document, param: TypeDescriptor):
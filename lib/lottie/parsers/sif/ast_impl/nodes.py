@@ -8,6 +8,7 @@ from lottie.parsers.sif.xml.wrappers import XmlBoneReference, XmlSifElement, Xml
 from lottie.parsers.sif.sif.nodes import Segment, WeightedVector, Bline
 from lottie.parsers.sif.sif.enums import Smooth
 from lottie.parsers.sif.sif.core import SifNodeMeta, FrameTime
+from lottie.parsers.sif.xml.utils import xml_attribute
 
 
 class SifAstComplex(SifAstNode, metaclass=SifNodeMeta):
@@ -182,7 +183,7 @@ class SifComposite(SifAstComplex):
 
     @classmethod
     def get_class_from_dom(cls, xml: minidom.Element, param: TypeDescriptor, registry: ObjectRegistry):
-        type = xml.getAttribute("type")
+        type = xml_attribute(xml, "type")
         if type == "vector":
             return SifVectorComposite
         return None
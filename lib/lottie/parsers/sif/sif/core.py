@@ -3,7 +3,7 @@ import enum
 from uuid import uuid4
 
 from lottie.nvector import NVector
-from lottie.parsers.sif.xml.utils import xml_text, str_to_bool
+from lottie.parsers.sif.xml.utils import xml_text, str_to_bool, xml_tag_name, xml_attribute, xml_first_element_child
 from lottie.parsers.sif.xml.utils import xml_child_elements, value_from_xml_string, xml_make_text, value_to_xml_string
 from lottie.parsers.sif.sif.frame_time import FrameTime
 
@@ -81,26 +81,27 @@ class TypeDescriptor:
         return self._type_tag_names.get(self.typename, self.typename)
 
     def value_from_xml_element(self, xml: minidom.Element, registry: ObjectRegistry):
-        if xml.tagName != self.tag_name:
-            raise ValueError("Wrong value type (%s instead of %s)" % (xml.tagName, self.tag_name))
+        tag_name = xml_tag_name(xml)
+        if tag_name != self.tag_name:
+            raise ValueError("Wrong value type (%s instead of %s)" % (tag_name, self.tag_name))
 
-        guid = xml.getAttribute("guid")
+        guid = xml_attribute(xml, "guid")
         if guid and guid in registry.registry:
             value = registry.registry[guid]
         elif self.typename == "vector":
             value = NVector(
-                float(xml_text(xml.getElementsByTagName("x")[0])),
-                float(xml_text(xml.getElementsByTagName("y")[0]))
+                float(xml_text(xml_first_element_child(xml, "x"))),
+                float(xml_text(xml_first_element_child(xml, "y")))
             )
-            if xml.getAttribute("guid"):
-                value.guid = xml.getAttribute("guid")
+            if guid:
+                value.guid = guid
                 registry.register(value)
         elif self.typename == "color":
             value = NVector(
-                float(xml_text(xml.getElementsByTagName("r")[0])),
-                float(xml_text(xml.getElementsByTagName("g")[0])),
-                float(xml_text(xml.getElementsByTagName("b")[0])),
-                float(xml_text(xml.getElementsByTagName("a")[0]))
+                float(xml_text(xml_first_element_child(xml, "r"))),
+                float(xml_text(xml_first_element_child(xml, "g"))),
+                float(xml_text(xml_first_element_child(xml, "b"))),
+                float(xml_text(xml_first_element_child(xml, "a")))
             )
         elif self.typename == "gradient":
             value = [
@@ -108,18 +109,18 @@ class TypeDescriptor:
                 for sub in xml_child_elements(xml, GradientPoint.type.typename)
             ]
         elif self.typename == "real" or self.typename == "angle":
-            value = float(xml.getAttribute("value"))
+            value = float(xml_attribute(xml, "value"))
         elif self.typename == "integer":
-            value = int(xml.getAttribute("value"))
+            value = int(xml_attribute(xml, "value"))
         elif self.typename == "time":
-            value = FrameTime.parse_string(xml.getAttribute("value"), registry)
+            value = FrameTime.parse_string(xml_attribute(xml, "value"), registry)
         elif self.typename == "bool":
-            value = str_to_bool(xml.getAttribute("value"))
+            value = str_to_bool(xml_attribute(xml, "value"))
         elif self.typename == "string":
             return xml_text(xml)
         elif self.typename == "bone_object":
             # Already done above but this forces the guid to be present
-            return registry.get_object(xml.getAttribute("guid"))
+            return registry.get_object(xml_attribute(xml, "guid"))
         else:
             raise ValueError("Unsupported type %s" % self.typename)
 
@@ -141,7 +142,7 @@ class GradientPoint:
     @classmethod
     def from_dom(cls, xml: minidom.Element, registry: ObjectRegistry):
         return GradientPoint(
-            value_from_xml_string(xml.getAttribute("pos"), float, registry),
+            value_from_xml_string(xml_attribute(xml, "pos"), float, registry),
             cls.type.value_from_xml_element(xml, registry)
         )
 
@@ -1,10 +1,12 @@
 import enum
+from xml.etree import ElementTree
 from lottie.parsers.sif.sif.core import SifNodeMeta, FrameTime
 from lottie.parsers.sif.sif.enums import Smooth
 from lottie.parsers.sif.xml.utils import *
 from lottie.parsers.sif.xml.core_nodes import *
 from lottie.parsers.sif.xml.animatable import *
 from lottie.parsers.sif.xml.wrappers import *
+from lottie.parsers.sif.xml.writer import SifXmlWriter
 
 
 class SifNode(metaclass=SifNodeMeta):
@@ -42,11 +44,12 @@ class AbstractTransform(SifNode):
 
     @classmethod
     def from_dom(cls, xml: minidom.Element, registry: ObjectRegistry):
-        if xml.tagName == "bone_link":
+        tag_name = xml_tag_name(xml)
+        if tag_name == "bone_link":
             return SifNode.static_from_dom(BoneLinkTransform, xml, registry)
 
-        if xml.tagName != "composite":
-            raise ValueError("Invalid transform element: %s" % xml.tagName)
+        if tag_name != "composite":
+            raise ValueError("Invalid transform element: %s" % tag_name)
         return SifNode.static_from_dom(SifTransform, xml, registry)
 
 
@@ -135,7 +138,7 @@ class Def(SifNode):
     def from_dom(cls, xml: minidom.Element, registry: ObjectRegistry):
         actual_class = cls
         if cls == Def:
-            actual_class = Def.def_types()[xml.tagName]
+            actual_class = Def.def_types()[xml_tag_name(xml)]
 
         obj = SifNode.static_from_dom(actual_class, xml, registry)
         if obj.id:
@@ -223,7 +226,7 @@ class Layer(SifNode):
     def from_dom(cls, xml: minidom.Element, registry: ObjectRegistry):
         actual_class = cls
         if cls == Layer:
-            type = xml.getAttribute("type")
+            type = xml_attribute(xml, "type")
             actual_class = Layer.layer_types().get(type, Layer)
 
         return SifNode.static_from_dom(actual_class, xml, registry)
@@ -576,7 +579,7 @@ class BoneRoot(SifNode):
 
     @classmethod
     def from_dom(cls, xml: minidom.Element, registry: ObjectRegistry):
-        if xml.tagName == "bone_root":
+        if xml_tag_name(xml) == "bone_root":
             val = SifNode.static_from_dom(BoneRoot, xml, registry)
         else:
             val = SifNode.static_from_dom(Bone, xml, registry)
@@ -1116,16 +1119,28 @@ class Canvas(SifNode, ObjectRegistry):
         dom.appendChild(self.to_dom(dom))
         return dom
 
+    def write_xml(self, file, pretty=True):
+        """!
+        @brief Writes the canvas to a text file without building the whole DOM tree first
+        """
+        SifXmlWriter(file, pretty).write(self)
+
     @classmethod
     def from_xml_file(cls, xml):
-        if isinstance(xml, str):
-            with open(xml, "r") as file:
-                return cls.from_xml(minidom.parse(file))
-        return cls.from_xml(minidom.parse(xml))
+        """!
+        @brief Loads a canvas from a file name or file object
+
+        Uses ElementTree, which is much faster and lighter than minidom on large files
+        """
+        return cls.from_etree(ElementTree.parse(xml))
 
     @classmethod
     def from_xml_string(cls, xml):
-        return cls.from_xml(minidom.parseString(xml))
+        return cls.from_dom(ElementTree.fromstring(xml))
+
+    @classmethod
+    def from_etree(cls, xml: ElementTree.ElementTree):
+        return cls.from_dom(xml.getroot())
 
     @classmethod
     def from_xml(cls, xml: minidom.Document):
@@ -16,7 +16,7 @@ class XmlAnimatable(XmlDescriptor):
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry, param: TypeDescriptor = None):
         cn = xml_first_element_child(parent, self.name)
-        if cn:
+        if cn is not None:
             value = SifAstNode.from_dom(xml_first_element_child(cn), self.type_for(param), registry)
         else:
             value = self.default()
@@ -58,8 +58,8 @@ class XmlParam(XmlDescriptor):
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         for cn in xml_child_elements(parent, "param"):
-            if cn.getAttribute("name") == self.name:
-                use = cn.getAttribute("use")
+            if xml_attribute(cn, "name") == self.name:
+                use = xml_attribute(cn, "use")
                 if use:
                     value = registry.get_object(use)
                 else:
@@ -127,12 +127,12 @@ class XmlDynamicListParam(XmlDescriptor):
         values = []
 
         for cn in xml_child_elements(parent, "param"):
-            if cn.getAttribute("name") == self.name:
+            if xml_attribute(cn, "name") == self.name:
                 list = xml_first_element_child(cn)
-                if list.getAttribute("type") != self.type.typename:
+                if xml_attribute(list, "type") != self.type.typename:
                     raise ValueError(
                         "Wrong type for %s: got %s instead of %s" %
-                        (self.name, self.type.typename, list.getAttribute("type"))
+                        (self.name, self.type.typename, xml_attribute(list, "type"))
                     )
                 for entry in xml_child_elements(list, "entry"):
                     values.append(self._value_from_dom(xml_first_element_child(entry), registry))
@@ -67,7 +67,7 @@ class ValueReference:
 
 class XmlAttribute(TypedXmlDescriptor):
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
-        xml_str = parent.getAttribute(self.name)
+        xml_str = xml_attribute(parent, self.name)
         if xml_str:
             if xml_str.startswith(":") and xml_str[1:] in registry.registry:
                 value = ValueReference.from_registry(xml_str[1:], registry)
@@ -100,7 +100,7 @@ class XmlFixedAttribute(XmlDescriptor):
         return value
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
-        xml_str = parent.getAttribute(self.name)
+        xml_str = xml_attribute(parent, self.name)
         setattr(obj, self.att_name, value_from_xml_string(xml_str, self.type, registry))
 
     def default(self):
@@ -110,7 +110,7 @@ class XmlFixedAttribute(XmlDescriptor):
 class XmlSimpleElement(TypedXmlDescriptor):
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         cn = xml_first_element_child(parent, self.name, allow_none=True)
-        if cn:
+        if cn is not None:
             value = value_from_xml_string(xml_text(cn), self.type, registry)
         else:
             value = self.default_value
@@ -126,8 +126,8 @@ class XmlSimpleElement(TypedXmlDescriptor):
 class XmlMeta(TypedXmlDescriptor):
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         for cn in xml_child_elements(parent, "meta"):
-            if cn.getAttribute("name") == self.name:
-                value = value_from_xml_string(cn.getAttribute("content"), self.type, registry)
+            if xml_attribute(cn, "name") == self.name:
+                value = value_from_xml_string(xml_attribute(cn, "content"), self.type, registry)
                 break
         else:
             value = self.default_value
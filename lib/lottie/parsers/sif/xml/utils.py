@@ -1,4 +1,5 @@
 from xml.dom import minidom
+from xml.etree import ElementTree
 from distutils.util import strtobool
 
 from lottie.nvector import NVector
@@ -46,7 +47,34 @@ def value_isinstance(value, type):
     return isinstance(value, type)
 
 
+def xml_is_etree(node):
+    """!
+    @brief Whether @p node comes from ElementTree rather than minidom
+
+    The loading code works with both, ElementTree being much lighter for large files
+    """
+    return isinstance(node, ElementTree.Element)
+
+
+def xml_tag_name(node):
+    if xml_is_etree(node):
+        return node.tag
+    return node.tagName
+
+
+def xml_attribute(node, name):
+    """!
+    @brief Returns the value of an attribute or an empty string if not present (like minidom's getAttribute)
+    """
+    if xml_is_etree(node):
+        return node.get(name, "")
+    return node.getAttribute(name)
+
+
 def xml_text(node):
+    if xml_is_etree(node):
+        return (node.text or "") + "".join(ch.tail or "" for ch in node)
+
     return "".join(
         x.nodeValue
         for x in node.childNodes
@@ -71,9 +99,12 @@ def xml_element_matches(ch: minidom.Node, tagname=None):
 
 
 def xml_child_elements(xml: minidom.Node, tagname=None):
-    for ch in xml.childNodes:
-        if xml_element_matches(ch, tagname):
-            yield ch
+    if xml_is_etree(xml):
+        if tagname is None:
+            return iter(xml)
+        return (ch for ch in xml if ch.tag == tagname)
+
+    return (ch for ch in xml.childNodes if xml_element_matches(ch, tagname))
 
 
 def xml_first_element_child(xml: minidom.Node, tagname=None, allow_none=False):
@@ -82,4 +113,4 @@ def xml_first_element_child(xml: minidom.Node, tagname=None, allow_none=False):
 
     if allow_none:
         return None
-    raise ValueError("No %s in %s" % (tagname or "child element", getattr(xml, "tagName", "node")))
+    raise ValueError("No %s in %s" % (tagname or "child element", getattr(xml, "tag", None) or getattr(xml, "tagName", "node")))
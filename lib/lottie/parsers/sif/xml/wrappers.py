@@ -10,7 +10,7 @@ class XmlParamSif(XmlDescriptor):
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         for cn in xml_child_elements(parent, "param"):
-            if cn.getAttribute("name") == self.name:
+            if xml_attribute(cn, "name") == self.name:
                 value = self.child_node.from_dom(xml_first_element_child(cn), registry)
                 break
         else:
@@ -85,7 +85,7 @@ class XmlSifElement(XmlDescriptor):
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         cn = xml_first_element_child(parent, self.name, allow_none=True)
-        if cn:
+        if cn is not None:
             if self.nested:
                 element = xml_first_element_child(cn)
             else:
@@ -126,7 +126,7 @@ class XmlList(XmlDescriptor):
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         values = self.default()
         for cn in xml_child_elements(parent):
-            if cn.tagName in self.tags:
+            if xml_tag_name(cn) in self.tags:
                 value_node = cn
                 if self.wrapper_tag:
                     value_node = xml_first_element_child(cn)
@@ -155,7 +155,7 @@ class XmlWrapper(XmlDescriptor):
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         wrapper = xml_first_element_child(parent, self.name, True)
-        if wrapper:
+        if wrapper is not None:
             return self.wrapped.from_xml(obj, wrapper, registry)
         return self.default()
 
@@ -180,7 +180,7 @@ class XmlWrapperParam(XmlWrapper):
 
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         for wrapper in xml_child_elements(parent, "param"):
-            if wrapper.getAttribute("name") == self.name:
+            if xml_attribute(wrapper, "name") == self.name:
                 return self.wrapped.from_xml(obj, wrapper, registry)
         return self.default()
 
@@ -204,12 +204,12 @@ class XmlBoneReference(XmlDescriptor):
     def from_xml(self, obj, parent: minidom.Element, registry: ObjectRegistry):
         node = xml_first_element_child(parent, self.name, True)
         value = None
-        if node:
+        if node is not None:
             value_node = xml_first_element_child(node, "bone_valuenode", True)
-            if value_node:
-                value = registry.get_object(value_node.getAttribute("guid"))
-                if value.type != value_node.getAttribute("type"):
-                    raise ValueError("Bone type %s is not %s" % (value.type, value_node.getAttribute("type")))
+            if value_node is not None:
+                value = registry.get_object(xml_attribute(value_node, "guid"))
+                if value.type != xml_attribute(value_node, "type"):
+                    raise ValueError("Bone type %s is not %s" % (value.type, xml_attribute(value_node, "type")))
 
         setattr(obj, self.att_name, value)
 
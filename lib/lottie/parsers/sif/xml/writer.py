@@ -0,0 +1,118 @@
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+
+class XmlWriterElement(ElementTree.Element):
+    """!
+    Lightweight element implementing the parts of the minidom API used by the to_dom/to_xml methods
+    """
+    def appendChild(self, child):
+        if isinstance(child, str):
+            self.text = (self.text or "") + child
+        else:
+            self.append(child)
+        return child
+
+    def setAttribute(self, name, value):
+        self.set(name, value)
+
+
+class XmlWriterDocument:
+    """!
+    Stand-in for minidom.Document that creates XmlWriterElement objects
+    """
+    def createElement(self, tag_name):
+        return XmlWriterElement(tag_name)
+
+    def createTextNode(self, text):
+        return text
+
+
+def _indent_tree(element, space, level=0):
+    """!
+    @brief Fallback for ElementTree.indent(), which needs Python 3.9
+    """
+    def indent_children(element, depth):
+        child_indent = "\n" + space * (depth + 1)
+        if not element.text or not element.text.strip():
+            element.text = child_indent
+        for child in element:
+            if len(child):
+                indent_children(child, depth + 1)
+            if not child.tail or not child.tail.strip():
+                child.tail = child_indent
+        # The last child is followed by the closing tag of its parent
+        if not child.tail.strip():
+            child.tail = "\n" + space * depth
+
+    if len(element):
+        indent_children(element, level)
+
+
+_indent = getattr(ElementTree, "indent", _indent_tree)
+
+
+class SifXmlWriter:
+    """!
+    @brief Writes SIF nodes to a text file as they are converted to XML
+
+    Only the top-level element is kept open, each of its children is
+    converted, written and discarded before moving to the next one,
+    so the whole document is never in memory at once.
+    """
+    _attribute_escapes = {'"': "&quot;", "\n": "&#10;", "\t": "&#9;"}
+
+    def __init__(self, file, pretty=True, indent="  "):
+        self.file = file
+        self.indent = indent if pretty else ""
+        self.newline = "\n" if pretty else ""
+        self.dom = XmlWriterDocument()
+
+    def write(self, node):
+        """!
+        @brief Writes the XML declaration and the given SifNode
+        """
+        self.file.write('<?xml version="1.0" ?>' + self.newline)
+        self.write_node(node)
+
+    def write_node(self, node):
+        element = self.dom.createElement(node._tag)
+        started = False
+
+        for descriptor in node._nodes:
+            descriptor.to_xml(node, element, self.dom)
+            if len(element) == 0 and element.text is None:
+                continue
+
+            if not started:
+                self._write_start(element)
+                started = True
+                attributes = len(element.attrib)
+            elif len(element.attrib) != attributes:
+                raise ValueError("Attribute added to <%s> after its children" % element.tag)
+
+            if element.text:
+                self.file.write(escape(element.text))
+                element.text = None
+
+            for child in element:
+                self._write_child(child)
+            del element[:]
+
+        if started:
+            self.file.write("</%s>%s" % (element.tag, self.newline))
+        else:
+            self._write_child(element, 0)
+
+    def _write_start(self, element):
+        self.file.write("<%s" % element.tag)
+        for name, value in element.attrib.items():
+            self.file.write(' %s="%s"' % (name, escape(value, self._attribute_escapes)))
+        self.file.write(">" + self.newline)
+
+    def _write_child(self, child, level=1):
+        if self.indent:
+            _indent(child, self.indent, level)
+        self.file.write(self.indent * level)
+        self.file.write(ElementTree.tostring(child, "unicode"))
+        self.file.write(self.newline)
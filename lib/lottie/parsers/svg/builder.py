@@ -562,11 +562,11 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
 
     def build_repeater(self, shape, child, shapegroup, out_parent):
         original = self.shapegroup_process_child(child, shapegroup, out_parent)
-        if not original:
+        if original is None:
             return
 
-        ncopies = int(round(shape.copies.get_value(self.time)))
-        if ncopies == 1:
+        copies = shape.copy_transforms(self.time)
+        if len(copies) <= 1:
             return
 
         out_parent.remove(original)
@@ -574,26 +574,18 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         g = ElementTree.SubElement(out_parent, "g")
         self.set_clean_id(g, "repeater")
 
-        for copy in range(ncopies-1):
-            use = ElementTree.SubElement(g, "use")
-            use.attrib[self.qualified("xlink", "href")] = "#" + original.attrib["id"]
-
-        orig_wrapper = ElementTree.SubElement(g, "g")
-        orig_wrapper.append(original)
-
-        transform = objects.Transform()
-        so = shape.transform.start_opacity.get_value(self.time)
-        eo = shape.transform.end_opacity.get_value(self.time)
-        position = shape.transform.position.get_value(self.time)
-        rotation = shape.transform.rotation.get_value(self.time)
-        anchor_point = shape.transform.anchor_point.get_value(self.time)
-        for i in range(ncopies-1, -1, -1):
-            of = i / (ncopies-1)
-            transform.opacity.value = so * of + eo * (1 - of)
-            self.set_transform(g[i], transform)
-            transform.position.value += position
-            transform.rotation.value += rotation
-            transform.anchor_point.value += anchor_point
+        original_index = len(copies) - 1 if shape.composite == objects.Composite.Below else 0
+        for i, (matrix, opacity) in enumerate(copies):
+            if i == original_index:
+                instance = ElementTree.SubElement(g, "g")
+                instance.append(original)
+            else:
+                instance = ElementTree.SubElement(g, "use")
+                instance.attrib[self.qualified("xlink", "href")] = "#" + original.attrib["id"]
+
+            instance.attrib["transform"] = matrix.to_css_2d()
+            if opacity != 100:
+                instance.attrib["opacity"] = str(opacity / 100)
 
         return g
 
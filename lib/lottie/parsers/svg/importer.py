@@ -1,3 +1,4 @@
+import io
 import re
 import math
 import colorsys
@@ -217,6 +218,9 @@ class SvgParser(SvgHandler):
         self.max_time = 0
         self.defs = SvgDefsParent()
         self.dpi = 96
+        self.document = None
+        self._id_elements = {}
+        self._pending_uses = None
 
     def _get_name(self, element, inkscapequal):
         if self.name_mode == NameMode.Inkscape:
@@ -239,14 +243,7 @@ class SvgParser(SvgHandler):
 
         svg = etree.getroot()
 
-        self._get_dpi(svg)
-
-        if "width" in svg.attrib and "height" in svg.attrib:
-            animation.width = int(round(self._parse_unit(svg.attrib["width"])))
-            animation.height = int(round(self._parse_unit(svg.attrib["height"])))
-        else:
-            _, _, animation.width, animation.height = self._parse_viewbox(svg.attrib["viewBox"])
-        animation.name = self._get_name(svg, self.qualified("sodipodi", "docname"))
+        self._setup_animation(svg)
 
         for defs in svg.findall(".//{*}defs") + svg.findall(".//defs"):
             self.parse_defs(defs)
@@ -270,6 +267,157 @@ class SvgParser(SvgHandler):
 
         return animation
 
+    def parse_stream(self, file, layer_frames=0, *args, **kwargs):
+        """!
+        @brief Imports an SVG document without keeping its whole element tree in memory
+
+        The file is read twice: the first pass parses `<defs>` and collects
+        the ids referenced by `<use>`, the second builds groups as their
+        elements are closed and discards the processed subtrees.
+
+        @param file File name or file object, non-seekable files are buffered in memory
+        @param layer_frames Same as for parse_etree()
+        """
+        if not isinstance(file, str) and not file.seekable():
+            data = file.read()
+            file = io.BytesIO(data) if isinstance(data, bytes) else io.StringIO(data)
+
+        animation = objects.Animation(*args, **kwargs)
+        self.animation = animation
+        self.max_time = 0
+        self.document = None
+        self._id_elements = {}
+        self._pending_uses = {}
+
+        try:
+            svg, referenced = self._stream_index(file)
+            if not isinstance(file, str):
+                file.seek(0)
+            self._stream_build(file, layer_frames, referenced)
+        finally:
+            self._pending_uses = None
+            self._id_elements = {}
+
+        if self.max_time:
+            animation.out_point = self.max_time
+
+        self._fix_viewbox(svg, (layer for layer in animation.layers if not layer.parent_index))
+
+        return animation
+
+    def _setup_animation(self, svg):
+        self._get_dpi(svg)
+
+        animation = self.animation
+        if "width" in svg.attrib and "height" in svg.attrib:
+            animation.width = int(round(self._parse_unit(svg.attrib["width"])))
+            animation.height = int(round(self._parse_unit(svg.attrib["height"])))
+        else:
+            _, _, animation.width, animation.height = self._parse_viewbox(svg.attrib["viewBox"])
+        animation.name = self._get_name(svg, self.qualified("sodipodi", "docname"))
+
+    def _stream_index(self, file):
+        """!
+        First streaming pass, parses `<defs>` and returns the root and the ids referenced by `<use>`
+        """
+        href = self.qualified("xlink", "href")
+        referenced = set()
+        svg = None
+        stack = []
+        defs_depth = 0
+
+        for event, element in ElementTree.iterparse(file, ("start", "end")):
+            tag = self.unqualified(element.tag)
+            if event == "start":
+                if svg is None:
+                    svg = element
+                    self._setup_animation(svg)
+                elif tag == "defs":
+                    defs_depth += 1
+                stack.append(element)
+                continue
+
+            stack.pop()
+            if tag == "use":
+                link = element.attrib.get(href)
+                if link and link.startswith("#"):
+                    referenced.add(link[1:])
+
+            if tag == "defs" and element is not svg:
+                self.parse_defs(element)
+                defs_depth -= 1
+
+            if stack and not defs_depth:
+                stack[-1].remove(element)
+
+        return svg, referenced
+
+    def _stream_build(self, file, layer_frames, referenced):
+        """!
+        Second streaming pass, builds the layers
+        """
+        # Each item is (element, group, style, layer), group is None for
+        # elements whose children are parsed in one go when they're closed
+        stack = []
+
+        for event, element in ElementTree.iterparse(file, ("start", "end")):
+            tag = self.unqualified(element.tag)
+            parent = stack[-1] if stack else None
+
+            if event == "start":
+                group = style = layer = None
+                if parent is None:
+                    if not layer_frames:
+                        layer = group = objects.ShapeLayer()
+                        self.animation.add_layer(layer)
+                        style = self.parse_style(element, {})
+                elif tag == "g" and element.attrib.get("id") not in referenced:
+                    if parent[1] is not None:
+                        group, style = self._create_group(element, parent[1], parent[2])
+                    elif layer_frames and parent[0] is stack[0][0]:
+                        layer = objects.ShapeLayer()
+                        layer.in_point = self.max_time
+                        self.animation.add_layer(layer)
+                        group, style = self._create_group(element, layer, {})
+                stack.append((element, group, style, layer))
+                continue
+
+            element, group, style, layer = stack.pop()
+            if not stack:
+                if layer and self.max_time:
+                    for sublayer in layer.find_all(objects.Layer):
+                        sublayer.out_point = self.max_time
+                break
+
+            parent = stack[-1]
+            if group is not None:
+                self._finish_group(element, group)
+                self.parse_animations(group, element)
+                if element.attrib.get("id"):
+                    self.defs.items[element.attrib["id"]] = group
+                if layer:
+                    self.max_time += layer_frames
+                    layer.out_point = self.max_time
+            elif parent[1] is not None and tag != "defs":
+                self.parse_children_element(element, parent[1], parent[2])
+            elif layer_frames and tag == "g" and parent is stack[0]:
+                # Frame referenced by <use>, so it has been kept whole
+                layer = objects.ShapeLayer()
+                layer.in_point = self.max_time
+                self.animation.add_layer(layer)
+                self._parseshape_g(element, layer, {})
+                self.max_time += layer_frames
+                layer.out_point = self.max_time
+
+            id = element.attrib.get("id")
+            if id in referenced:
+                self._id_elements[id] = element
+                for use in self._pending_uses.pop(id, []):
+                    self._fill_use(*use, element)
+
+            if (parent[1] is not None or parent[0] is stack[0][0]) and tag != "animate":
+                parent[0].remove(element)
+
     def etree_to_layer(self, animation, etree):
         svg = etree.getroot()
         self._get_dpi(svg)
@@ -343,10 +491,11 @@ class SvgParser(SvgHandler):
         return parse_color(color, self.current_color)
 
     def parse_transform(self, element, group, dest_trans):
-        bb = group.bounding_box()
-        if not bb.isnull():
-            itcx = self.qualified("inkscape", "transform-center-x")
-            if itcx in element.attrib:
+        # The bounding box is expensive on large groups, only get it when needed
+        itcx = self.qualified("inkscape", "transform-center-x")
+        if itcx in element.attrib:
+            bb = group.bounding_box()
+            if not bb.isnull():
                 cx = float(element.attrib[itcx])
                 cy = float(element.attrib[self.qualified("inkscape", "transform-center-y")])
                 bbx, bby = bb.center()
@@ -508,29 +657,48 @@ class SvgParser(SvgHandler):
         link = element.attrib.get(self.qualified("xlink", "href"))
         if link and link.startswith("#"):
             id = link[1:]
-            base_element = self.document.find(".//*[@id='%s']" % id)
+            base_element = self._find_by_id(id)
             use_style = self.parse_style(element, parent_style)
             used = objects.Group()
             shape_parent.add_shape(used)
             used.name = "use"
-            used.transform.position.value.x = float(element.attrib.get("x", 0))
-            used.transform.position.value.y = float(element.attrib.get("y", 0))
-            self.parse_transform(element, used, used.transform)
-            self.parse_shape(base_element, used, use_style)
+            if base_element is None and self._pending_uses is not None:
+                # Streaming mode: the referenced element comes later in the document
+                self._pending_uses.setdefault(id, []).append((element, used, use_style))
+                return used
+            self._fill_use(element, used, use_style, base_element)
             return used
 
+    def _fill_use(self, element, used, use_style, base_element):
+        used.transform.position.value.x = float(element.attrib.get("x", 0))
+        used.transform.position.value.y = float(element.attrib.get("y", 0))
+        self.parse_transform(element, used, used.transform)
+        self.parse_shape(base_element, used, use_style)
+
+    def _find_by_id(self, id):
+        if self.document is None:
+            return self._id_elements.get(id)
+        return self.document.find(".//*[@id='%s']" % id)
+
     def _parseshape_g(self, element, shape_parent, parent_style):
+        group, style = self._create_group(element, shape_parent, parent_style)
+        self.parse_children(element, group, style)
+        self._finish_group(element, group)
+        return group
+
+    def _create_group(self, element, shape_parent, parent_style):
         group = objects.Group()
         shape_parent.shapes.insert(0, group)
         style = self.parse_style(element, parent_style)
         self.apply_common_style(style, group.transform)
         self.apply_visibility(style, group)
         group.name = self._get_name(element, self.qualified("inkscape", "label"))
-        self.parse_children(element, group, style)
+        return group, style
+
+    def _finish_group(self, element, group):
         self.parse_transform(element, group, group.transform)
         if group.hidden: # Lottie web doesn't seem to support .hd
             group.transform.opacity.value = 0
-        return group
 
     def _parseshape_ellipse(self, element, shape_parent, parent_style):
         ellipse = objects.Ellipse()
@@ -648,11 +816,13 @@ class SvgParser(SvgHandler):
 
     def parse_children(self, element, shape_parent, parent_style):
         for child in element:
-            tag = self.unqualified(child.tag)
-            if not self.parse_shape(child, shape_parent, parent_style):
-                handler = getattr(self, "_parse_" + tag, None)
-                if handler:
-                    handler(child)
+            self.parse_children_element(child, shape_parent, parent_style)
+
+    def parse_children_element(self, child, shape_parent, parent_style):
+        if not self.parse_shape(child, shape_parent, parent_style):
+            handler = getattr(self, "_parse_" + self.unqualified(child.tag), None)
+            if handler:
+                handler(child)
 
     def parse_shape(self, element, shape_parent, parent_style):
         handler = getattr(self, "_parseshape_" + self.unqualified(element.tag), None)
@@ -984,7 +1154,8 @@ class PathDParser:
         self.p = NVector(0, 0)
         self.la = None
         self.la_type = None
-        self.tokens = list(map(self.d_subsplit, self._re.findall(d_string)))
+        self.tokens = [self.d_subsplit(tok) for tok in self._re.findall(d_string)]
+        self._token_index = 0
         self.add_p = True
         self.implicit = "M"
 
@@ -994,8 +1165,9 @@ class PathDParser:
         return float(tok)
 
     def next_token(self):
-        if self.tokens:
-            self.la = self.tokens.pop(0)
+        if self._token_index < len(self.tokens):
+            self.la = self.tokens[self._token_index]
+            self._token_index += 1
             if isinstance(self.la, str):
                 self.la_type = 0
             else:
@@ -1049,6 +1221,14 @@ class PathDParser:
             self._push_path()
         self.next_token()
 
+    def _append_point(self, in_tangent):
+        """!
+        Adds the current point to the path, without cloning the tangent
+        """
+        self.path.vertices.append(self.p.clone())
+        self.path.in_tangents.append(in_tangent)
+        self.path.out_tangents.append(NVector(0, 0))
+
     def _rpoint(self, point, rel=None):
         return (point - (rel or self.p)) if point is not None else NVector(0, 0)
 
@@ -1067,7 +1247,7 @@ class PathDParser:
             return
         self._do_add_p()
         self.p = self.cur_vec()
-        self.path.add_point(self.p.clone(), NVector(0, 0), NVector(0, 0))
+        self._append_point(NVector(0, 0))
         self.implicit = "L"
         self.next_token()
 
@@ -1077,7 +1257,7 @@ class PathDParser:
             return
         self._do_add_p()
         self.p += self.cur_vec()
-        self.path.add_point(self.p.clone(), NVector(0, 0), NVector(0, 0))
+        self._append_point(NVector(0, 0))
         self.implicit = "l"
         self.next_token()
 
@@ -1087,7 +1267,7 @@ class PathDParser:
             return
         self._do_add_p()
         self.p[0] = self.la
-        self.path.add_point(self.p.clone(), NVector(0, 0), NVector(0, 0))
+        self._append_point(NVector(0, 0))
         self.implicit = "H"
         self.next_token()
 
@@ -1097,7 +1277,7 @@ class PathDParser:
             return
         self._do_add_p()
         self.p[0] += self.la
-        self.path.add_point(self.p.clone(), NVector(0, 0), NVector(0, 0))
+        self._append_point(NVector(0, 0))
         self.implicit = "h"
         self.next_token()
 
@@ -1107,7 +1287,7 @@ class PathDParser:
             return
         self._do_add_p()
         self.p[1] = self.la
-        self.path.add_point(self.p.clone(), NVector(0, 0), NVector(0, 0))
+        self._append_point(NVector(0, 0))
         self.implicit = "V"
         self.next_token()
 
@@ -1117,7 +1297,7 @@ class PathDParser:
             return
         self._do_add_p()
         self.p[1] += self.la
-        self.path.add_point(self.p.clone(), NVector(0, 0), NVector(0, 0))
+        self._append_point(NVector(0, 0))
         self.implicit = "v"
         self.next_token()
 
@@ -1129,11 +1309,7 @@ class PathDParser:
         self._do_add_p(pout)
         pin = self.next_vec()
         self.p = self.next_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (pin - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(pin - self.p)
         self.implicit = "C"
         self.next_token()
 
@@ -1145,11 +1321,7 @@ class PathDParser:
         self._do_add_p(pout)
         pin = self.p + self.next_vec()
         self.p += self.next_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (pin - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(pin - self.p)
         self.implicit = "c"
         self.next_token()
 
@@ -1162,11 +1334,7 @@ class PathDParser:
         handle = self.path.in_tangents[-1]
         self.path.out_tangents[-1] = (-handle)
         self.p = self.next_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (pin - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(pin - self.p)
         self.implicit = "S"
         self.next_token()
 
@@ -1179,11 +1347,7 @@ class PathDParser:
         handle = self.path.in_tangents[-1]
         self.path.out_tangents[-1] = (-handle)
         self.p += self.next_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (pin - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(pin - self.p)
         self.implicit = "s"
         self.next_token()
 
@@ -1194,11 +1358,7 @@ class PathDParser:
         self._do_add_p()
         pin = self.cur_vec()
         self.p = self.next_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (pin - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(pin - self.p)
         self.implicit = "Q"
         self.next_token()
 
@@ -1209,11 +1369,7 @@ class PathDParser:
         self._do_add_p()
         pin = self.p + self.cur_vec()
         self.p += self.next_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (pin - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(pin - self.p)
         self.implicit = "q"
         self.next_token()
 
@@ -1224,11 +1380,7 @@ class PathDParser:
         self._do_add_p()
         handle = self.p - self.path.in_tangents[-1]
         self.p = self.cur_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (handle - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(handle - self.p)
         self.implicit = "T"
         self.next_token()
 
@@ -1239,11 +1391,7 @@ class PathDParser:
         self._do_add_p()
         handle = -self.path.in_tangents[-1] + self.p
         self.p += self.cur_vec()
-        self.path.add_point(
-            self.p.clone(),
-            (handle - self.p),
-            NVector(0, 0)
-        )
+        self._append_point(handle - self.p)
         self.implicit = "t"
         self.next_token()
 
@@ -1321,5 +1469,10 @@ def parse_svg_etree(etree, layer_frames=0, *args, **kwargs):
     return parser.parse_etree(etree, layer_frames, *args, **kwargs)
 
 
-def parse_svg_file(file, layer_frames=0, *args, **kwargs):
+def parse_svg_file(file, layer_frames=0, *args, streaming=False, **kwargs):
+    """!
+    @param streaming If True, uses SvgParser.parse_stream() to keep memory usage low on large files
+    """
+    if streaming:
+        return SvgParser().parse_stream(file, layer_frames, *args, **kwargs)
     return parse_svg_etree(ElementTree.parse(file), layer_frames, *args, **kwargs)
@@ -1,4 +1,4 @@
-__all__ = ["animation", "ellipse", "ik", "linediff", "restructure", "script", "stripper"]
+__all__ = ["animation", "ellipse", "ik", "linediff", "restructure", "script", "spatial", "stripper"]
 
 try:
     from . import font
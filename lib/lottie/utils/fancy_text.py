@@ -1,6 +1,6 @@
 import re
 
-from .font import FontStyle
+from .font import FontStyle, GlyphCharsRenderer
 from ..nvector import NVector
 from ..parsers.svg.importer import parse_color
 from ..objects.shapes import Group, Fill
@@ -31,6 +31,33 @@ class FancyStyle:
         pos -= self.offset
         return g
 
+    def render_layers(self, chars_renderer: GlyphCharsRenderer, text, pos, start_x):
+        """!
+        @brief Renders text as text layers using glyphs shared in Animation.chars
+        @returns List of TextLayer, one per line
+        """
+        layers = []
+        for i, line in enumerate(text.split("\n")):
+            if i:
+                pos.x = start_x
+                pos.y += self.font.renderer.line_height(self.font_size)
+            if not line:
+                continue
+
+            line_pos = pos + self.offset - self.font.position
+            line_start = line_pos.x
+            layer = chars_renderer.render(line, self.color, self.font_size, line_pos)
+            pos.x += line_pos.x - line_start
+
+            if self.scale.x != 1 or self.scale.y != 1 or self.rotation != 0:
+                center = NVector(line_pos.x - line_start, -self.font.renderer.line_height(self.font_size)) / 2
+                layer.transform.anchor_point.value = center
+                layer.transform.position.value += center
+                layer.transform.scale.value = self.scale * 100
+                layer.transform.rotation.value = self.rotation
+            layers.append(layer)
+        return layers
+
 
 class FancyTextRenderer:
     _regex = re.compile(r'\\([a-z0-9]+)(?:\{([^}]*)\})?')
@@ -52,17 +79,54 @@ class FancyTextRenderer:
         if pos is None:
             pos = NVector(0, 0)
 
+        container = Group()
+
+        def render_run(style, run_text, line_start):
+            container.insert_shape(0, style.render(run_text, pos, line_start))
+
+        self._render_runs(text, pos, render_run)
+
+        if len(container.shapes) > 1:
+            container.next_x = container.shapes[-2].next_x
+        else:
+            container.next_x = pos.x
+
+        return container
+
+    def render_layers(self, text: str, animation, pos: NVector = None):
+        """!
+        @brief Renders text as text layers added to @p animation
+
+        Each distinct glyph is stored once in Animation.chars instead of
+        being copied for every occurrence as render() does.
+        @returns List of the added TextLayer objects
+        """
+        if pos is None:
+            pos = NVector(0, 0)
+
+        chars_renderer = GlyphCharsRenderer(animation, self.font)
+        layers = []
+
+        def render_run(style, run_text, line_start):
+            layers.extend(style.render_layers(chars_renderer, run_text, pos, line_start))
+
+        self._render_runs(text, pos, render_run)
+        return layers
+
+    def _render_runs(self, text, pos, render_run):
+        """!
+        @brief Parses the commands in @p text and calls render_run(style, text, line start) for each styled run
+        """
         line_start = pos.x
         default_style = FancyStyle(self.font, self.default_color, self.font_size, NVector(0, 0), NVector(1, 1), 0)
         style = default_style.clone()
-        container = Group()
         last_pos = 0
 
         for match in self._regex.finditer(text):
             prev_text = text[last_pos:match.start()]
             last_pos = match.end()
             if prev_text:
-                container.insert_shape(0, style.render(prev_text, pos, line_start))
+                render_run(style, prev_text, line_start)
 
             style = style.clone()
 
@@ -112,14 +176,7 @@ class FancyTextRenderer:
 
         last_text = text[last_pos:]
         if last_text:
-            container.insert_shape(0, style.render(last_text, pos, line_start))
-
-        if len(container.shapes) > 1:
-            container.next_x = container.shapes[-2].next_x
-        else:
-            container.next_x = pos.x
-
-        return container
+            render_run(style, last_text, line_start)
 
 
 def render_fancy_text(text: str, font: FontStyle, default_color: NVector, font_size: float, pos: NVector = None):
@@ -1,5 +1,8 @@
 import os
 import sys
+import json
+import bisect
+import hashlib
 import subprocess
 import fontTools.pens.basePen
 import fontTools.ttLib
@@ -11,9 +14,9 @@ from xml.etree import ElementTree
 from ..nvector import NVector
 from ..objects.bezier import Bezier, BezierPoint
 from ..objects.shapes import Path, Group, Fill, Stroke
-from ..objects.text import TextJustify
+from ..objects.text import TextJustify, TextDocument, Chars, FontList, Font as LottieFont
 from ..objects.base import LottieProp, CustomObject
-from ..objects.layers import ShapeLayer
+from ..objects.layers import ShapeLayer, TextLayer
 
 
 class BezierPen(fontTools.pens.basePen.BasePen):
@@ -68,12 +71,25 @@ class BezierPen(fontTools.pens.basePen.BasePen):
         )
 
 
+def _write_json(filename, data):
+    """!
+    @brief Writes a JSON cache file, replacing the old one only once the new one is complete
+    """
+    tmp_filename = "%s.%s.tmp" % (filename, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(tmp_filename, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_filename, filename)
+    except OSError:
+        pass
+
+
 class SystemFont:
     def __init__(self, family):
         self.family = family
         self.files = {}
         self.styles = set()
-        self._renderers = {}
 
     def add_file(self, styles, file):
         self.styles |= set(styles)
@@ -90,11 +106,7 @@ class SystemFont:
 
     def __getitem__(self, styles):
         key = self._key(styles)
-        if key in self._renderers:
-            return self._renderers[key]
-        fr = RawFontRenderer(self.files[key])
-        self._renderers[key] = fr
-        return fr
+        return fonts.renderer(self.files[key])
 
     def __repr__(self):
         return "<SystemFont %s>" % self.family
@@ -197,16 +209,52 @@ class FontQuery:
 
 
 class _SystemFontList:
-    def __init__(self):
+    """!
+    Index of the fonts known to fontconfig
+
+    The index and the results of fc-match queries are cached in memory and
+    in `cache_dir`, the cache is discarded when the modification time of
+    any of the font directories changes.
+    Set the `cache_dir` attribute to None to disable the on-disk cache.
+    """
+    ## Fields read from fc-list for each font file
+    fc_list_fields = ("file", "family[0]", "style[0]", "weight", "slant", "width", "charset")
+
+    def __init__(self, cache_dir=None):
         self.fonts = None
+        if cache_dir is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            cache_dir = os.path.join(cache_home, "python-lottie")
+        self.cache_dir = cache_dir
+        ## Font directory modification times the loaded index is valid for
+        self._cache_key = None
+        ## fc-match output lines by query string, for sorted and unsorted matches
+        self._matches = {False: {}, True: {}}
+        ## Whether there are fc-match results that haven't been written to the cache
+        self._matches_dirty = False
+        ## Metadata from fc-list, by file name
+        self._file_info = {}
+        ## Renderers by file name, so each font file is parsed only once
+        self._renderers = {}
+        ## Parsed charsets by file name
+        self._charsets = {}
 
     def _lazy_load(self):
         if self.fonts is None:
             self.load()
 
-    def load(self):
+    def load(self, refresh=False):
+        """!
+        @brief Loads the font index
+        @param refresh If True, the on-disk cache is ignored and rebuilt
+        """
         self.fonts = {}
-        self.load_fc_list()
+        self._matches = {False: {}, True: {}}
+        self._matches_dirty = False
+        self._file_info = {}
+        self._charsets = {}
+        if refresh or not self.load_cache():
+            self.load_fc_list()
 
     def cmd(self, *a):
         p = subprocess.Popen(a, stdout=subprocess.PIPE)
@@ -215,37 +263,237 @@ class _SystemFontList:
         return out, p.returncode
 
     def load_fc_list(self):
-        out, returncode = self.cmd("fc-list", r'--format=%{file}\t%{family[0]}\t%{style[0]}\n')
+        format = "\\t".join("%%{%s}" % field for field in self.fc_list_fields) + "\\n"
+        out, returncode = self.cmd("fc-list", "--format=" + format)
         if returncode == 0:
             for line in out.splitlines():
-                file, family, styles = line.split("\t")
-                self._get(family).add_file(styles.split(" "), file)
+                values = line.split("\t")
+                if len(values) != len(self.fc_list_fields):
+                    continue
+                self._add_file(*values)
+            self._cache_key = self._dir_mtimes(self._font_dirs())
+            self.save_cache()
+
+    def _add_file(self, file, family, styles, weight="", slant="", width="", charset=""):
+        self._file_info.setdefault(file, {
+            "family": family,
+            "styles": styles,
+            "weight": weight,
+            "slant": slant,
+            "width": width,
+            "charset": charset,
+        })
+        self._get(family).add_file(styles.split(" "), file)
+
+    def file_info(self, filename):
+        """!
+        @brief Returns the fontconfig metadata for a font file
+        @returns dict with family, styles, weight, slant, width and charset, or None if the file isn't indexed
+        """
+        self._lazy_load()
+        return self._file_info.get(filename)
+
+    def covers(self, filename, codepoint):
+        """!
+        @brief Whether the charset in the index for the file contains the given codepoint
+        @returns True or False, or None if the charset is not known
+        """
+        if filename not in self._charsets:
+            info = self.file_info(filename)
+            self._charsets[filename] = self._parse_charset(info["charset"]) if info else None
+
+        ranges = self._charsets[filename]
+        if ranges is None:
+            return None
+        index = bisect.bisect_right(ranges, (codepoint, math.inf)) - 1
+        return index >= 0 and ranges[index][0] <= codepoint <= ranges[index][1]
+
+    @staticmethod
+    def _parse_charset(charset):
+        ranges = []
+        try:
+            for chunk in charset.split():
+                start, _, end = chunk.partition("-")
+                start = int(start, 16)
+                ranges.append((start, int(end, 16) if end else start))
+        except ValueError:
+            return None
+        if not ranges:
+            return None
+        ranges.sort()
+        return ranges
+
+    def renderer(self, filename):
+        """!
+        @brief Returns a renderer for the given font file, shared with other lookups of the same file
+        """
+        if filename not in self._renderers:
+            self._renderers[filename] = RawFontRenderer(filename)
+        return self._renderers[filename]
+
+    def _font_roots(self):
+        home = os.path.expanduser("~")
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(home, ".local", "share")
+        return [
+            "/usr/share/fonts",
+            "/usr/local/share/fonts",
+            os.path.join(data_home, "fonts"),
+            os.path.join(home, ".fonts"),
+            "/Library/Fonts",
+            "/System/Library/Fonts",
+            os.path.join(home, "Library", "Fonts"),
+            os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+        ]
 
-    def best(self, query):
+    def _font_dirs(self):
+        """!
+        @brief Directories whose modification times invalidate the index
+
+        These are the standard font directories, the directories containing
+        indexed files and the directories between them, so adding or removing
+        files or sub-directories is detected
+        """
+        roots = self._font_roots()
+        dirs = set(roots)
+        for file in self._file_info:
+            path = os.path.dirname(file)
+            while path not in dirs:
+                dirs.add(path)
+                if not any(path.startswith(root + os.sep) for root in roots):
+                    break
+                path = os.path.dirname(path)
+        return dirs
+
+    @staticmethod
+    def _dir_mtimes(dirs):
+        mtimes = {}
+        for dir in dirs:
+            try:
+                mtimes[dir] = os.stat(dir).st_mtime_ns
+            except OSError:
+                mtimes[dir] = None
+        return mtimes
+
+    def _cache_file(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _read_cache(self, name):
+        try:
+            with open(self._cache_file(name)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, name, data):
+        if self.cache_dir is None or self._cache_key is None:
+            return
+        _write_json(self._cache_file(name), data)
+
+    def load_cache(self):
+        """!
+        @brief Loads the index from the on-disk cache
+        @returns Whether the cache was found and is still valid
+        """
+        if self.cache_dir is None:
+            return False
+
+        data = self._read_cache("fonts.json")
+        if not isinstance(data, dict) or data.get("version") != 1:
+            return False
+
+        key = data["dirs"]
+        if any(root not in key for root in self._font_roots()) or self._dir_mtimes(key) != key:
+            return False
+
+        self._cache_key = key
+        for file, info in data["files"].items():
+            self._add_file(
+                file, info["family"], info["styles"], info["weight"],
+                info["slant"], info["width"], info["charset"]
+            )
+
+        matches = self._read_cache("matches.json")
+        if isinstance(matches, dict) and matches.get("dirs") == key:
+            self._matches[False] = matches["best"]
+            self._matches[True] = matches["all"]
+
+        return True
+
+    def save_cache(self):
+        self._write_cache("fonts.json", {
+            "version": 1,
+            "dirs": self._cache_key,
+            "files": self._file_info,
+        })
+        self._matches_dirty = True
+        self.save_matches()
+
+    def save_matches(self):
+        """!
+        @brief Writes the fc-match results to the cache if new queries have been run since the last write
+        """
+        if not self._matches_dirty:
+            return
+        self._write_cache("matches.json", {
+            "dirs": self._cache_key,
+            "best": self._matches[False],
+            "all": self._matches[True],
+        })
+        self._matches_dirty = False
+
+    def _match(self, query, sort):
+        """!
+        @brief Returns the fc-match output lines for the query, running fc-match only for new queries
+        """
+        self._lazy_load()
+        key = str(query)
+        matches = self._matches[sort]
+        if key not in matches:
+            if sort:
+                out, returncode = self.cmd("fc-match", "-s", r"--format=%{family}\t%{style}\n", key)
+            else:
+                out, returncode = self.cmd("fc-match", r"--format=%{family}\t%{style}", key)
+            if returncode != 0:
+                return []
+            matches[key] = out.splitlines()
+            self._matches_dirty = True
+        return matches[key]
+
+    def best(self, query=""):
         """!
         Returns the renderer best matching the name
         """
-        out, returncode = self.cmd("fc-match", r"--format=%{family}\t%{style}", str(query))
-        if returncode == 0:
-            return self._font_from_match(out)
+        matches = self._match(query, False)
+        if matches:
+            return self._font_from_match(matches[0])
 
     def _font_from_match(self, out):
+        fam, style = self._parse_match(out)
+        return self[fam][style]
+
+    @staticmethod
+    def _parse_match(out):
         fam, style = out.split("\t")
         fam = fam.split(",")[0]
         style = style.split(",")[0].split()
-        return self[fam][style]
+        return fam, style
 
-    def all(self, query):
+    def all(self, query, codepoint=None):
         """!
         Yields all the renderers matching a query
+
+        @param codepoint If not None, fonts whose indexed charset doesn't
+            contain this character are skipped without being opened
         """
-        out, returncode = self.cmd("fc-match", "-s", r"--format=%{family}\t%{style}\n", str(query))
-        if returncode == 0:
-            for line in out.splitlines():
-                try:
-                    yield self._font_from_match(line)
-                except (fontTools.ttLib.TTLibError, fontTools.t1Lib.T1Error):
-                    pass
+        for line in self._match(query, True):
+            if codepoint is not None:
+                fam, style = self._parse_match(line)
+                if self.covers(self[fam].filename(style), codepoint) is False:
+                    continue
+            try:
+                yield self._font_from_match(line)
+            except (fontTools.ttLib.TTLibError, fontTools.t1Lib.T1Error):
+                pass
 
     def default(self):
         """!
@@ -355,16 +603,105 @@ class Font:
             self.cmap = {}
 
         self.glyphset = self.wrapped.getGlyphSet()
+        ## Glyph outlines in font units, by glyph name
+        self._beziers = {}
+        ## GlyphMetrics by glyph name
+        self._metrics = {}
+        self._kerning = None
+        self._cache_file = None
+        self._cache_dirty = False
 
     @classmethod
-    def open(cls, filename):
+    def open(cls, filename, cache_dir=None):
+        """!
+        @param filename Font file name
+        @param cache_dir If not None, directory where glyph outlines and kerning are cached between runs
+        """
         try:
             f = fontTools.ttLib.TTFont(filename)
         except fontTools.ttLib.TTLibError:
             f = fontTools.t1Lib.T1Font(filename)
             f.parse()
 
-        return cls(f)
+        font = cls(f)
+        if cache_dir is not None:
+            font.load_cache(filename, cache_dir)
+        return font
+
+    def load_cache(self, filename, cache_dir):
+        """!
+        @brief Loads glyph outlines and kerning from the cache in @p cache_dir
+
+        The cache file is named after the hash of the font file contents,
+        so it's not used for a modified font.
+        """
+        digest = hashlib.sha1()
+        with open(filename, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+        self._cache_file = os.path.join(cache_dir, digest.hexdigest() + ".json")
+
+        try:
+            with open(self._cache_file) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != 1:
+            return
+
+        if data["kerning"] is not None:
+            self._kerning = {
+                (first, second): value
+                for first, second, value in data["kerning"]
+            }
+        self._beziers = {
+            name: [Bezier.load(bezier) for bezier in beziers]
+            for name, beziers in data["glyphs"].items()
+        }
+
+    def save_cache(self):
+        """!
+        @brief Writes the cache file if the font was opened with a cache directory and new data has been added
+        """
+        if self._cache_file is None or not self._cache_dirty:
+            return
+
+        _write_json(self._cache_file, {
+            "version": 1,
+            "kerning": None if self._kerning is None else [
+                [first, second, value]
+                for (first, second), value in self._kerning.items()
+            ],
+            "glyphs": {
+                name: [bezier.to_dict() for bezier in beziers]
+                for name, beziers in self._beziers.items()
+            },
+        })
+        self._cache_dirty = False
+
+    def glyph_beziers(self, glyph_name):
+        """!
+        @brief Returns the outline of a glyph in font units, with y pointing down
+
+        The result is cached and shared, so it must not be modified
+        """
+        beziers = self._beziers.get(glyph_name)
+        if beziers is None:
+            pen = BezierPen(self.glyphset)
+            self.glyphset[glyph_name].draw(pen)
+            beziers = self._beziers[glyph_name] = pen.beziers
+            self._cache_dirty = True
+        return beziers
+
+    def kerning_pairs(self):
+        """!
+        @brief Returns the kerning table, mapping pairs of glyph names to the kerning in font units
+        """
+        if self._kerning is None:
+            self._kerning = collect_kerning_pairs(self)
+            self._cache_dirty = True
+        return self._kerning
 
     def getGlyphSet(self):
         return self.wrapped.getGlyphSet()
@@ -405,7 +742,21 @@ class Font:
         elif isinstance(self.wrapped, fontTools.t1Lib.T1Font):
             return self.wrapped["FontBBox"][3]
 
+    def ascender(self):
+        if isinstance(self.wrapped, fontTools.ttLib.TTFont):
+            if "hhea" in self.wrapped:
+                return self.wrapped["hhea"].ascent
+            return self.wrapped["head"].yMax
+        elif isinstance(self.wrapped, fontTools.t1Lib.T1Font):
+            return self.wrapped["FontBBox"][3]
+
     def glyph(self, glyph_name):
+        metrics = self._metrics.get(glyph_name)
+        if metrics is None:
+            metrics = self._metrics[glyph_name] = self._glyph_metrics(glyph_name)
+        return metrics
+
+    def _glyph_metrics(self, glyph_name):
         if isinstance(self.wrapped, fontTools.ttLib.TTFont):
             glyph = self.glyphset[glyph_name]
             table = self.glyphset.glyfTable[glyph_name]
@@ -480,13 +831,39 @@ class FontRenderer:
             for bez in beziers
         ]
 
+    def glyph_source(self, char):
+        """!
+        @brief Finds the glyph used to render @p char
+        @returns (Font, glyph name) or None if the character can't be rendered
+        """
+        name = self.glyph_name(char)
+        if name in self.font.glyphset:
+            return self.font, name
+        return None
+
+    def placed_glyph_shapes(self, glyph_name, pos, scale):
+        """!
+        @brief Returns the shapes for a glyph, scaled to pixels and moved to @p pos
+
+        The outlines are taken from the font cache so the glyph is only drawn once
+        """
+        shapes = []
+        for source in self.font.glyph_beziers(glyph_name):
+            bez = Bezier()
+            bez.closed = source.closed
+            bez.vertices = [vertex * scale + pos for vertex in source.vertices]
+            bez.in_tangents = [tangent * scale for tangent in source.in_tangents]
+            bez.out_tangents = [tangent * scale for tangent in source.out_tangents]
+            shapes.append(Path(bez))
+        return shapes
+
     def _on_character(self, ch, size, pos, scale, line, use_kerning, chars, i):
         chname = self.glyph_name(ch)
 
         if chname in self.font.glyphset:
             glyphdata = self.font.glyph(chname)
             #pos.x += glyphdata.lsb * scale
-            glyph_shapes = self.glyph_shapes(glyphdata, pos / scale)
+            glyph_shapes = self.placed_glyph_shapes(chname, pos, scale)
 
             if glyph_shapes:
                 if len(glyph_shapes) > 1:
@@ -497,14 +874,13 @@ class FontRenderer:
                     glyph_shape = glyph_shapes[0]
 
                 for sh in glyph_shapes:
-                    sh.shape.value.scale(scale)
                     glyph_shape_group.add_shape(sh)
 
                 glyph_shape.name = ch
 
             kerning = 0
             if use_kerning and i < len(chars) - 1:
-                nextcname = chars[i+1]
+                nextcname = self.glyph_name(chars[i+1])
                 kerning = self.kerning(chname, nextcname)
 
             pos.x += (glyphdata.advance + kerning) * scale
@@ -558,23 +934,25 @@ class FontRenderer:
 
         group.line_height = line_height
         group.next_x = line.next_x = pos.x
+        self.font.save_cache()
+        fonts.save_matches()
         return group
 
 
 class RawFontRenderer(FontRenderer):
+    ## Directory for the on-disk glyph and kerning cache, disabled when None
+    cache_dir = None
+
     def __init__(self, filename):
         self.filename = filename
-        self._font = Font.open(filename)
-        self._kerning = None
+        self._font = Font.open(filename, self.cache_dir)
 
     @property
     def font(self):
         return self._font
 
     def kerning(self, c1, c2):
-        if self._kerning is None:
-            self._kerning = collect_kerning_pairs(self.font)
-        return self._kerning.get((c1, c2), 0)
+        return self.font.kerning_pairs().get((c1, c2), 0)
 
     def __repr__(self):
         return "<FontRenderer %r>" % self.filename
@@ -621,16 +999,24 @@ class FallbackFontRenderer(FontRenderer):
 
         codepoint = ord(char)
         name = Font.calculated_glyph_name(codepoint)
-        for i, font in enumerate(fonts.all(self.query.clone().char(char))):
+        for i, font in enumerate(fonts.all(self.query.clone().char(char), codepoint)):
+            if i > self.max_attempts:
+                self._fallback[char] = None
+                return None
+
             # For some reason fontconfig sometimes returns a font that doesn't
             # actually contain the glyph
             if name in font.font.glyphset or codepoint in font.font.cmap:
                 self._fallback[char] = font
                 return font
 
-            if i > self.max_attempts:
-                self._fallback[char] = None
-                return None
+    def glyph_source(self, char):
+        source = self.best.glyph_source(char)
+        if source is None:
+            font = self.fallback_renderer(char)
+            if font:
+                source = font.glyph_source(char)
+        return source
 
     def _on_character(self, char, size, pos, scale, group, use_kerning, chars, i):
         if self.best._on_character(char, size, pos, scale, group, use_kerning, chars, i):
@@ -731,6 +1117,9 @@ class EmojiRenderer(FontRenderer):
     def get_query(self):
         return self.wrapped.get_query()
 
+    def glyph_source(self, char):
+        return self.wrapped.glyph_source(char)
+
     @staticmethod
     def _get_splitter():
         if EmojiRenderer._split is None:
@@ -761,7 +1150,7 @@ class FontStyle:
 
     def _set_query(self, query):
         if isinstance(query, str) and os.path.isfile(query):
-            self._renderer = RawFontRenderer(query)
+            self._renderer = fonts.renderer(query)
         else:
             self._renderer = FallbackFontRenderer(query)
 
@@ -803,6 +1192,137 @@ class FontStyle:
         return self._renderer.line_height(self.size)
 
 
+class GlyphCharsRenderer:
+    """!
+    @brief Renders text as text layers, storing each glyph outline only once in Animation.chars
+
+    FontStyle.render() copies the outline of a glyph for every occurrence,
+    here the layers only contain the text and the player lays out the
+    shared glyphs, so kerning is not applied.
+    """
+    ## Font size of the glyph outlines in Animation.chars, as expected by players
+    chars_size = 100
+
+    def __init__(self, animation, style: FontStyle):
+        self.animation = animation
+        self.style = style
+        self.font_family, self.font_style = self._font_names(style.query)
+
+        if animation.fonts is None:
+            animation.fonts = FontList()
+        if animation.chars is None:
+            animation.chars = []
+
+        self.font = None
+        for font in animation.fonts.list:
+            if font.font_family == self.font_family and font.font_style == self.font_style:
+                self.font = font
+                break
+        else:
+            self.font = LottieFont(self.font_family, self.font_style)
+            font = style.renderer.font
+            self.font.ascent = font.ascender() * font.scale() * self.chars_size
+            animation.fonts.append(self.font)
+
+        ## Chars entries by character, None for characters without a glyph
+        self._chars = {
+            chars.character: chars
+            for chars in animation.chars
+            if chars.font_family == self.font_family and chars.font_style == self.font_style
+        }
+
+    @staticmethod
+    def _font_names(query):
+        if isinstance(query, FontQuery):
+            return query["family"] or "sans", query["style"] or "Regular"
+        return os.path.splitext(os.path.basename(str(query)))[0], "Regular"
+
+    def char_data(self, char):
+        """!
+        @brief Returns the Chars entry for @p char, adding it to the animation the first time
+        @returns The Chars object or None if the font has no glyph for the character
+        """
+        if char in self._chars:
+            return self._chars[char]
+
+        source = self.style.renderer.glyph_source(char)
+        if source is None:
+            self._chars[char] = None
+            return None
+
+        font, glyph_name = source
+        scale = self.chars_size * font.scale()
+        chars = Chars()
+        chars.character = char
+        chars.font_family = self.font_family
+        chars.font_style = self.font_style
+        chars.font_size = self.chars_size
+        chars.width = font.glyph(glyph_name).advance * scale
+
+        # Players expect all the shapes in a single group
+        group = Group()
+        for bezier in font.glyph_beziers(glyph_name):
+            bezier = bezier.clone()
+            bezier.scale(scale)
+            group.add_shape(Path(bezier))
+        chars.data.shapes.append(group)
+
+        self.animation.chars.append(chars)
+        self._chars[char] = chars
+        return chars
+
+    def text_width(self, text, size=None):
+        """!
+        @brief Width of a line of text as laid out by the player
+        """
+        if size is None:
+            size = self.style.size
+        width = 0
+        for char in text:
+            chars = self.char_data(char)
+            if chars:
+                width += chars.width
+        return width * size / self.chars_size
+
+    def render(self, text, color=None, size=None, pos=None):
+        """!
+        @brief Adds a text layer showing @p text to the animation
+
+        @param text         String to render
+        @param color        Fill color, defaults to black
+        @param size         Font size, defaults to the size of the style
+        @param[in,out] pos  Position of the first baseline, relative to the style position,
+                            updated to the end of the text
+        @returns The new TextLayer
+        """
+        if size is None:
+            size = self.style.size
+        if pos is None:
+            pos = NVector(0, 0)
+        line_height = self.style.renderer.line_height(size)
+
+        lines = text.split("\n")
+        for line in lines:
+            for char in line:
+                self.char_data(char)
+
+        document = TextDocument("\r".join(lines), size, color, self.font.name)
+        document.justify = self.style.justify
+        document.line_height = line_height
+
+        layer = TextLayer()
+        layer.name = text
+        layer.data.add_keyframe(0, document)
+        layer.transform.position.value = self.style.position + pos
+        self.animation.insert_layer(0, layer)
+
+        pos.y += line_height * (len(lines) - 1)
+        if len(lines) > 1:
+            pos.x = 0
+        pos.x += self.text_width(lines[-1], size)
+        return layer
+
+
 def _propfac(a):
     return property(lambda s: s._get(a), lambda s, v: s._set(a, v))
 
@@ -0,0 +1,266 @@
+import math
+
+from ..objects.animation import Animation
+from ..objects.base import ObjectVisitor
+from ..objects.bezier import Bezier
+from ..objects.easing import KeyframeBezierHandle
+from ..objects.layers import PreCompLayer
+from ..objects.properties import AnimatableMixin, ColorValue, GradientColors, PositionKeyframe
+
+
+def _flatten(value):
+    """!
+    @returns (signature, components) for a keyframe value, values can only be interpolated if their signatures match
+    """
+    if isinstance(value, Bezier):
+        flat = []
+        for vertex, in_tangent, out_tangent in zip(value.vertices, value.in_tangents, value.out_tangents):
+            flat += vertex.components
+            flat += in_tangent.components
+            flat += out_tangent.components
+        return (value.closed, len(value.vertices)), flat
+    return len(value.components), list(value.components)
+
+
+def _easing_basis(x):
+    """!
+    @brief Weights of the two handle y coordinates and the constant term of a keyframe easing curve at @p x
+
+    The handle x coordinates are fixed at 1/3 and 2/3, so the bezier
+    parameter is @p x itself and the curve is linear in the handle y values
+    """
+    u = 1 - x
+    return 3 * u * u * x, 3 * u * x * x, x * x * x
+
+
+class KeyframeReducer(ObjectVisitor):
+    """!
+    @brief Lossy optimization that removes keyframes which can be replaced by easing
+
+    Runs of keyframes are replaced by a single keyframe whose cubic easing
+    keeps the property within the tolerance of its original value at every
+    frame and keyframe time.
+    Hold keyframes, jumps in value and changes in shape topology are preserved,
+    properties with expressions are left untouched.
+    """
+    def __init__(self, tolerance=0.25, color_tolerance=1/255):
+        """!
+        @param tolerance        Maximum difference for each component of the values (pixels, degrees, percent...),
+                                for time remapping it's in frames
+        @param color_tolerance  Maximum difference for color components, which are in [0, 1]
+        """
+        self.tolerance = tolerance
+        self.color_tolerance = color_tolerance
+        ## Frame rate of the animation being visited, used to convert the tolerance for time remapping
+        self.frame_rate = None
+
+    def __call__(self, lottie_object):
+        # The frame rate is only known while visiting an animation
+        self.frame_rate = None
+        try:
+            super().__call__(lottie_object)
+        finally:
+            self.frame_rate = None
+
+    def visit(self, object):
+        if isinstance(object, Animation):
+            self.frame_rate = object.frame_rate
+
+    def visit_property(self, object, property, value):
+        if isinstance(value, AnimatableMixin) and value.animated and value.keyframes and not value.expression:
+            if isinstance(object, PreCompLayer) and property.name == "time_remapping":
+                # Time remapping is in seconds, without a frame rate it's left untouched
+                if not self.frame_rate:
+                    return
+                tolerance = self.tolerance / self.frame_rate
+            elif isinstance(value, ColorValue) or isinstance(object, GradientColors):
+                tolerance = self.color_tolerance
+            else:
+                tolerance = self.tolerance
+            self.reduce(value, tolerance)
+
+    def reduce(self, animatable, tolerance=None):
+        """!
+        @brief Removes redundant keyframes from an animated property
+        """
+        if tolerance is None:
+            tolerance = self.tolerance
+
+        keyframes = animatable.keyframes
+        if len(keyframes) < 3:
+            return
+
+        key_times = [kf.time for kf in keyframes]
+        if any(b <= a for a, b in zip(key_times, key_times[1:])):
+            return
+
+        frames = range(math.ceil(key_times[0]), math.floor(key_times[-1]) + 1)
+        sample_times = sorted(set(key_times).union(frames))
+        # Value.get_values() unwraps floats, the keyframe values are needed here
+        values = AnimatableMixin.get_values(animatable, sample_times)
+        if any(value is None for value in values):
+            return
+        samples = [_flatten(value) for value in values]
+
+        sample_index = {time: index for index, time in enumerate(sample_times)}
+        key_samples = [sample_index[time] for time in key_times]
+        # Value reached at each keyframe and the one the following segment starts from
+        arrival = [samples[index] for index in key_samples]
+        departure = [
+            _flatten(kf.value) if kf.value is not None else arrival[i]
+            for i, kf in enumerate(keyframes)
+        ]
+
+        if all(self._close(samples[0], sample, tolerance) for sample in samples) and \
+                all(self._close(samples[0], value, tolerance) for value in departure):
+            animatable.clear_animation(animatable.get_value(key_times[0]))
+            return
+
+        segments = _Segments(keyframes, sample_times, samples, key_samples, arrival, departure, tolerance)
+        kept = [keyframes[0]]
+        first = 0
+        while first < len(keyframes) - 1:
+            last = segments.longest_from(first)
+            if last > first + 1:
+                segments.merge(first, last)
+            kept.append(keyframes[last])
+            first = last
+
+        animatable.keyframes = kept
+
+    @staticmethod
+    def _close(a, b, tolerance):
+        return a[0] == b[0] and all(abs(x - y) <= tolerance for x, y in zip(a[1], b[1]))
+
+
+class _Segments:
+    def __init__(self, keyframes, sample_times, samples, key_samples, arrival, departure, tolerance):
+        self.keyframes = keyframes
+        self.sample_times = sample_times
+        self.samples = samples
+        self.key_samples = key_samples
+        self.arrival = arrival
+        self.departure = departure
+        self.tolerance = tolerance
+        self._fit = {}
+
+    def can_pass(self, index):
+        """!
+        @brief Whether the keyframe at @p index can be removed from inside a merged segment
+        """
+        prev = self.keyframes[index - 1]
+        kf = self.keyframes[index]
+        if prev.hold or kf.hold or kf.value is None:
+            return False
+        departure = self.departure[index]
+        arrival = self.arrival[index]
+        return departure[0] == arrival[0] and all(abs(a - b) <= 1e-9 for a, b in zip(departure[1], arrival[1]))
+
+    def longest_from(self, first):
+        """!
+        @brief Finds the last keyframe that can be reached from @p first with a single eased segment
+        """
+        limit = first + 1
+        while limit < len(self.keyframes) - 1 and self.can_pass(limit):
+            limit += 1
+
+        # Grow exponentially then bisect between the last fitting and the first failing end
+        good = first + 1
+        step = 1
+        while good < limit:
+            candidate = min(good + step, limit)
+            if self.fit(first, candidate) is None:
+                break
+            good = candidate
+            step *= 2
+        else:
+            return good
+
+        bad = candidate
+        while bad - good > 1:
+            middle = (good + bad) // 2
+            if self.fit(first, middle) is None:
+                bad = middle
+            else:
+                good = middle
+        return good
+
+    def fit(self, first, last):
+        """!
+        @brief Fits the easing for a segment from @p first to @p last
+        @returns (y1, y2) of the easing handles, or None if it goes over the tolerance
+        """
+        key = (first, last)
+        if key not in self._fit:
+            self._fit[key] = self._compute_fit(first, last)
+        return self._fit[key]
+
+    def _compute_fit(self, first, last):
+        signature, start = self.departure[first]
+        end_signature, end = self.arrival[last]
+        if signature != end_signature:
+            return None
+
+        t0 = self.keyframes[first].time
+        duration = self.keyframes[last].time - t0
+        delta = [b - a for a, b in zip(start, end)]
+        length2 = sum(d * d for d in delta)
+
+        points = []
+        for index in range(self.key_samples[first] + 1, self.key_samples[last]):
+            sample_signature, sample = self.samples[index]
+            if sample_signature != signature:
+                return None
+            x = (self.sample_times[index] - t0) / duration
+            if length2 == 0:
+                progress = 0
+            else:
+                progress = sum(d * (s - a) for d, s, a in zip(delta, sample, start)) / length2
+            points.append((x, progress, sample))
+
+        # Least squares for the handle y values, regularized towards linear easing
+        regularization = 1e-9
+        a11 = a22 = regularization
+        a12 = 0
+        b1 = regularization / 3
+        b2 = regularization * 2 / 3
+        for x, progress, sample in points:
+            w1, w2, w3 = _easing_basis(x)
+            target = progress - w3
+            a11 += w1 * w1
+            a12 += w1 * w2
+            a22 += w2 * w2
+            b1 += w1 * target
+            b2 += w2 * target
+        det = a11 * a22 - a12 * a12
+        y1 = (b1 * a22 - b2 * a12) / det
+        y2 = (a11 * b2 - a12 * b1) / det
+
+        for x, progress, sample in points:
+            w1, w2, w3 = _easing_basis(x)
+            factor = w1 * y1 + w2 * y2 + w3
+            for a, d, s in zip(start, delta, sample):
+                if abs(a + d * factor - s) > self.tolerance:
+                    return None
+
+        return y1, y2
+
+    def merge(self, first, last):
+        """!
+        @brief Makes the keyframe at @p first interpolate directly to the one at @p last
+        """
+        y1, y2 = self.fit(first, last)
+        kf = self.keyframes[first]
+        kf.out_value = KeyframeBezierHandle(1/3, y1)
+        kf.in_value = KeyframeBezierHandle(2/3, y2)
+        if kf.end is not None:
+            end = self.keyframes[last - 1].end
+            kf.end = end.clone() if end is not None else self.keyframes[last].value.clone()
+        if isinstance(kf, PositionKeyframe):
+            kf.in_tan = None
+            kf.out_tan = None
+
+
+## Reduces keyframes keeping values within a quarter of a unit of the original
+## (1/255 for colors, a quarter of a frame for time remapping)
+keyframe_reduce = KeyframeReducer()
@@ -0,0 +1,252 @@
+import math
+from .. import objects
+from ..objects.properties import AnimatableMixin
+from ..objects.shapes import BoundingBox
+from .transform import affine_multiply
+
+
+class SpatialEntry:
+    """!
+    Shape indexed by SpatialIndex
+    """
+    def __init__(self, shape, layer, bounding_box, z, precomp_layers):
+        ## Group (or top level shape of a layer)
+        self.shape = shape
+        ## Layer containing the shape
+        self.layer = layer
+        ## Bounding box in animation coordinates
+        self.bounding_box = bounding_box
+        ## Paint order, entries with a higher value are drawn on top
+        self.z = z
+        ## PreCompLayer objects the layer is nested in, outermost first
+        self.precomp_layers = precomp_layers
+
+    def contains(self, x, y):
+        bb = self.bounding_box
+        return bb.x1 <= x <= bb.x2 and bb.y1 <= y <= bb.y2
+
+    def intersects(self, x1, y1, x2, y2):
+        bb = self.bounding_box
+        return bb.x1 <= x2 and x1 <= bb.x2 and bb.y1 <= y2 and y1 <= bb.y2
+
+    def __repr__(self):
+        return "<SpatialEntry %s %s>" % (self.shape, self.bounding_box)
+
+
+class SpatialIndex:
+    """!
+    @brief Uniform grid of the shape bounding boxes visible at a given frame
+
+    Used to find which shapes are under a point or inside a rectangle,
+    for hit-testing or to skip geometry outside the viewport.
+
+    Bounds that don't depend on time are cached, so calling update() with
+    adjacent frames only recomputes animated shapes and transforms.
+    """
+    ## Entries spanning more cells than this are not stored in the grid
+    max_cells = 256
+
+    def __init__(self, animation: objects.Animation, cell_size=None):
+        self.animation = animation
+        ## Size of the grid cells
+        self.cell_size = cell_size or max(16, max(animation.width, animation.height) / 16)
+        ## Frame the index has been built for
+        self.time = None
+        ## Indexed entries, in paint order (bottom first)
+        self.entries = []
+        self._grid = {}
+        self._large = []
+        self._static = {}
+        self._static_bounds = {}
+        self._static_matrices = {}
+
+    @classmethod
+    def build(cls, animation, time, cell_size=None):
+        """!
+        @brief Creates an index for @p animation at @p time
+        """
+        index = cls(animation, cell_size)
+        index.update(time)
+        return index
+
+    def update(self, time):
+        """!
+        @brief Rebuilds the index for @p time, reusing cached static bounds
+        """
+        self.time = time
+        self.entries = []
+        self._grid = {}
+        self._large = []
+        self._add_layers(self.animation.layers, time, None, [])
+        for entry in self.entries:
+            self._insert(entry)
+
+    def invalidate(self):
+        """!
+        @brief Discards cached bounds, call after modifying the animation
+        """
+        self._static = {}
+        self._static_bounds = {}
+        self._static_matrices = {}
+
+    def at_point(self, x, y):
+        """!
+        @brief Entries whose bounding box contains the point, topmost first
+        """
+        cs = self.cell_size
+        candidates = self._grid.get((math.floor(x / cs), math.floor(y / cs)), [])
+        found = [e for e in candidates if e.contains(x, y)]
+        found += [e for e in self._large if e.contains(x, y)]
+        found.sort(key=lambda e: -e.z)
+        return found
+
+    def in_rect(self, x1, y1, x2, y2):
+        """!
+        @brief Entries whose bounding box intersects the rectangle, topmost first
+        """
+        cs = self.cell_size
+        found = {}
+        for cx in range(math.floor(x1 / cs), math.floor(x2 / cs) + 1):
+            for cy in range(math.floor(y1 / cs), math.floor(y2 / cs) + 1):
+                for entry in self._grid.get((cx, cy), ()):
+                    if entry.z not in found and entry.intersects(x1, y1, x2, y2):
+                        found[entry.z] = entry
+        for entry in self._large:
+            if entry.intersects(x1, y1, x2, y2):
+                found[entry.z] = entry
+        return [found[z] for z in sorted(found, reverse=True)]
+
+    def _insert(self, entry):
+        bb = entry.bounding_box
+        cs = self.cell_size
+        cx1 = math.floor(bb.x1 / cs)
+        cx2 = math.floor(bb.x2 / cs)
+        cy1 = math.floor(bb.y1 / cs)
+        cy2 = math.floor(bb.y2 / cs)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.max_cells:
+            self._large.append(entry)
+            return
+
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self._grid.setdefault((cx, cy), []).append(entry)
+
+    def _is_static(self, obj):
+        key = id(obj)
+        cached = self._static.get(key)
+        if cached is None or cached[0] is not obj:
+            static = not any(True for _ in obj.find_all(AnimatableMixin, lambda p: p.animated))
+            cached = self._static[key] = (obj, static)
+        return cached[1]
+
+    def _layer_matrix(self, layer, time):
+        """!
+        World matrix of @p layer inside its own composition, as an affine tuple
+        """
+        if layer.composition is None:
+            return self._transform_matrix(layer.transform, time)
+
+        layer_index = layer.composition.layer_index
+        chain_static = True
+        ancestor = layer
+        seen = set()
+        while ancestor is not None and id(ancestor) not in seen:
+            seen.add(id(ancestor))
+            if getattr(ancestor, "transform", None) and not self._is_static(ancestor.transform):
+                chain_static = False
+                break
+            ancestor = layer_index.layer(ancestor.parent_index) if ancestor.parent_index is not None else None
+
+        if chain_static:
+            cached = self._static_matrices.get(id(layer))
+            if cached and cached[0] is layer:
+                return cached[1]
+
+        matrix = layer.world_matrix(time).to_affine()
+        if chain_static:
+            self._static_matrices[id(layer)] = (layer, matrix)
+        return matrix
+
+    def _transform_matrix(self, transform, time):
+        cached = self._static_matrices.get(id(transform))
+        if cached and cached[0] is transform:
+            return cached[1]
+
+        matrix = transform.to_matrix(time).to_affine()
+        if self._is_static(transform):
+            self._static_matrices[id(transform)] = (transform, matrix)
+        return matrix
+
+    def _layer_time(self, precomp_layer, time):
+        if precomp_layer.time_remapping:
+            return precomp_layer.time_remapping.get_value(time) * self.animation.frame_rate
+        return (time - precomp_layer.start_time) / (precomp_layer.time_stretch or 1)
+
+    def _layer_visible(self, layer, time):
+        if layer.hidden or layer.is_guide or getattr(layer, "matte_target", None):
+            return False
+        if layer.in_point is not None and time < layer.in_point:
+            return False
+        if layer.out_point is not None and time >= layer.out_point:
+            return False
+        return True
+
+    def _add_layers(self, layers, time, outer_matrix, precomp_layers):
+        for layer in reversed(layers):
+            if not isinstance(layer, objects.VisualLayer) or not self._layer_visible(layer, time):
+                continue
+
+            matrix = self._layer_matrix(layer, time)
+            if outer_matrix is not None:
+                matrix = affine_multiply(matrix, outer_matrix)
+
+            if isinstance(layer, objects.PreCompLayer):
+                precomp = self.animation.precomp(layer.reference_id)
+                if precomp:
+                    self._add_layers(precomp.layers, self._layer_time(layer, time), matrix, precomp_layers + [layer])
+            elif isinstance(layer, objects.ShapeLayer):
+                for shape in reversed(layer.shapes):
+                    self._add_shape(shape, layer, time, matrix, precomp_layers, True)
+
+    def _add_shape(self, shape, layer, time, matrix, precomp_layers, top_level):
+        if shape.hidden:
+            return
+
+        is_group = isinstance(shape, objects.Group)
+        if not is_group and not top_level:
+            return
+
+        bb = self._local_bounds(shape, time)
+        if bb.isnull():
+            return
+
+        self.entries.append(SpatialEntry(
+            shape, layer, self._transform_box(bb, matrix), len(self.entries), precomp_layers
+        ))
+
+        if is_group:
+            group_matrix = matrix
+            if isinstance(shape.transform, objects.TransformShape):
+                group_matrix = affine_multiply(self._transform_matrix(shape.transform, time), matrix)
+            for child in reversed(shape.shapes):
+                self._add_shape(child, layer, time, group_matrix, precomp_layers, False)
+
+    def _local_bounds(self, shape, time):
+        key = id(shape)
+        cached = self._static_bounds.get(key)
+        if cached and cached[0] is shape:
+            return cached[1]
+
+        bb = shape.bounding_box(time)
+        if self._is_static(shape):
+            self._static_bounds[key] = (shape, bb)
+        return bb
+
+    def _transform_box(self, bb, matrix):
+        a, b, c, d, tx, ty = matrix
+        xs = []
+        ys = []
+        for x, y in ((bb.x1, bb.y1), (bb.x1, bb.y2), (bb.x2, bb.y1), (bb.x2, bb.y2)):
+            xs.append(x * a + y * c + tx)
+            ys.append(x * b + y * d + ty)
+        return BoundingBox(min(xs), min(ys), max(xs), max(ys))
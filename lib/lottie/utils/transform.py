@@ -8,6 +8,41 @@ def _sign(x):
     return 1
 
 
+def affine_multiply(m1, m2):
+    """!
+    Multiplies two 2D affine matrices given as (a, b, c, d, tx, ty) tuples
+    """
+    a1, b1, c1, d1, tx1, ty1 = m1
+    a2, b2, c2, d2, tx2, ty2 = m2
+    return (
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        tx1 * a2 + ty1 * c2 + tx2,
+        tx1 * b2 + ty1 * d2 + ty2,
+    )
+
+
+def affine_inverse(m):
+    """!
+    Inverts a 2D affine matrix given as a (a, b, c, d, tx, ty) tuple
+    @returns The inverse or @c None if the matrix is singular
+    """
+    a, b, c, d, tx, ty = m
+    det = a * d - b * c
+    if det == 0:
+        return None
+    return (
+        d / det,
+        -b / det,
+        -c / det,
+        a / det,
+        (c * ty - d * tx) / det,
+        (b * tx - a * ty) / det,
+    )
+
+
 class TransformMatrix:
     scalar = float
 
@@ -22,6 +57,21 @@ class TransformMatrix:
 
         return self
 
+    @classmethod
+    def from_affine(cls, affine):
+        """!
+        Creates a matrix from a (a, b, c, d, tx, ty) tuple
+        """
+        m = cls()
+        m._mat[0], m._mat[1], m._mat[4], m._mat[5], m._mat[12], m._mat[13] = map(cls.scalar, affine)
+        return m
+
+    def to_affine(self):
+        """!
+        Returns the 2D components as a (a, b, c, d, tx, ty) tuple
+        """
+        return (self.a, self.b, self.c, self.d, self.tx, self.ty)
+
     def __getitem__(self, key):
         row, col = key
         return self._mat[row*4+col]
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+from unittest import mock
+from .. import base
+from lottie import objects
+from lottie.parsers.aep.converter import AepConverter, Comp, FileAsset
+
+
+def make_comp(id, name):
+    cdta = SimpleNamespace(
+        width=512, height=512, frame_rate=60, time_scale=1,
+        start_time=0, end_time=60, comp_duration=60
+    )
+    return Comp(id, name, None, cdta)
+
+
+def make_footage(id, path, width, height):
+    pin = mock.MagicMock()
+    data = pin.find.return_value.data
+    data.find.return_value.data = {"fullpath": path}
+    data.width = width
+    data.height = height
+    return FileAsset(id, "", None, pin)
+
+
+class TestAepConverter(base.TestCase):
+    def converter(self):
+        """
+        Converter for a project where "main" contains "inner", which shows a footage item
+        """
+        converter = AepConverter()
+        # Skips parsing, the project is already set up
+        converter.top_level = object()
+
+        footage = make_footage(3, "/footage/image.png", 64, 32)
+        main = make_comp(1, "main")
+        inner = make_comp(2, "inner")
+        for asset in (main, inner, footage):
+            converter.assets[asset.id] = asset
+        converter.comps = {"main": main, "inner": inner}
+
+        main.layers = []
+        converter.anim = main
+        main.layers.append(converter.create_asset_layer(SimpleNamespace(source_id=2)))
+
+        inner.layers = []
+        converter.anim = inner
+        inner.layers.append(converter.create_asset_layer(SimpleNamespace(source_id=3)))
+        return converter
+
+    def test_footage_layer(self):
+        converter = self.converter()
+        animation = converter.import_aep(converter.top_level, "inner")
+
+        self.assertIsInstance(animation.layers[0], objects.ImageLayer)
+        self.assertEqual([asset.id for asset in animation.assets], ["asset_3"])
+        self.assertEqual(animation.layers[0].image_id, "asset_3")
+        self.assertEqual(animation.assets[0].file_name, "image.png")
+        self.assertEqual(animation.assets[0].width, 64)
+
+    def test_precomp_assets(self):
+        converter = self.converter()
+        animation = converter.import_aep(converter.top_level, "main", True)
+
+        self.assertEqual([asset.id for asset in animation.assets], ["precomp_2", "asset_3"])
+        precomp = animation.assets[0]
+        self.assertEqual(animation.layers[0].reference_id, precomp.id)
+        self.assertEqual(precomp.layers[0].image_id, "asset_3")
+
+        loaded = objects.Animation.load(animation.to_dict())
+        self.assertIsInstance(loaded.assets[1], objects.assets.Image)
+        self.assertEqual(loaded.assets[1].id, "asset_3")
+
+    def test_precomp_assets_deduplicated(self):
+        converter = self.converter()
+        converter.anim = converter.comps["main"]
+        converter.comps["main"].layers.append(converter.create_asset_layer(SimpleNamespace(source_id=3)))
+        animation = converter.import_aep(converter.top_level, "main", True)
+
+        self.assertEqual(sorted(asset.id for asset in animation.assets), ["asset_3", "precomp_2"])
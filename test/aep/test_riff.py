@@ -0,0 +1,65 @@
+import os
+import struct
+import tempfile
+from unittest import mock
+from .. import base
+from lottie.parsers.aep.riff import RiffParser
+
+
+def chunk(header, data):
+    padding = b"\0" if len(data) % 2 else b""
+    return header.encode("ascii") + struct.pack("<I", len(data)) + data + padding
+
+
+class TestRiffParser(base.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempdir.name, "test.riff")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, data):
+        with open(self.filename, "wb") as file:
+            file.write(data)
+
+    def write_riff(self):
+        items = b"ITEM" + chunk("abcd", b"1234") + chunk("efgh", b"xy")
+        self.write(chunk("RIFF", b"TEST" + chunk("LIST", items)))
+
+    def test_lazy(self):
+        self.write_riff()
+        with open(self.filename, "rb") as file:
+            with RiffParser(file, True) as parser:
+                mapped = parser.file
+                top_level = parser.parse()
+                items = top_level.data.children[0].data
+                self.assertFalse(items.loaded)
+                self.assertEqual([child.header for child in items.children], ["abcd", "efgh"])
+                self.assertEqual(items.children[0].data, b"1234")
+            self.assertTrue(mapped.closed)
+            self.assertFalse(file.closed)
+
+    def test_not_lazy(self):
+        self.write_riff()
+        with open(self.filename, "rb") as file:
+            with RiffParser(file) as parser:
+                self.assertIs(parser.file, file)
+                items = parser.parse().data.children[0].data
+                self.assertEqual([child.header for child in items.children], ["abcd", "efgh"])
+            self.assertFalse(file.closed)
+
+    def test_invalid(self):
+        self.write(b"ABCD" + b"\0" * 8)
+        mapped = []
+
+        def mmap_file(file):
+            mapped.append(mmap_file.original(file))
+            return mapped[-1]
+
+        mmap_file.original = RiffParser.mmap_file
+        with open(self.filename, "rb") as file, mock.patch.object(RiffParser, "mmap_file", staticmethod(mmap_file)):
+            with self.assertRaises(Exception):
+                RiffParser(file, True)
+        self.assertEqual(len(mapped), 1)
+        self.assertTrue(mapped[0].closed)
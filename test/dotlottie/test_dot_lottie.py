@@ -0,0 +1,78 @@
+import io
+import json
+import struct
+import zipfile
+from PIL import Image
+from .. import base
+from lottie import objects
+from lottie.exporters.dot_lottie import export_dotlottie
+
+
+def raw_member(data, info):
+    """
+    Compressed data of a member as stored in the archive
+    """
+    name_size, extra_size = struct.unpack("<HH", data[info.header_offset+26:info.header_offset+30])
+    start = info.header_offset + 30 + name_size + extra_size
+    return data[start:start+info.compress_size]
+
+
+class TestDotLottie(base.TestCase):
+    def animation(self, name, color):
+        animation = objects.Animation()
+        animation.name = name
+        image = objects.assets.Image.embedded(Image.new("RGBA", (8, 8), color), "png")
+        animation.assets.append(image)
+        animation.add_layer(objects.ImageLayer(image.id))
+        return animation
+
+    def test_export(self):
+        file = io.BytesIO()
+        export_dotlottie(self.animation("anim", (255, 0, 0, 255)), file)
+
+        with zipfile.ZipFile(file) as zf:
+            self.assertEqual(sorted(zf.namelist()), ["animations/anim.json", "images/image_0.png", "manifest.json"])
+            manifest = json.loads(zf.read("manifest.json"))
+            self.assertEqual([anim["id"] for anim in manifest["animations"]], ["anim"])
+            lottie = json.loads(zf.read("animations/anim.json"))
+            self.assertEqual(lottie["assets"][0]["p"], "image_0.png")
+            self.assertEqual(lottie["assets"][0]["e"], 0)
+
+    def test_append(self):
+        file = io.BytesIO()
+        export_dotlottie(self.animation("first", (255, 0, 0, 255)), file)
+        with zipfile.ZipFile(file, "a") as zf:
+            # Compressed differently from what a rewrite would produce
+            zf.writestr("extra.txt", "extra data " * 100, zipfile.ZIP_DEFLATED, 1)
+
+        before = file.getvalue()
+        with zipfile.ZipFile(io.BytesIO(before)) as zf:
+            untouched = {
+                info.filename: raw_member(before, info)
+                for info in zf.infolist()
+                if info.filename != "manifest.json"
+            }
+
+        export_dotlottie(self.animation("second", (255, 0, 0, 255)), file, append=True)
+        export_dotlottie(self.animation("third", (0, 255, 0, 255)), file, append=True)
+        export_dotlottie(self.animation("second", (0, 0, 255, 255)), file, append=True)
+
+        after = file.getvalue()
+        with zipfile.ZipFile(io.BytesIO(after)) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(sorted(zf.namelist()), [
+                "animations/first.json", "animations/second.json", "animations/third.json",
+                "extra.txt", "images/image_0.png", "images/image_1.png", "images/image_2.png",
+                "manifest.json",
+            ])
+            for name, data in untouched.items():
+                self.assertEqual(raw_member(after, zf.getinfo(name)), data, name)
+            self.assertEqual(zf.read("extra.txt"), b"extra data " * 100)
+
+            manifest = json.loads(zf.read("manifest.json"))
+            self.assertEqual([anim["id"] for anim in manifest["animations"]], ["first", "third", "second"])
+            # Images with the same contents are shared
+            second = json.loads(zf.read("animations/second.json"))
+            self.assertEqual(second["assets"][0]["p"], "image_2.png")
+
+        self.assertEqual(len(after.split(b"PK\x03\x04")) - 1, 8)
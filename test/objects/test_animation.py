@@ -508,3 +508,68 @@ class TestAnimation(base.TestCase):
         self.assertNotIn(l1, an.layers)
         self.assertNotIn(l2, an.layers)
         self.assertIn(l3, an.layers)
+
+    def test_layer_replaced(self):
+        an = objects.Animation()
+        an.add_layer(objects.layers.NullLayer())
+        an.add_layer(objects.layers.NullLayer())
+        self.assertIs(an.layer(1), an.layers[1])
+
+        replacement = objects.layers.NullLayer()
+        replacement.index = 77
+        an.layers[0] = replacement
+
+        self.assertIs(an.layer(77), replacement)
+        self.assertIs(an.layer(1), an.layers[1])
+
+    def test_layer_reindexed(self):
+        an = objects.Animation()
+        for i in range(5):
+            an.add_layer(objects.layers.NullLayer())
+        appended = objects.layers.NullLayer()
+        appended.index = 5
+        an.layers.append(appended)
+        self.assertIs(an.layer(5), appended)
+
+        appended.index = 6
+
+        self.assertIs(an.layer(6), appended)
+        with self.assertRaises(IndexError):
+            an.layer(5)
+
+    def test_child_layers_reparented(self):
+        an = objects.Animation()
+        parent = an.add_layer(objects.layers.NullLayer())
+        other = an.add_layer(objects.layers.NullLayer())
+        child = objects.layers.NullLayer()
+        child.index = 10
+        child.parent_index = parent.index
+        an.layers.append(child)
+        self.assertEqual(an.child_layers(parent), [child])
+
+        child.parent_index = other.index
+
+        self.assertEqual(an.child_layers(parent), [])
+        self.assertEqual(an.child_layers(other), [child])
+
+
+class TestAnimationPrecomp(base.TestCase):
+    def test_precomp(self):
+        an = objects.Animation()
+        foo = objects.Precomp("foo", an)
+        bar = objects.Precomp("bar", an)
+        self.assertIs(an.precomp("foo"), foo)
+        self.assertIs(an.precomp("bar"), bar)
+        self.assertIsNone(an.precomp("baz"))
+        bar.id = "baz"
+        self.assertIs(an.precomp("baz"), bar)
+        self.assertIsNone(an.precomp("bar"))
+
+    def test_precomp_layers(self):
+        an = objects.Animation()
+        precomp = objects.Precomp("foo", an)
+        parent = precomp.add_layer(objects.NullLayer())
+        child = parent.add_child(objects.NullLayer())
+        self.assertIs(child.composition, precomp)
+        self.assertIs(child.parent, parent)
+        self.assertEqual(child.out_point, an.out_point)
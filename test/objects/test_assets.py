@@ -0,0 +1,80 @@
+import base64
+import struct
+import zlib
+
+from .. import base
+from lottie import objects
+
+
+def png_data(width, height, animated=False):
+    def chunk(type, data):
+        return struct.pack(">I", len(data)) + type + data + struct.pack(">I", zlib.crc32(type + data))
+
+    data = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+    if animated:
+        data += chunk(b"acTL", struct.pack(">II", 2, 0))
+    data += chunk(b"IDAT", zlib.compress(b"\0" * (width * 4 + 1) * height))
+    return data + chunk(b"IEND", b"")
+
+
+class TestImage(base.TestCase):
+    def lazy_image(self):
+        image = objects.assets.Image("image")
+        image.width = 1
+        image.height = 2
+        image.path = "images/"
+        image.file_name = "image.png"
+        return image.set_lazy_data("png", lambda: b"raw")
+
+    def test_lazy_data(self):
+        image = self.lazy_image()
+        self.assertEqual(image.data(), ("png", b"raw"))
+        self.assertFalse(image.is_embedded)
+
+    def test_lazy_to_dict(self):
+        image = self.lazy_image()
+        self.assertDictEqual(
+            image.to_dict(),
+            {
+                "id": "image",
+                "w": 1,
+                "h": 2,
+                "u": "",
+                "p": "data:image/png;base64,cmF3",
+                "e": 1,
+            }
+        )
+        self.assertEqual(image.file_name, "image.png")
+
+    def test_lazy_clone(self):
+        image = self.lazy_image().clone()
+        self.assertEqual(image.data(), ("png", b"raw"))
+
+    def test_embed_lazy_data(self):
+        image = self.lazy_image()
+        image.embed_lazy_data()
+        self.assertTrue(image.is_embedded)
+        self.assertEqual(image.path, "")
+        self.assertEqual(image.file_name, "data:image/png;base64,cmF3")
+        self.assertEqual(image.data(), ("png", b"raw"))
+
+    def test_load_raw_png(self):
+        data = png_data(3, 5)
+        image = objects.assets.Image("image").load(data)
+        self.assertEqual(image.width, 3)
+        self.assertEqual(image.height, 5)
+        self.assertTrue(image.is_embedded)
+        self.assertEqual(image.file_name, "data:image/png;base64," + base64.b64encode(data).decode("ascii"))
+        self.assertEqual(image.data(), ("png", data))
+
+    def test_load_raw_lazy(self):
+        data = png_data(3, 5)
+        image = objects.assets.Image("image").load(data, "png", lazy=True)
+        self.assertEqual(image.file_name, "")
+        self.assertEqual(image.to_dict()["p"], "data:image/png;base64," + base64.b64encode(data).decode("ascii"))
+
+    def test_embedded_raw(self):
+        self.assertIsNotNone(objects.assets.Image.embedded_raw(png_data(1, 1)))
+        self.assertIsNone(objects.assets.Image.embedded_raw(png_data(1, 1), "jpeg"))
+        self.assertIsNone(objects.assets.Image.embedded_raw(png_data(1, 1, True)))
+        self.assertIsNone(objects.assets.Image.embedded_raw(b"GIF89a"))
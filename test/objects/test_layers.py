@@ -1,5 +1,5 @@
 from .. import base
-from lottie import objects
+from lottie import objects, NVector
 from .test_helpers import TestTransform
 
 
@@ -37,3 +37,63 @@ class TestShapeLayer(base.TestCase):
                 "bm": 0,
             }
         )
+
+
+class TestParenting(base.TestCase):
+    def _rig(self):
+        an = objects.Animation()
+        root = an.add_layer(objects.NullLayer())
+        root.transform.position.value = NVector(10, 20)
+        child = root.add_child(objects.NullLayer())
+        child.transform.position.value = NVector(1, 2)
+        child.transform.scale.value = NVector(200, 200)
+        leaf = child.add_child(objects.ShapeLayer())
+        leaf.transform.position.value = NVector(3, 4)
+        return an, root, child, leaf
+
+    def test_parent_children(self):
+        an, root, child, leaf = self._rig()
+        self.assertIs(leaf.parent, child)
+        self.assertIs(child.parent, root)
+        self.assertIsNone(root.parent)
+        self.assertEqual(list(root.children), [child])
+        self.assertEqual(list(child.children), [leaf])
+        self.assertIs(an.layer(leaf.index), leaf)
+        self.assertRaises(IndexError, an.layer, 100)
+
+    def test_world_matrix(self):
+        an, root, child, leaf = self._rig()
+        p = leaf.world_matrix(0).apply(NVector(0, 0))
+        self.assert_nvector_equal(p, NVector(17, 30))
+        p = child.world_matrix(0).apply(NVector(1, 1))
+        self.assert_nvector_equal(p, NVector(13, 24))
+
+    def test_world_matrix_reparent(self):
+        an, root, child, leaf = self._rig()
+        self.assert_nvector_equal(leaf.world_matrix(0).apply(NVector(0, 0)), NVector(17, 30))
+        leaf.parent = root
+        self.assert_nvector_equal(leaf.world_matrix(0).apply(NVector(0, 0)), NVector(13, 24))
+
+    def test_remove_layer(self):
+        an, root, child, leaf = self._rig()
+        an.remove_layer(child)
+        self.assertEqual(an.layers, [root])
+        self.assertIsNone(leaf.composition)
+
+    def test_index_direct_assignment(self):
+        an, root, child, leaf = self._rig()
+        leaf.parent_index = root.index
+        self.assertEqual(list(root.children), [child, leaf])
+        self.assertEqual(list(child.children), [])
+        leaf.index = 100
+        self.assertIs(an.layer(100), leaf)
+        self.assertRaises(IndexError, an.layer, 2)
+
+    def test_index_direct_list_change(self):
+        an, root, child, leaf = self._rig()
+        extra = objects.NullLayer()
+        extra.index = 50
+        extra.parent_index = root.index
+        an.layers.append(extra)
+        self.assertIs(an.layer(50), extra)
+        self.assertEqual(list(root.children), [child, extra])
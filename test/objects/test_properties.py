@@ -122,6 +122,23 @@ class TestMultiDimensional(base.TestCase):
         self.assertEqual(md.get_value(3), None)
         self.assertEqual(md.get_value(4), None)
 
+    def test_get_values(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        self.assertEqual(md.get_values([0, 3]), [NVector(0, 0), NVector(0, 0)])
+        md.add_keyframe(0, NVector(1, 2))
+        md.add_keyframe(4, NVector(5, 6))
+        times = [-1, 0, 1, 2, 4, 5]
+        self.assertEqual(md.get_values(times), [md.get_value(t) for t in times])
+
+    def test_get_values_nonestart(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        md.add_keyframe(0, NVector(1, 2))
+        md.add_keyframe(3, NVector(4, 5))
+        md.keyframes[-2].end = md.keyframes[-1].start
+        md.keyframes[-1].start = None
+        times = [-1, 0, 1.5, 3, 4]
+        self.assertEqual(md.get_values(times), [md.get_value(t) for t in times])
+
     def test_load_noanim(self):
         md = objects.MultiDimensional.load({
             "a": 0,
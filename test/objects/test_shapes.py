@@ -240,3 +240,78 @@ class TestEllipse(base.TestCase):
         self.assertEqual(c[0], 30)
         self.assertEqual(c[1], 40)
 
+
+
+class TestRepeater(base.TestCase):
+    def _repeater(self):
+        sh = objects.Repeater(3)
+        sh.transform.position.value = objects.NVector(10, 0)
+        sh.transform.start_opacity.value = 100
+        sh.transform.end_opacity.value = 50
+        return sh
+
+    def test_copy_transforms(self):
+        copies = self._repeater().copy_transforms(0)
+        self.assertEqual(len(copies), 3)
+        for i, (matrix, opacity) in enumerate(copies):
+            p = matrix.apply(objects.NVector(1, 2))
+            self.assertAlmostEqual(p.x, 1 + 10 * i)
+            self.assertAlmostEqual(p.y, 2)
+        self.assertEqual([c[1] for c in copies], [100, 75, 50])
+
+    def test_copy_transforms_rotation(self):
+        sh = objects.Repeater(4)
+        sh.transform.rotation.value = 90
+        sh.transform.anchor_point.value = objects.NVector(10, 10)
+        copies = sh.copy_transforms(0)
+        p = copies[2][0].apply(objects.NVector(0, 10))
+        self.assertAlmostEqual(p.x, 20)
+        self.assertAlmostEqual(p.y, 10)
+
+    def test_copy_transforms_offset(self):
+        sh = self._repeater()
+        sh.offset.value = 1.5
+        p = sh.copy_transforms(0)[0][0].apply(objects.NVector(0, 0))
+        self.assertAlmostEqual(p.x, 15)
+
+        sh.offset.value = -1
+        p = sh.copy_transforms(0)[0][0].apply(objects.NVector(0, 0))
+        self.assertAlmostEqual(p.x, -10)
+
+    def test_copy_transforms_composite(self):
+        sh = self._repeater()
+        sh.composite = objects.shapes.Composite.Below
+        copies = sh.copy_transforms(0)
+        self.assertEqual([c[1] for c in copies], [50, 75, 100])
+        self.assertAlmostEqual(copies[0][0].tx, 20)
+
+
+class TestBezierFrames(base.TestCase):
+    def test_rect(self):
+        sh = objects.Rect(objects.NVector(10, 20), objects.NVector(30, 40))
+        sh.size.add_keyframe(0, objects.NVector(30, 40))
+        sh.size.add_keyframe(10, objects.NVector(10, 20))
+        frames = sh.bezier_frames([0, 5, 10])
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].vertices[0], objects.NVector(-5, 0))
+        self.assertEqual(frames[1].vertices[0], objects.NVector(0, 5))
+        self.assertEqual(frames[2].vertices[0], objects.NVector(5, 10))
+        self.assertTrue(frames[2].closed)
+
+    def test_cache(self):
+        sh = objects.Star()
+        sh.outer_radius.value = 10
+        sh.inner_radius.value = 5
+        frames = sh.bezier_frames([0, 1])
+        self.assertIs(frames[0], frames[1])
+        self.assertEqual(len(frames[0].vertices), 10)
+        sh.star_type = objects.shapes.StarType.Polygon
+        frames = sh.bezier_frames([0])
+        self.assertEqual(len(frames[0].vertices), 5)
+
+    def test_ellipse(self):
+        sh = objects.Ellipse(objects.NVector(10, 20), objects.NVector(30, 40))
+        bez = sh.bezier_frames([0])[0]
+        self.assertEqual(len(bez.vertices), 4)
+        for v in bez.vertices:
+            self.assertAlmostEqual(((v.x - 10) / 15) ** 2 + ((v.y - 20) / 20) ** 2, 1)
@@ -0,0 +1,146 @@
+import random
+from unittest import mock
+from PIL import Image
+from .. import base
+from lottie.parsers import pixel
+
+
+def signed_area(outline):
+    return sum(p1[0] * p2[1] - p2[0] * p1[1] for p1, p2 in zip(outline, outline[1:] + outline[:1])) / 2
+
+
+def pixels_from_rows(rows):
+    colors = {
+        "X": (255, 0, 0, 255),
+        "O": (0, 0, 255, 255),
+        ".": (0, 0, 0, 0),
+    }
+    return [colors[c] for row in rows for c in row], len(rows[0]), len(rows)
+
+
+class TestPixelRegions(base.TestCase):
+    def assert_corners(self, outline):
+        """
+        Each point is a corner joined to the next by a horizontal or vertical edge
+        """
+        for p0, p1, p2 in zip(outline[-1:] + outline[:-1], outline, outline[1:] + outline[:1]):
+            self.assertNotEqual(p1, p2)
+            self.assertTrue(p1[0] == p2[0] or p1[1] == p2[1])
+            self.assertFalse(p0[0] == p1[0] == p2[0] or p0[1] == p1[1] == p2[1])
+
+    def test_regions(self):
+        pixels, width, height = pixels_from_rows([
+            "XXO",
+            "X.O",
+            "OXX",
+        ])
+        regions = pixel._pixel_regions(pixels, width, height)
+        self.assertEqual(
+            sorted((color, sorted(region)) for color, region in regions),
+            [
+                ((0, 0, 255, 255), [2, 5]),
+                ((0, 0, 255, 255), [6]),
+                ((255, 0, 0, 255), [0, 1, 3]),
+                ((255, 0, 0, 255), [7, 8]),
+            ]
+        )
+
+    def test_area_matches_pixels(self):
+        rng = random.Random(0)
+        width = 16
+        height = 12
+        pixels = [rng.choice("XO.") for i in range(width * height)]
+        pixels, width, height = pixels_from_rows([
+            "".join(pixels[y * width:(y + 1) * width])
+            for y in range(height)
+        ])
+
+        regions = pixel._pixel_regions(pixels, width, height)
+        self.assertEqual(sum(len(region) for color, region in regions), sum(1 for p in pixels if p[-1]))
+        for color, region in regions:
+            outlines = pixel._region_outlines(region, width)
+            self.assertEqual(sum(signed_area(outline) for outline in outlines), len(region))
+            for outline in outlines:
+                self.assert_corners(outline)
+
+    def test_hole(self):
+        pixels, width, height = pixels_from_rows([
+            "XXX",
+            "X.X",
+            "XXX",
+        ])
+        (color, region), = pixel._pixel_regions(pixels, width, height)
+        outlines = sorted(pixel._region_outlines(region, width), key=signed_area)
+        self.assertEqual([signed_area(outline) for outline in outlines], [-1, 9])
+        self.assertEqual(sorted(outlines[0]), [(1, 1), (1, 2), (2, 1), (2, 2)])
+        self.assertEqual(sorted(outlines[1]), [(0, 0), (0, 3), (3, 0), (3, 3)])
+
+    def test_diagonal_corner(self):
+        pixels, width, height = pixels_from_rows([
+            "XXXX",
+            "XX.X",
+            "X.XX",
+            "XXXX",
+        ])
+        (color, region), = pixel._pixel_regions(pixels, width, height)
+        outlines = sorted(pixel._region_outlines(region, width), key=signed_area)
+        # The holes touch at a corner shared by two pixels of the region,
+        # they are traced as a single loop that keeps the region in one piece
+        self.assertEqual([signed_area(outline) for outline in outlines], [-2, 16])
+        self.assertEqual(outlines[0].count((2, 2)), 2)
+        for outline in outlines:
+            self.assert_corners(outline)
+
+
+class TestVectorizingFunc(base.TestCase):
+    def vectorize(self, images, processes):
+        frames = []
+
+        def callback(animation, result, frame, time, duration):
+            frames.append((result, frame, time, duration))
+
+        def frame_worker(image):
+            return image.getpixel((0, 0))
+
+        pixel._vectorizing_func(images, 1, 60, callback, frame_worker=frame_worker, processes=processes)
+        return frames
+
+    def test_single_frame_no_pool(self):
+        with mock.patch.object(pixel.multiprocessing, "get_context") as get_context:
+            frames = self.vectorize([Image.new("RGBA", (2, 2), (255, 0, 0, 255))], 4)
+        get_context.assert_not_called()
+        self.assertEqual(frames, [((255, 0, 0, 255), 0, 0, 1)])
+
+    def test_no_fork(self):
+        images = [Image.new("RGBA", (2, 2), (i, 0, 0, 255)) for i in range(3)]
+        with mock.patch.object(pixel.multiprocessing, "get_all_start_methods", return_value=["spawn"]), \
+                mock.patch.object(pixel.multiprocessing, "get_context") as get_context:
+            frames = self.vectorize(images, 4)
+        get_context.assert_not_called()
+        self.assertEqual(frames, [((i, 0, 0, 255), i, i, 1) for i in range(3)])
+
+    def test_merge_duplicates(self):
+        colors = [0, 0, 0, 1, 2, 2]
+        images = [Image.new("RGBA", (2, 2), (c, 0, 0, 255)) for c in colors]
+        frames = []
+
+        def callback(animation, image, frame, time, duration):
+            frames.append((image.getpixel((0, 0)), frame, time, duration))
+
+        animation = pixel._vectorizing_func(images, 2, 60, callback, merge_duplicates=True)
+        self.assertEqual(frames, [
+            ((0, 0, 0, 255), 0, 0, 6),
+            ((1, 0, 0, 255), 3, 6, 2),
+            ((2, 0, 0, 255), 4, 8, 4),
+        ])
+        self.assertEqual(animation.out_point, 12)
+
+    def test_merge_duplicates_size(self):
+        images = [Image.new("RGBA", (2, 2)), Image.new("RGBA", (4, 1))]
+        frames = []
+
+        def callback(animation, image, frame, time, duration):
+            frames.append((image.size, frame, time, duration))
+
+        pixel._vectorizing_func(images, 1, 60, callback, merge_duplicates=True)
+        self.assertEqual(frames, [((2, 2), 0, 0, 1), ((4, 1), 1, 1, 1)])
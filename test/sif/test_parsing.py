@@ -1,5 +1,7 @@
+import io
 import os
 import math
+from xml.dom import minidom
 
 from lottie.parsers.sif import api, ast
 from lottie.nvector import NVector, PolarVector
@@ -259,6 +261,24 @@ class TestParseFile(base.TestCase):
         self.assert_strong_equal(layer.use_kerning.value, True)
         self.assert_strong_equal(layer.grid_fit.value, False)
 
+    def test_from_minidom(self):
+        canvas = api.Canvas.from_xml(minidom.parse(self.file))
+        self._check_file(canvas)
+
+    def test_etree_same_as_minidom(self):
+        canvas1 = api.Canvas.from_xml_file(self.file)
+        canvas2 = api.Canvas.from_xml(minidom.parse(self.file))
+        self.assertEqual(canvas1.to_xml().toxml(), canvas2.to_xml().toxml())
+
+    def test_write_xml(self):
+        canvas1 = api.Canvas.from_xml_file(self.file)
+        for pretty in (True, False):
+            out = io.StringIO()
+            canvas1.write_xml(out, pretty)
+            canvas2 = api.Canvas.from_xml_string(out.getvalue())
+            self._check_file(canvas2)
+            self.assertEqual(canvas1.to_xml().toxml(), canvas2.to_xml().toxml())
+
     def test_round_trip(self):
         canvas1 = api.Canvas.from_xml_file(self.file)
         canvas2 = api.Canvas.from_xml(canvas1.to_xml())
@@ -0,0 +1,26 @@
+from xml.etree import ElementTree
+from .. import base
+from lottie.parsers.sif.xml.writer import _indent_tree
+
+
+class TestIndent(base.TestCase):
+    def assert_indent(self, xml, level, expected):
+        element = ElementTree.fromstring(xml)
+        _indent_tree(element, "  ", level)
+        self.assertEqual(ElementTree.tostring(element, "unicode"), expected)
+
+    def test_empty(self):
+        self.assert_indent("<a/>", 0, "<a />")
+        self.assert_indent("<a>text</a>", 1, "<a>text</a>")
+
+    def test_nested(self):
+        self.assert_indent(
+            "<a><b/><c>text<d/></c></a>", 1,
+            "<a>\n    <b />\n    <c>text<d />\n    </c>\n  </a>"
+        )
+
+    def test_whitespace(self):
+        self.assert_indent(
+            "<a> <b>text</b>tail<c/> </a>", 0,
+            "<a>\n  <b>text</b>tail<c />\n</a>"
+        )
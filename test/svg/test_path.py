@@ -3,6 +3,7 @@ from xml.etree import ElementTree
 from .. import base
 from lottie import objects
 from lottie.parsers.svg import parse_svg_etree
+from lottie.parsers.svg.importer import PathDParser
 from lottie.nvector import NVector
 
 
@@ -330,3 +331,57 @@ class TestIntegration(PathTester):
             [NVector( 0,  0), NVector( 0,  0), NVector(0, 0)],
             [NVector( 0,  0), NVector( 0,  0), NVector(0, 0)],
         )
+
+
+class TestPathDParser(PathTester):
+    def parse(self, d):
+        parser = PathDParser(d)
+        parser.parse()
+        return parser.paths
+
+    def test_compact_numbers(self):
+        paths = self.parse("M1.5.5-2e1,3L4-5.")
+        self.assertEqual(len(paths), 1)
+        self.assertListEqual(paths[0].vertices, [
+            NVector(1.5, 0.5), NVector(-20, 3), NVector(4, -5),
+        ])
+
+    def test_implicit_commands(self):
+        paths = self.parse("m 10 10 5 0 0 5 h 1 2 v 3 4 Z m 1 1 2 2")
+        self.assertEqual(len(paths), 2)
+        self.assertListEqual(paths[0].vertices, [
+            NVector(10, 10), NVector(15, 10), NVector(15, 15),
+            NVector(16, 15), NVector(18, 15), NVector(18, 18), NVector(18, 22),
+        ])
+        self.assertTrue(paths[0].closed)
+        self.assertListEqual(paths[1].vertices, [NVector(11, 11), NVector(13, 13)])
+        self.assertFalse(paths[1].closed)
+
+    def test_implicit_curves(self):
+        paths = self.parse("M 0 0 C 0 10 10 10 10 0 10 -10 20 -10 20 0 s 10 10 10 0")
+        bezier = paths[0]
+        self.assertListEqual(bezier.vertices, [
+            NVector(0, 0), NVector(10, 0), NVector(20, 0), NVector(30, 0),
+        ])
+        self.assertListEqual(bezier.in_tangents, [
+            NVector(0, 0), NVector(0, 10), NVector(0, -10), NVector(0, 10),
+        ])
+        self.assertListEqual(bezier.out_tangents, [
+            NVector(0, 10), NVector(0, -10), NVector(0, 10), NVector(0, 0),
+        ])
+
+    def test_implicit_arcs(self):
+        paths = self.parse("M 0 0 A 10 10 0 0 1 20 0 10 10 0 0 1 0 0")
+        bezier = paths[0]
+        self.assert_list_almost_equal(bezier.vertices[0], NVector(0, 0))
+        self.assertIn(NVector(20, 0), bezier.vertices)
+        self.assert_list_almost_equal(bezier.vertices[-1], NVector(0, 0))
+        for vertex in bezier.vertices:
+            self.assertAlmostEqual((vertex - NVector(10, 0)).length, 10, 5)
+
+    def test_long_path(self):
+        count = 20000
+        paths = self.parse("M 0 0 " + " ".join("l 1 %s" % (i % 2) for i in range(count)))
+        bezier = paths[0]
+        self.assertEqual(len(bezier.vertices), count + 1)
+        self.assertEqual(bezier.vertices[-1], NVector(count, count // 2))
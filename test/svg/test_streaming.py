@@ -0,0 +1,61 @@
+import io
+from xml.etree import ElementTree
+
+from .. import base
+from lottie.parsers.svg.importer import SvgParser
+
+
+svg_source = """<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"
+    width="200" height="100" viewBox="0 0 100 50">
+    <use xlink:href="#later" x="5" y="5"/>
+    <defs>
+        <linearGradient id="gradient">
+            <stop offset="0" stop-color="red"/>
+            <stop offset="1" stop-color="blue"/>
+        </linearGradient>
+        <rect id="def_rect" width="3" height="4"/>
+    </defs>
+    <g id="outer" transform="translate(10,20)" style="fill:url(#gradient)">
+        <rect x="1" y="2" width="10" height="20"/>
+        <g opacity="0.5">
+            <circle cx="3" cy="3" r="2"><animate attributeName="cx" from="1" to="5" dur="2s"/></circle>
+            <path d="M 0 0 L 10 10 z"/>
+            <animate attributeName="opacity" from="0" to="1" dur="1s"/>
+        </g>
+        <use xlink:href="#def_rect"/>
+    </g>
+    <g id="later"><ellipse cx="1" cy="1" rx="2" ry="3" fill="green"/></g>
+    <polygon points="0,0 1,1 2,0" fill="blue"/>
+</svg>
+"""
+
+
+class TestStreaming(base.TestCase):
+    def assert_same_as_etree(self, layer_frames):
+        expected = SvgParser().parse_etree(ElementTree.parse(io.StringIO(svg_source)), layer_frames)
+        actual = SvgParser().parse_stream(io.StringIO(svg_source), layer_frames)
+        self.assertDictEqual(actual.to_dict(), expected.to_dict())
+        return actual
+
+    def test_same_as_etree(self):
+        anim = self.assert_same_as_etree(0)
+        self.assertEqual(len(anim.layers), 1)
+        self.assertEqual(anim.width, 200)
+        self.assertEqual(anim.out_point, 120)
+
+    def test_layer_frames(self):
+        anim = self.assert_same_as_etree(5)
+        self.assertEqual(len(anim.layers), 2)
+
+    def test_forward_use(self):
+        anim = SvgParser().parse_stream(io.StringIO(svg_source))
+        use = next(shape for shape in anim.layers[0].shapes if shape.name == "use")
+        self.assertEqual(use.shapes[0].name, "later")
+
+    def test_not_seekable(self):
+        class Stream(io.StringIO):
+            def seekable(self):
+                return False
+
+        anim = SvgParser().parse_stream(Stream(svg_source))
+        self.assertEqual(len(anim.layers), 1)
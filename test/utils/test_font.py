@@ -0,0 +1,207 @@
+import os
+import tempfile
+from unittest import mock
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils import font
+
+
+class StubFontList(font._SystemFontList):
+    def __init__(self, cache_dir, font_dir):
+        super().__init__(cache_dir)
+        self.font_dir = font_dir
+        self.commands = []
+
+    def cmd(self, *a):
+        self.commands.append(a)
+        if a[0] == "fc-list":
+            return "\n".join("\t".join(values) for values in [
+                (os.path.join(self.font_dir, "sans.ttf"), "Sans", "Regular", "80", "0", "100", "20-7e a0-17f"),
+                (os.path.join(self.font_dir, "sans-bold.ttf"), "Sans", "Bold", "200", "0", "100", "20-7e"),
+                (os.path.join(self.font_dir, "symbols.ttf"), "Symbols", "Regular", "80", "0", "100", "2190-21ff"),
+            ]), 0
+        elif a[0] == "fc-match":
+            if "-s" in a:
+                return "Sans\tBold\nSans\tRegular\nSymbols\tRegular", 0
+            return "Sans\tRegular", 0
+        return "", 1
+
+
+class TestSystemFontList(base.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tempdir.name, "cache")
+        self.font_dir = os.path.join(self.tempdir.name, "fonts")
+        os.mkdir(self.font_dir)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def font_list(self):
+        return StubFontList(self.cache_dir, self.font_dir)
+
+    def command_names(self, fonts):
+        return [command[0] for command in fonts.commands]
+
+    def test_index(self):
+        fonts = self.font_list()
+        self.assertEqual(sorted(fonts.keys()), ["Sans", "Symbols"])
+        self.assertEqual(fonts["Sans"].filename("Bold"), os.path.join(self.font_dir, "sans-bold.ttf"))
+        self.assertEqual(fonts.file_info(os.path.join(self.font_dir, "sans-bold.ttf"))["weight"], "200")
+
+        sans = os.path.join(self.font_dir, "sans.ttf")
+        self.assertIs(fonts.covers(sans, ord("a")), True)
+        self.assertIs(fonts.covers(sans, 0xe9), True)
+        self.assertIs(fonts.covers(sans, 0x2190), False)
+        self.assertIs(fonts.covers(sans, 0x10), False)
+        self.assertIsNone(fonts.covers(os.path.join(self.font_dir, "missing.ttf"), ord("a")))
+
+    def test_cache(self):
+        fonts = self.font_list()
+        fonts.load()
+        self.assertEqual(self.command_names(fonts), ["fc-list"])
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, "fonts.json")))
+
+        cached = self.font_list()
+        self.assertEqual(sorted(cached.keys()), ["Sans", "Symbols"])
+        self.assertIs(cached.covers(os.path.join(self.font_dir, "sans.ttf"), ord("a")), True)
+        self.assertEqual(cached.commands, [])
+
+        refreshed = self.font_list()
+        refreshed.load(True)
+        self.assertEqual(self.command_names(refreshed), ["fc-list"])
+
+    def test_cache_invalidated(self):
+        self.font_list().load()
+
+        stat = os.stat(self.font_dir)
+        os.utime(self.font_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        fonts = self.font_list()
+        fonts.load()
+        self.assertEqual(self.command_names(fonts), ["fc-list"])
+
+    def test_match_cache(self):
+        fonts = self.font_list()
+        self.assertEqual(fonts._match("Sans", False), ["Sans\tRegular"])
+        self.assertEqual(fonts._match("Sans", False), ["Sans\tRegular"])
+        self.assertEqual(fonts._match("Sans", True), ["Sans\tBold", "Sans\tRegular", "Symbols\tRegular"])
+        self.assertEqual(self.command_names(fonts), ["fc-list", "fc-match", "fc-match"])
+
+        # Matches are only written when explicitly saved
+        matches_file = os.path.join(self.cache_dir, "matches.json")
+        os.remove(matches_file)
+        fonts._match("Symbols", False)
+        self.assertFalse(os.path.exists(matches_file))
+        fonts.save_matches()
+        self.assertTrue(os.path.exists(matches_file))
+        mtime = os.stat(matches_file).st_mtime_ns
+        fonts.save_matches()
+        self.assertEqual(os.stat(matches_file).st_mtime_ns, mtime)
+
+        cached = self.font_list()
+        self.assertEqual(cached._match("Sans", True), ["Sans\tBold", "Sans\tRegular", "Symbols\tRegular"])
+        self.assertEqual(cached._match("Symbols", False), ["Sans\tRegular"])
+        self.assertEqual(cached.commands, [])
+
+    def test_all_skips_uncovered(self):
+        fonts = self.font_list()
+        with mock.patch.object(font, "fonts", fonts), mock.patch.object(font, "RawFontRenderer") as renderer:
+            renderer.side_effect = lambda filename: filename
+            self.assertEqual(list(fonts.all("Sans", 0x2192)), [os.path.join(self.font_dir, "symbols.ttf")])
+            renderer.assert_called_once_with(os.path.join(self.font_dir, "symbols.ttf"))
+
+            self.assertEqual(list(fonts.all("Sans", 0xe9)), [os.path.join(self.font_dir, "sans.ttf")])
+            self.assertEqual(len(list(fonts.all("Sans"))), 3)
+
+
+def build_font(filename):
+    """
+    Builds a font with square glyphs for "a" and "b"
+    """
+    builder = FontBuilder(1000, isTTF=True)
+    names = [".notdef", "a", "b"]
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({ord("a"): "a", ord("b"): "b"})
+    glyphs = {}
+    for name in names:
+        pen = TTGlyphPen(None)
+        if name != ".notdef":
+            pen.moveTo((50, 0))
+            pen.lineTo((50, 600))
+            pen.lineTo((450, 600))
+            pen.lineTo((450, 0))
+            pen.closePath()
+        glyphs[name] = pen.glyph()
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics({name: (500, 50) for name in names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    builder.save(filename)
+
+
+class TestGlyphCharsRenderer(base.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.font_file = os.path.join(self.tempdir.name, "test.ttf")
+        build_font(self.font_file)
+        self.style = font.FontStyle(self.font_file, 20)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_font(self):
+        animation = objects.Animation()
+        font.GlyphCharsRenderer(animation, self.style)
+        font.GlyphCharsRenderer(animation, self.style)
+
+        self.assertEqual(len(animation.fonts.list), 1)
+        lottie_font = animation.fonts.list[0]
+        self.assertEqual(lottie_font.font_family, "test")
+        self.assertEqual(lottie_font.font_style, "Regular")
+        self.assertAlmostEqual(lottie_font.ascent, 80)
+
+    def test_shared_chars(self):
+        animation = objects.Animation()
+        renderer = font.GlyphCharsRenderer(animation, self.style)
+        pos = NVector(0, 0)
+        renderer.render("abba", pos=pos)
+        renderer.render("ba\naa", pos=pos)
+
+        self.assertEqual(sorted(chars.character for chars in animation.chars), ["a", "b"])
+        self.assertEqual(len(animation.layers), 2)
+        self.assertEqual(animation.layers[0].data.get_value(0).text, "ba\raa")
+        self.assertEqual(animation.layers[1].data.get_value(0).text, "abba")
+        for chars in animation.chars:
+            # Glyph advances are the right edge of the outline
+            self.assertAlmostEqual(chars.width, 45)
+            self.assertEqual(chars.font_size, 100)
+            self.assertEqual(len(chars.data.shapes), 1)
+        # The second render starts a new line, ending after 2 characters
+        self.assert_nvector_equal(pos, NVector(18, self.style.line_height))
+
+    def test_missing_char(self):
+        animation = objects.Animation()
+        renderer = font.GlyphCharsRenderer(animation, self.style)
+        self.assertIsNone(renderer.char_data("z"))
+        self.assertIsNone(renderer.char_data("z"))
+        self.assertEqual(animation.chars, [])
+
+    def test_round_trip(self):
+        animation = objects.Animation()
+        font.GlyphCharsRenderer(animation, self.style).render("ab")
+        data = animation.to_dict()
+
+        loaded = objects.Animation.load(data)
+        self.assertEqual(loaded.to_dict(), data)
+        self.assertEqual(len(loaded.chars), 2)
+        self.assertIsInstance(loaded.layers[0], objects.TextLayer)
+
+        renderer = font.GlyphCharsRenderer(loaded, self.style)
+        renderer.render("ba")
+        self.assertEqual(len(loaded.fonts.list), 1)
+        self.assertEqual(len(loaded.chars), 2)
@@ -0,0 +1,121 @@
+import math
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.keyframe_reducer import KeyframeReducer
+
+
+class TestKeyframeReducer(base.TestCase):
+    def assert_within(self, original, reduced, tolerance, frames):
+        for frame in range(frames + 1):
+            a = original.get_value(frame)
+            b = reduced.get_value(frame)
+            if isinstance(a, (int, float)):
+                self.assertLessEqual(abs(a - b), tolerance, "Frame %s" % frame)
+            else:
+                for ca, cb in zip(a, b):
+                    self.assertLessEqual(abs(ca - cb), tolerance, "Frame %s" % frame)
+
+    def test_baked_ease(self):
+        prop = objects.MultiDimensional()
+        for frame in range(61):
+            x = frame / 60
+            prop.add_keyframe(frame, NVector(100, 50) * (x * x * (3 - 2 * x)))
+        original = prop.clone()
+
+        KeyframeReducer(0.25).reduce(prop)
+
+        self.assertEqual(len(prop.keyframes), 2)
+        self.assertEqual(prop.keyframes[-1].time, 60)
+        self.assert_within(original, prop, 0.25, 60)
+
+    def test_curve(self):
+        prop = objects.Value()
+        for frame in range(61):
+            prop.add_keyframe(frame, 100 * math.sin(frame / 10))
+        original = prop.clone()
+
+        KeyframeReducer(0.25).reduce(prop)
+
+        self.assertLess(len(prop.keyframes), 15)
+        self.assert_within(original, prop, 0.25, 60)
+
+    def test_hold(self):
+        prop = objects.Value()
+        for frame in range(21):
+            prop.add_keyframe(frame, frame)
+        prop.keyframes[10].hold = True
+        prop.add_keyframe(30, 0)
+        original = prop.clone()
+
+        KeyframeReducer(0.25).reduce(prop)
+
+        self.assertEqual([kf.time for kf in prop.keyframes], [0, 10, 11, 20, 30])
+        self.assert_within(original, prop, 0.25, 30)
+
+    def test_constant(self):
+        prop = objects.Value()
+        for frame in range(10):
+            prop.add_keyframe(frame, 5)
+
+        KeyframeReducer(0.25).reduce(prop)
+
+        self.assertFalse(prop.animated)
+        self.assertEqual(prop.value, 5)
+
+    def test_shape(self):
+        prop = objects.ShapeProperty()
+        for frame in range(31):
+            bezier = objects.Bezier()
+            bezier.add_point(NVector(0, frame))
+            bezier.add_point(NVector(frame * 2, 10), NVector(1, 1), NVector(-1, -1))
+            prop.add_keyframe(frame, bezier)
+        original = prop.clone()
+
+        KeyframeReducer(0.25).reduce(prop)
+
+        self.assertEqual(len(prop.keyframes), 2)
+        for frame in range(31):
+            for a, b in zip(original.get_value(frame).vertices, prop.get_value(frame).vertices):
+                self.assert_nvector_equal(a, b, 6)
+
+    def test_animation(self):
+        animation = objects.Animation(30)
+        layer = animation.add_layer(objects.ShapeLayer())
+        fill = layer.add_shape(objects.Fill())
+        for frame in range(31):
+            layer.transform.position.add_keyframe(frame, NVector(frame, frame))
+            fill.color.add_keyframe(frame, NVector(frame / 30, 0, 0))
+
+        KeyframeReducer()(animation)
+
+        self.assertEqual(len(layer.transform.position.keyframes), 2)
+        self.assertEqual(len(fill.color.keyframes), 2)
+
+    def test_time_remapping(self):
+        animation = objects.Animation(120, 60)
+        layer = animation.add_layer(objects.PreCompLayer())
+        layer.time_remapping = objects.Value()
+        for frame in range(121):
+            layer.time_remapping.add_keyframe(frame, frame / 60 + 0.1 * math.sin(frame / 6))
+        original = layer.time_remapping.clone()
+
+        KeyframeReducer(0.25)(animation)
+
+        self.assertLess(len(layer.time_remapping.keyframes), 121)
+        self.assertGreater(len(layer.time_remapping.keyframes), 2)
+        # Tolerance is in frames for time remapping
+        self.assert_within(original, layer.time_remapping, 0.25 / 60, 120)
+
+    def test_time_remapping_no_frame_rate(self):
+        layer = objects.PreCompLayer()
+        layer.time_remapping = objects.Value()
+        for frame in range(31):
+            layer.time_remapping.add_keyframe(frame, frame / 60 + 0.1 * math.sin(frame / 6))
+
+        reducer = KeyframeReducer(0.25)
+        # The frame rate of a previous animation isn't used
+        reducer(objects.Animation(30, 60))
+        reducer(layer)
+
+        self.assertEqual(len(layer.time_remapping.keyframes), 31)
@@ -0,0 +1,57 @@
+from .. import base
+from lottie import objects, NVector
+from lottie.utils.spatial import SpatialIndex
+
+
+class TestSpatialIndex(base.TestCase):
+    def _animation(self):
+        an = objects.Animation(60)
+        null = an.add_layer(objects.NullLayer())
+        null.transform.position.value = NVector(100, 0)
+
+        layer = null.add_child(objects.ShapeLayer())
+        self.bottom = layer.add_shape(objects.Group())
+        self.bottom.add_shape(objects.Rect(NVector(50, 50), NVector(100, 100)))
+        self.top = layer.insert_shape(0, objects.Group())
+        self.top.add_shape(objects.Ellipse(NVector(60, 60), NVector(20, 20)))
+
+        self.moving = an.add_layer(objects.ShapeLayer())
+        self.moving.in_point = 10
+        self.moving.out_point = 20
+        group = self.moving.add_shape(objects.Group())
+        group.add_shape(objects.Rect(NVector(0, 0), NVector(10, 10)))
+        group.transform.position.add_keyframe(0, NVector(300, 300))
+        group.transform.position.add_keyframe(20, NVector(500, 300))
+        return an
+
+    def test_at_point(self):
+        index = SpatialIndex.build(self._animation(), 0)
+        self.assertEqual([e.shape for e in index.at_point(160, 60)], [self.top, self.bottom])
+        self.assertEqual([e.shape for e in index.at_point(110, 10)], [self.bottom])
+        self.assertEqual(index.at_point(10, 10), [])
+
+    def test_in_rect(self):
+        index = SpatialIndex.build(self._animation(), 0)
+        self.assertEqual([e.shape for e in index.in_rect(0, 0, 120, 20)], [self.bottom])
+        self.assertEqual(len(index.in_rect(0, 0, 512, 512)), 2)
+
+    def test_in_out_points(self):
+        an = self._animation()
+        index = SpatialIndex.build(an, 0)
+        self.assertEqual(index.in_rect(200, 200, 512, 512), [])
+        index.update(10)
+        found = index.in_rect(200, 200, 512, 512)
+        self.assertEqual(len(found), 1)
+        self.assertIs(found[0].layer, self.moving)
+        self.assertAlmostEqual(found[0].bounding_box.x1, 395)
+        index.update(20)
+        self.assertEqual(index.in_rect(200, 200, 512, 512), [])
+
+    def test_precomp(self):
+        an = self._animation()
+        precomp = an.to_precomp()
+        an.layers[0].transform.position.value = NVector(0, 100)
+        index = SpatialIndex.build(an, 0)
+        found = index.at_point(160, 160)
+        self.assertEqual([e.shape for e in found], [self.top, self.bottom])
+        self.assertEqual(found[0].precomp_layers, [an.layers[0]])